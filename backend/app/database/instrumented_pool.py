@@ -0,0 +1,50 @@
+"""
+Connection-Pools mit Telemetrie: Wartezeit beim Checkout, Timeouts und Belegung
+(docs_db_pool_* unter GET /metrics) als Grundlage für die Pool-Dimensionierung.
+"""
+
+import time
+from typing import Dict, Iterable
+
+from app.services.metrics import DB_POOL_CHECKOUT_TIMEOUTS, DB_POOL_CHECKOUT_WAIT
+from sqlalchemy import exc
+from sqlalchemy.pool import AsyncAdaptedQueuePool, QueuePool
+
+
+class _PoolTelemetryMixin:
+    """Misst die Zeit in _do_get(), also inkl. Warten auf eine freie Verbindung."""
+
+    metrics_label = ""
+
+    def _do_get(self):
+        started = time.perf_counter()
+        try:
+            return super()._do_get()
+        except exc.TimeoutError:
+            DB_POOL_CHECKOUT_TIMEOUTS.inc(engine=self.metrics_label)
+            raise
+        finally:
+            DB_POOL_CHECKOUT_WAIT.observe(time.perf_counter() - started, engine=self.metrics_label)
+
+
+class InstrumentedQueuePool(_PoolTelemetryMixin, QueuePool):
+    """QueuePool der Sync-Engine (Scheduler, Processors, Repositories)."""
+
+    metrics_label = "sync"
+
+
+class InstrumentedAsyncQueuePool(_PoolTelemetryMixin, AsyncAdaptedQueuePool):
+    """Pool der Async-Engine (FastAPI-Routen)."""
+
+    metrics_label = "async"
+
+
+def pool_status(pools: Iterable[QueuePool]) -> Dict[tuple, int]:
+    """Belegung der Pools für die Metrik docs_db_pool_connections."""
+    status = {}
+    for pool in pools:
+        label = getattr(pool, "metrics_label", "") or type(pool).__name__
+        status[(label, "in_use")] = pool.checkedout()
+        status[(label, "idle")] = pool.checkedin()
+        status[(label, "limit")] = pool.size() + max(pool._max_overflow, 0)
+    return status
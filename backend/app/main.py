@@ -1,4 +1,5 @@
 # app/main.py
+import asyncio
 import logging
 import os
 from contextlib import asynccontextmanager
@@ -10,10 +11,14 @@ from fastapi.middleware.cors import CORSMiddleware
 from fastapi.staticfiles import StaticFiles
 
 from .config.settings import API_PREFIX, CORS_ORIGINS
-from .database.postgres_connection import init_database
+from .database.postgres_connection import dispose_async_engine, init_database
 from .routes.database import router as database_router  # NEU: Database-Routes
 from .routes.dokumente import router as dokumente_router
 from .routes.smb_routes import router as smb_router
+from .routes.verarbeitung import router as verarbeitung_router
+from .services.metrics import CONTENT_TYPE as METRICS_CONTENT_TYPE
+from .services.metrics import registry as metrics_registry
+from .services.ocr_cache import ocr_result_cache
 from .services.ocr_scheduler import ocr_scheduler
 
 # Logger konfigurieren
@@ -61,6 +66,8 @@ async def lifespan(app: FastAPI):
         logger.info("OCR-Scheduler gestoppt")
     except Exception as e:
         logger.error(f"Fehler beim Stoppen des OCR-Schedulers: {e}")
+    
+    await dispose_async_engine()
 
 
 # FastAPI-App erstellen - FIX für OpenAPI-Version
@@ -110,10 +117,11 @@ async def debug_routes():
 app.include_router(dokumente_router, prefix=API_PREFIX)
 app.include_router(database_router, prefix=API_PREFIX)
 app.include_router(smb_router, prefix=API_PREFIX)  # SMB-Router hinzufügen
+app.include_router(verarbeitung_router, prefix=API_PREFIX)
 
 # ✅ KORRIGIERTE Swagger UI und ReDoc
 from fastapi.openapi.docs import get_redoc_html, get_swagger_ui_html
-from fastapi.responses import HTMLResponse
+from fastapi.responses import HTMLResponse, PlainTextResponse
 
 
 @app.get("/docs", include_in_schema=False)
@@ -318,11 +326,32 @@ async def root():
         "smb_status": "/api/dokumente/smb/status",
         "ocr_scheduler": {
             "running": ocr_scheduler.running,
-            "processed_files": len(ocr_scheduler.processed_files)
+            "watch_mode": ocr_scheduler.watch_mode,
+            "processed_files": len(ocr_scheduler.processed_files),
+            "ocr_pool": ocr_scheduler.ocr_pool.get_stats()
         }
     }
 
 
+@app.get("/api/ocr/pipeline")
+async def ocr_pipeline_stats():
+    """
+    Queue-Tiefe, Auslastung und Latenzen je Pipeline-Stufe (OCR, Leerseiten, DB, Klassifizierung)
+    sowie die Belegung des OCR-Caches (Treffer stehen unter ocr_pool.cache_hits).
+    """
+    return {
+        "pipeline": ocr_scheduler.pipeline.get_stats(),
+        "ocr_pool": ocr_scheduler.ocr_pool.get_stats(),
+        "ocr_cache": await asyncio.to_thread(ocr_result_cache.get_stats)
+    }
+
+
+@app.get("/metrics", include_in_schema=False)
+async def metrics():
+    """Metriken der Verarbeitung im Prometheus-Textformat."""
+    return PlainTextResponse(metrics_registry.render(), media_type=METRICS_CONTENT_TYPE)
+
+
 @app.post("/api/ocr/force-check")
 async def force_ocr_check():
     """Löst eine manuelle OCR-Prüfung aus."""
@@ -10,18 +10,27 @@ from sqlalchemy import (
     JSON,
     Boolean,
     Column,
+    Computed,
     DateTime,
     ForeignKey,
+    Index,
     Integer,
     String,
     Text,
+    UniqueConstraint,
     create_engine,
+    text,
 )
+from sqlalchemy.dialects.postgresql import TSVECTOR
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import relationship, sessionmaker
 
 Base = declarative_base()
 
+# Sortierwert für Dokumente ohne erstellt_am in der Dokumentliste: sie stehen am Ende,
+# statt bei DESC als NULL zuerst zu kommen und aus der Keyset-Pagination zu fallen
+ERSTELLT_AM_OHNE_DATUM = "TIMESTAMP '0001-01-01 00:00:00'"
+
 # Neue Kategorie-Struktur
 class Kategorie(Base):
     __tablename__ = 'kategorien'
@@ -56,12 +65,21 @@ class Unterkategorie(Base):
 # Erweiterte Dokument-Tabelle
 class Dokument(Base):
     __tablename__ = 'dokumente'
+    __table_args__ = (
+        Index('ix_dokumente_erstellt_am_id', 'erstellt_am', 'id'),  # Zeitraumfilter (von/bis)
+        Index(  # Keyset-Pagination der Dokumentliste
+            'ix_dokumente_sortierung_id',
+            text(f"coalesce(erstellt_am, {ERSTELLT_AM_OHNE_DATUM})"),
+            'id'
+        ),
+    )
     
     id = Column(Integer, primary_key=True)
-    dateiname = Column(String(255), nullable=False)
+    dateiname = Column(String(255), nullable=False, index=True)
+    original_dateiname = Column(String(255), index=True)  # Dateiname beim Anlegen, bleibt bei Umbenennungen erhalten
     kategorie_id = Column(Integer, ForeignKey('kategorien.id'))
-    unterkategorie_id = Column(Integer, ForeignKey('unterkategorien.id'))
-    pfad = Column(String(500), nullable=False)
+    unterkategorie_id = Column(Integer, ForeignKey('unterkategorien.id'), index=True)
+    pfad = Column(String(500), nullable=False, index=True)
     inhalt_vorschau = Column(Text)
     erstellt_am = Column(DateTime, default=datetime.utcnow)
     metadaten = Column(JSON)  # PostgreSQL JSON Support!
@@ -92,7 +110,7 @@ class LieferscheinExtern(Base):
     
     id = Column(Integer, primary_key=True)
     lieferscheinnummer = Column(String(100), unique=True, nullable=False)
-    dokument_id = Column(Integer, ForeignKey('dokumente.id'), nullable=False)
+    dokument_id = Column(Integer, ForeignKey('dokumente.id'), nullable=False, index=True)
     csv_importiert = Column(Boolean, default=False)
     erstellt_am = Column(DateTime, default=datetime.utcnow)
     
@@ -108,7 +126,7 @@ class LieferscheinIntern(Base):
     
     id = Column(Integer, primary_key=True)
     lieferscheinnummer = Column(String(100), unique=True, nullable=False)
-    dokument_id = Column(Integer, ForeignKey('dokumente.id'), nullable=False)
+    dokument_id = Column(Integer, ForeignKey('dokumente.id'), nullable=False, index=True)
     csv_importiert = Column(Boolean, default=False)
     erstellt_am = Column(DateTime, default=datetime.utcnow)
     
@@ -122,9 +140,16 @@ class LieferscheinIntern(Base):
 # Umbenannte Chargen-Tabellen
 class ChargenEinkauf(Base):
     __tablename__ = 'chargen_einkauf'
+    __table_args__ = (
+        # Trigramm-Indizes (pg_trgm) für die Chargen-Suche mit ILIKE '%…%'
+        Index('ix_chargen_einkauf_snnr_trgm', 'snnr', postgresql_using='gin', postgresql_ops={'snnr': 'gin_trgm_ops'}),
+        Index('ix_chargen_einkauf_materialnr_trgm', 'materialnr', postgresql_using='gin', postgresql_ops={'materialnr': 'gin_trgm_ops'}),
+        Index('ix_chargen_einkauf_artikel_trgm', 'artikel', postgresql_using='gin', postgresql_ops={'artikel': 'gin_trgm_ops'}),
+        Index('ix_chargen_einkauf_atnr_trgm', 'atnr', postgresql_using='gin', postgresql_ops={'atnr': 'gin_trgm_ops'}),
+    )
     
     id = Column(Integer, primary_key=True)
-    lieferschein_extern_id = Column(Integer, ForeignKey('lieferscheine_extern.id'), nullable=False)
+    lieferschein_extern_id = Column(Integer, ForeignKey('lieferscheine_extern.id'), nullable=False, index=True)
     
     # Bestehende CSV-Felder (von lieferschein_datensaetze)
     linr = Column(String(50))
@@ -147,7 +172,7 @@ class ChargenEinkauf(Base):
     snnr = Column(String(100))
     snnralt = Column(String(100))
     einzelek = Column(String(50))
-    lieferscheinnr = Column(String(100))
+    lieferscheinnr = Column(String(100), index=True)
     lieferdatum = Column(String(20))
     renrex = Column(String(100))
     redat = Column(String(20))
@@ -164,9 +189,16 @@ class ChargenEinkauf(Base):
 # Neue Chargen-Verkauf Tabelle
 class ChargenVerkauf(Base):
     __tablename__ = 'chargen_verkauf'
+    __table_args__ = (
+        # Trigramm-Indizes (pg_trgm) für die Chargen-Suche mit ILIKE '%…%'
+        Index('ix_chargen_verkauf_charge_trgm', 'charge', postgresql_using='gin', postgresql_ops={'charge': 'gin_trgm_ops'}),
+        Index('ix_chargen_verkauf_materialnr_trgm', 'materialnr', postgresql_using='gin', postgresql_ops={'materialnr': 'gin_trgm_ops'}),
+        Index('ix_chargen_verkauf_artikel_trgm', 'artikel', postgresql_using='gin', postgresql_ops={'artikel': 'gin_trgm_ops'}),
+        Index('ix_chargen_verkauf_atnr_trgm', 'atnr', postgresql_using='gin', postgresql_ops={'atnr': 'gin_trgm_ops'}),
+    )
     
     id = Column(Integer, primary_key=True)
-    lieferschein_intern_id = Column(Integer, ForeignKey('lieferscheine_intern.id'), nullable=False)
+    lieferschein_intern_id = Column(Integer, ForeignKey('lieferscheine_intern.id'), nullable=False, index=True)
     
     # Neue CSV-Struktur für Verkauf
     kdnr = Column(String(50))
@@ -190,7 +222,7 @@ class ChargenVerkauf(Base):
     charge = Column(String(100))  # **markiert
     einzelvk = Column(String(50))  # **markiert
     poswert = Column(String(50))
-    lieferscheinnr = Column(String(100))
+    lieferscheinnr = Column(String(100), index=True)
     lieferdatum = Column(String(20))
     renr = Column(String(100))
     redat = Column(String(20))
@@ -203,4 +235,59 @@ class ChargenVerkauf(Base):
     lieferschein_intern = relationship("LieferscheinIntern", back_populates="chargen_verkauf")
     
     def __repr__(self):
-        return f"<ChargenVerkauf(id={self.id}, artikel='{self.artikel}')>"
\ No newline at end of file
+        return f"<ChargenVerkauf(id={self.id}, artikel='{self.artikel}')>"
+
+# Verarbeitungsstatus der Pipeline-Stufen (ersetzt .ocr_processed/.doc_processed-Marker)
+class Verarbeitungsstatus(Base):
+    __tablename__ = 'verarbeitungsstatus'
+    __table_args__ = (
+        UniqueConstraint('dateiname', 'stufe', name='uq_verarbeitungsstatus_dateiname_stufe'),
+    )
+    
+    id = Column(Integer, primary_key=True)
+    dateiname = Column(String(255), nullable=False)  # Dateiname im Input-Verzeichnis (Index über Unique-Constraint)
+    dokument_hash = Column(String(64))  # SHA-256 der Datei vor dem Document Processing (erkennt wiederverwendete Dateinamen)
+    stufe = Column(String(50), nullable=False)  # z.B. 'ocr', 'document_processing'
+    status = Column(String(20), nullable=False)  # 'erledigt', 'fehlgeschlagen', 'dead_letter'
+    versuche = Column(Integer, nullable=False, default=0)
+    naechster_versuch = Column(DateTime)  # Frühester Wiederholungszeitpunkt nach Fehlschlag (Backoff)
+    meldung = Column(Text)
+    erstellt_am = Column(DateTime, default=datetime.utcnow)
+    aktualisiert_am = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+    
+    def __repr__(self):
+        return f"<Verarbeitungsstatus(dateiname='{self.dateiname}', stufe='{self.stufe}', status='{self.status}')>"
+
+# Zeitleiste der Verarbeitungsschritte pro Dokument (Latenz-Analyse)
+class Verarbeitungsschritt(Base):
+    __tablename__ = 'verarbeitungsschritte'
+    
+    id = Column(Integer, primary_key=True)
+    dateiname = Column(String(255), nullable=False, index=True)  # Ursprünglicher Dateiname im Input
+    dokument_id = Column(Integer, ForeignKey('dokumente.id', ondelete='CASCADE'), index=True)  # Sobald bekannt
+    schritt = Column(String(100), nullable=False, index=True)  # z.B. 'ocr', 'wareneingang.csv_laden'
+    gestartet_am = Column(DateTime, nullable=False)
+    beendet_am = Column(DateTime, nullable=False)
+    dauer_ms = Column(Integer, nullable=False)
+    erfolgreich = Column(Boolean, nullable=False, default=True)
+    meldung = Column(Text)
+    
+    def __repr__(self):
+        return f"<Verarbeitungsschritt(dateiname='{self.dateiname}', schritt='{self.schritt}', dauer_ms={self.dauer_ms})>"
+
+# Volltext je Seite (OCR-Text) mit deutschem tsvector für die Dokumentsuche
+class DokumentSeite(Base):
+    __tablename__ = 'dokument_seiten'
+    __table_args__ = (
+        UniqueConstraint('dokument_id', 'seite', name='uq_dokument_seiten_dokument_seite'),
+        Index('ix_dokument_seiten_suchvektor', 'suchvektor', postgresql_using='gin'),
+    )
+    
+    id = Column(Integer, primary_key=True)
+    dokument_id = Column(Integer, ForeignKey('dokumente.id', ondelete='CASCADE'), nullable=False)  # Index über Unique-Constraint
+    seite = Column(Integer, nullable=False)  # 1-basiert
+    text = Column(Text, nullable=False)
+    suchvektor = Column(TSVECTOR, Computed("to_tsvector('german', text)", persisted=True))  # Von PostgreSQL berechnet
+    
+    def __repr__(self):
+        return f"<DokumentSeite(dokument_id={self.dokument_id}, seite={self.seite})>"
@@ -0,0 +1,201 @@
+"""
+Repository für die Chargen-Suche über Einkauf und Verkauf
+(Seriennummer/Charge, Materialnummer, Artikel, ATNR; Trigramm-Indizes über pg_trgm)
+"""
+
+import base64
+import json
+import logging
+from typing import Optional, Sequence, Tuple
+
+from app.database.postgres_connection import get_async_db_session
+from app.models.database import (
+    ChargenEinkauf,
+    ChargenVerkauf,
+    Dokument,
+    LieferscheinExtern,
+    LieferscheinIntern,
+)
+from sqlalchemy import func, literal_column, or_, select, tuple_, union_all
+
+logger = logging.getLogger(__name__)
+
+# Suchfeld -> (Spalte in chargen_einkauf, Spalte in chargen_verkauf)
+SUCHFELDER = {
+    "seriennummer": (ChargenEinkauf.snnr, ChargenVerkauf.charge),
+    "materialnr": (ChargenEinkauf.materialnr, ChargenVerkauf.materialnr),
+    "artikel": (ChargenEinkauf.artikel, ChargenVerkauf.artikel),
+    "atnr": (ChargenEinkauf.atnr, ChargenVerkauf.atnr),
+}
+
+RICHTUNGEN = ("einkauf", "verkauf")
+
+# Kürzere Suchbegriffe enthalten kein vollständiges Trigramm - der GIN-Index greift dann nicht
+MIN_SUCHBEGRIFF_LAENGE = 3
+
+def _like_pattern(suchbegriff: str) -> str:
+    """Teilstring-Muster für ILIKE; %, _ und \\ im Suchbegriff gelten wörtlich."""
+    escaped = suchbegriff.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+    return f"%{escaped}%"
+
+class AsyncChargenRepository:
+    """Chargen-Suche für die FastAPI-Routen"""
+
+    @staticmethod
+    def encode_cursor(rang: float, richtung: str, charge_id: int) -> str:
+        """Opaker Cursor für die Keyset-Pagination über (rang, richtung, charge_id)."""
+        raw = json.dumps([rang, richtung, charge_id]).encode()
+        return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+    @staticmethod
+    def decode_cursor(cursor: str) -> Tuple[float, str, int]:
+        """
+        Raises:
+            ValueError: Bei ungültigem Cursor
+        """
+        try:
+            raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+            rang, richtung, charge_id = json.loads(raw)
+            if richtung not in RICHTUNGEN:
+                raise ValueError(richtung)
+            return float(rang), richtung, int(charge_id)
+        except Exception as e:
+            raise ValueError(f"Ungültiger Cursor: {cursor}") from e
+
+    @staticmethod
+    async def search(
+        suchbegriff: str,
+        felder: Optional[Sequence[str]] = None,
+        richtung: Optional[str] = None,
+        limit: int = 50,
+        cursor: Optional[str] = None
+    ) -> dict:
+        """
+        Sucht Chargen per Teilstring (ILIKE, groß/klein egal) in Einkauf und Verkauf.
+
+        Einkauf und Verkauf werden per UNION ALL in einer Abfrage durchsucht, jeweils
+        mit Lieferschein (extern/intern) und Dokument. Sortiert nach Trigramm-Ähnlichkeit
+        zum Suchbegriff, damit exakte Seriennummern vor bloßen Teiltreffern stehen.
+
+        Args:
+            suchbegriff: Gesuchter Teilstring (mind. MIN_SUCHBEGRIFF_LAENGE Zeichen)
+            felder: Zu durchsuchende Felder aus SUCHFELDER (Standard: alle)
+            richtung: 'einkauf' oder 'verkauf' (Standard: beide)
+            limit: Maximale Anzahl Chargen
+            cursor: next_cursor der vorherigen Seite
+
+        Returns:
+            Dictionary mit treffer und next_cursor
+
+        Raises:
+            ValueError: Bei zu kurzem Suchbegriff, unbekanntem Feld/Richtung oder ungültigem Cursor
+        """
+        suchbegriff = suchbegriff.strip()
+        if len(suchbegriff) < MIN_SUCHBEGRIFF_LAENGE:
+            raise ValueError(f"Suchbegriff muss mindestens {MIN_SUCHBEGRIFF_LAENGE} Zeichen lang sein")
+
+        felder = list(felder) if felder else list(SUCHFELDER)
+        unbekannt = [feld for feld in felder if feld not in SUCHFELDER]
+        if unbekannt:
+            raise ValueError(f"Unbekannte Suchfelder: {', '.join(unbekannt)}")
+
+        if richtung is not None and richtung not in RICHTUNGEN:
+            raise ValueError(f"Unbekannte Richtung: {richtung}")
+
+        pattern = _like_pattern(suchbegriff)
+
+        def zweig(name, chargen, lieferschein, lieferschein_fk, spalten, seriennummer, partner):
+            suchspalten = [spalten[feld] for feld in felder]
+            return select(
+                literal_column(f"'{name}'").label("richtung"),
+                chargen.id.label("charge_id"),
+                seriennummer.label("seriennummer"),
+                chargen.materialnr,
+                chargen.artikel,
+                chargen.atnr,
+                chargen.menge,
+                chargen.lieferdatum,
+                partner.label("partner"),
+                lieferschein.id.label("lieferschein_id"),
+                lieferschein.lieferscheinnummer,
+                lieferschein.csv_importiert,
+                Dokument.id.label("dokument_id"),
+                Dokument.dateiname,
+                Dokument.pfad,
+                func.greatest(*(func.similarity(spalte, suchbegriff) for spalte in suchspalten)).label("rang")
+            )\
+                .join(lieferschein, lieferschein_fk == lieferschein.id)\
+                .join(Dokument, lieferschein.dokument_id == Dokument.id)\
+                .where(or_(*(spalte.ilike(pattern, escape="\\") for spalte in suchspalten)))
+
+        zweige = []
+        if richtung in (None, "einkauf"):
+            zweige.append(zweig(
+                "einkauf",
+                ChargenEinkauf,
+                LieferscheinExtern,
+                ChargenEinkauf.lieferschein_extern_id,
+                {feld: spalten[0] for feld, spalten in SUCHFELDER.items()},
+                ChargenEinkauf.snnr,
+                ChargenEinkauf.liname
+            ))
+        if richtung in (None, "verkauf"):
+            zweige.append(zweig(
+                "verkauf",
+                ChargenVerkauf,
+                LieferscheinIntern,
+                ChargenVerkauf.lieferschein_intern_id,
+                {feld: spalten[1] for feld, spalten in SUCHFELDER.items()},
+                ChargenVerkauf.charge,
+                ChargenVerkauf.kdname
+            ))
+
+        treffer = (union_all(*zweige) if len(zweige) > 1 else zweige[0]).subquery("treffer")
+
+        query = select(treffer)
+        if cursor:
+            cursor_rang, cursor_richtung, cursor_id = AsyncChargenRepository.decode_cursor(cursor)
+            query = query.where(
+                tuple_(treffer.c.rang, treffer.c.richtung, treffer.c.charge_id)
+                < tuple_(cursor_rang, cursor_richtung, cursor_id)
+            )
+        query = query.order_by(treffer.c.rang.desc(), treffer.c.richtung.desc(), treffer.c.charge_id.desc())\
+            .limit(limit + 1)
+
+        async with get_async_db_session() as session:
+            rows = (await session.execute(query)).mappings().all()
+
+        next_cursor = None
+        if len(rows) > limit:
+            rows = rows[:limit]
+            last = rows[-1]
+            next_cursor = AsyncChargenRepository.encode_cursor(last["rang"], last["richtung"], last["charge_id"])
+
+        return {
+            "treffer": [
+                {
+                    "richtung": row["richtung"],
+                    "id": row["charge_id"],
+                    "seriennummer": row["seriennummer"],
+                    "materialnr": row["materialnr"],
+                    "artikel": row["artikel"],
+                    "atnr": row["atnr"],
+                    "menge": row["menge"],
+                    "lieferdatum": row["lieferdatum"],
+                    "partner": row["partner"],
+                    "rang": row["rang"],
+                    "lieferschein": {
+                        "id": row["lieferschein_id"],
+                        "lieferscheinnummer": row["lieferscheinnummer"],
+                        "csv_importiert": row["csv_importiert"]
+                    },
+                    "dokument": {
+                        "id": row["dokument_id"],
+                        "dateiname": row["dateiname"],
+                        "pfad": row["pfad"]
+                    }
+                }
+                for row in rows
+            ],
+            "next_cursor": next_cursor
+        }
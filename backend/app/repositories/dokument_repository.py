@@ -3,15 +3,36 @@ Repository für Dokument-Operationen
 Ersetzt die alten SQLite-basierten Model-Methoden
 """
 
+import base64
+import json
 import logging
-from typing import List, Optional
+from datetime import datetime
+from typing import Iterable, List, Optional, Sequence, Set, Tuple
 
-from app.database.postgres_connection import get_db_session
-from app.models.database import Dokument, Kategorie, Unterkategorie
-from sqlalchemy.orm import joinedload
+from app.database.postgres_connection import get_async_db_session, get_db_session
+from app.models.database import (
+    ERSTELLT_AM_OHNE_DATUM,
+    Dokument,
+    Kategorie,
+    LieferscheinExtern,
+    LieferscheinIntern,
+    Unterkategorie,
+)
+from sqlalchemy import Select, func, literal_column, or_, select, text, tuple_
+from sqlalchemy.orm import aliased, joinedload, selectinload
 
 logger = logging.getLogger(__name__)
 
+# Felder der Dokumentliste (Projektion über ?fields=...)
+LIST_FIELDS = ("id", "dateiname", "kategorie", "unterkategorie", "pfad", "inhalt_vorschau", "erstellt_am", "metadaten")
+
+# Sortierschlüssel der Dokumentliste (Ausdrucksindex ix_dokumente_sortierung_id):
+# Dokumente ohne erstellt_am stehen am Ende und bleiben über den Cursor erreichbar
+SORTIERUNG = func.coalesce(Dokument.erstellt_am, literal_column(ERSTELLT_AM_OHNE_DATUM))
+
+# Unterhalb dieser geschätzten Zeilenzahl wird exakt gezählt (count(*) ist dann billig)
+EXACT_COUNT_THRESHOLD = 10000
+
 class DokumentRepository:
     """Repository für Dokument-CRUD-Operationen"""
     
@@ -30,47 +51,283 @@ class DokumentRepository:
                     .all()
                 
                 # Innerhalb der Session zu Dictionaries konvertieren
-                result = []
-                for dok in dokumente:
-                    # Debug-Output für fehlende Unterkategorien
-                    kategorie_name = None
-                    unterkategorie_name = None
-                    
-                    if dok.unterkategorie:
-                        unterkategorie_name = dok.unterkategorie.name
-                        if dok.unterkategorie.kategorie:
-                            kategorie_name = dok.unterkategorie.kategorie.name
-                    
-                    # Für Legacy-Kompatibilität: Wenn nur kategorie_id gesetzt ist
-                    elif dok.kategorie_id:
-                        try:
-                            kategorie = session.query(Kategorie).filter(Kategorie.id == dok.kategorie_id).first()
-                            if kategorie:
-                                kategorie_name = kategorie.name
-                        except:
-                            pass
-                    
-                    result.append({
-                        "id": dok.id,
-                        "dateiname": dok.dateiname,
-                        "kategorie": kategorie_name,
-                        "unterkategorie": unterkategorie_name,
-                            # DEBUG: Temporär
-                        "debug_kategorie_id": dok.kategorie_id,
-                        "debug_unterkategorie_id": dok.unterkategorie_id,
-                        "pfad": dok.pfad,
-                        "pfad": dok.pfad,
-                        "inhalt_vorschau": dok.inhalt_vorschau,
-                        "erstellt_am": dok.erstellt_am.isoformat() if dok.erstellt_am else None,
-                        "metadaten": dok.metadaten or {}
-                    })
-                
-                return result
+                return [DokumentRepository._to_list_dict(dok, session) for dok in dokumente]
                 
         except Exception as e:
             logger.error(f"Fehler beim Laden aller Dokumente: {e}")
             return []
     
+    @staticmethod
+    def _to_list_dict(dok: Dokument, session) -> dict:
+        """Konvertiert ein Dokument (mit geladener Unterkategorie) in das Listenformat von get_all()."""
+        kategorie_name = None
+        unterkategorie_name = None
+        
+        if dok.unterkategorie:
+            unterkategorie_name = dok.unterkategorie.name
+            if dok.unterkategorie.kategorie:
+                kategorie_name = dok.unterkategorie.kategorie.name
+        
+        # Für Legacy-Kompatibilität: Wenn nur kategorie_id gesetzt ist
+        elif dok.kategorie_id:
+            try:
+                kategorie = session.query(Kategorie).filter(Kategorie.id == dok.kategorie_id).first()
+                if kategorie:
+                    kategorie_name = kategorie.name
+            except:
+                pass
+        
+        return {
+            "id": dok.id,
+            "dateiname": dok.dateiname,
+            "kategorie": kategorie_name,
+            "unterkategorie": unterkategorie_name,
+                # DEBUG: Temporär
+            "debug_kategorie_id": dok.kategorie_id,
+            "debug_unterkategorie_id": dok.unterkategorie_id,
+            "pfad": dok.pfad,
+            "inhalt_vorschau": dok.inhalt_vorschau,
+            "erstellt_am": dok.erstellt_am.isoformat() if dok.erstellt_am else None,
+            "metadaten": dok.metadaten or {}
+        }
+    
+    @staticmethod
+    def encode_cursor(erstellt_am: datetime, dokument_id: int) -> str:
+        """Opaker Cursor für die Keyset-Pagination über (SORTIERUNG, id)."""
+        raw = json.dumps([erstellt_am.isoformat(), dokument_id]).encode()
+        return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+    
+    @staticmethod
+    def decode_cursor(cursor: str) -> Tuple[datetime, int]:
+        """
+        Raises:
+            ValueError: Bei ungültigem Cursor
+        """
+        try:
+            raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+            erstellt_am, dokument_id = json.loads(raw)
+            return datetime.fromisoformat(erstellt_am), int(dokument_id)
+        except Exception as e:
+            raise ValueError(f"Ungültiger Cursor: {cursor}") from e
+    
+    @staticmethod
+    def get_page(
+        limit: int = 50,
+        cursor: Optional[str] = None,
+        kategorie: Optional[str] = None,
+        unterkategorie: Optional[str] = None,
+        von: Optional[datetime] = None,
+        bis: Optional[datetime] = None,
+        fields: Optional[Sequence[str]] = None
+    ) -> dict:
+        """
+        Eine Seite der Dokumentliste (neueste zuerst) mit einer einzigen Abfrage.
+        
+        Keyset-Pagination über (erstellt_am, id) statt OFFSET; Kategorie kommt per Join
+        (über die Unterkategorie bzw. Legacy-kategorie_id) statt einer Abfrage pro Dokument.
+        Dokumente ohne erstellt_am stehen am Ende der Liste.
+        
+        Args:
+            limit: Maximale Anzahl Dokumente
+            cursor: next_cursor der vorherigen Seite
+            kategorie: Filter auf Kategorie-Namen
+            unterkategorie: Filter auf Unterkategorie-Namen
+            von: erstellt_am >= von
+            bis: erstellt_am < bis
+            fields: Zurückgegebene Felder (Standard: alle aus LIST_FIELDS)
+            
+        Returns:
+            Dictionary mit dokumente, next_cursor, total und total_geschaetzt
+            
+        Raises:
+            ValueError: Bei ungültigem Cursor oder unbekanntem Feld
+        """
+        base, page_query, fields, filtered = DokumentRepository._page_queries(
+            limit, cursor, kategorie, unterkategorie, von, bis, fields
+        )
+        
+        with get_db_session() as session:
+            rows = session.execute(page_query).mappings().all()
+            total, geschaetzt = DokumentRepository._estimate_total(session, base if filtered else None)
+        
+        return DokumentRepository._page_result(rows, limit, fields, total, geschaetzt)
+    
+    @staticmethod
+    def _page_queries(
+        limit: int,
+        cursor: Optional[str],
+        kategorie: Optional[str],
+        unterkategorie: Optional[str],
+        von: Optional[datetime],
+        bis: Optional[datetime],
+        fields: Optional[Sequence[str]]
+    ) -> Tuple[Select, Select, List[str], bool]:
+        """
+        Baut die Abfragen für get_page() (gemeinsam für die Sync- und Async-Variante).
+        
+        Returns:
+            (gefilterte Basisabfrage für total, Seitenabfrage, Felder, True wenn gefiltert)
+        """
+        fields = list(fields) if fields else list(LIST_FIELDS)
+        unknown = [field for field in fields if field not in LIST_FIELDS]
+        if unknown:
+            raise ValueError(f"Unbekannte Felder: {', '.join(unknown)}")
+        
+        unterkategorie_kategorie = aliased(Kategorie)
+        legacy_kategorie = aliased(Kategorie)
+        kategorie_name = func.coalesce(unterkategorie_kategorie.name, legacy_kategorie.name)
+        
+        columns = {
+            "id": Dokument.id,
+            "dateiname": Dokument.dateiname,
+            "kategorie": kategorie_name,
+            "unterkategorie": Unterkategorie.name,
+            "pfad": Dokument.pfad,
+            "inhalt_vorschau": Dokument.inhalt_vorschau,
+            "erstellt_am": Dokument.erstellt_am,
+            "metadaten": Dokument.metadaten
+        }
+        # id und Sortierschlüssel werden immer für den Cursor geladen
+        selected = list(dict.fromkeys(["id"] + fields))
+        
+        base = select(*(columns[field].label(field) for field in selected), SORTIERUNG.label("sortierung"))\
+            .select_from(Dokument)\
+            .outerjoin(Unterkategorie, Dokument.unterkategorie_id == Unterkategorie.id)\
+            .outerjoin(unterkategorie_kategorie, Unterkategorie.kategorie_id == unterkategorie_kategorie.id)\
+            .outerjoin(legacy_kategorie, Dokument.kategorie_id == legacy_kategorie.id)
+        
+        if kategorie:
+            base = base.where(kategorie_name == kategorie)
+        if unterkategorie:
+            base = base.where(Unterkategorie.name == unterkategorie)
+        if von:
+            base = base.where(Dokument.erstellt_am >= von)
+        if bis:
+            base = base.where(Dokument.erstellt_am < bis)
+        
+        page_query = base
+        if cursor:
+            cursor_erstellt_am, cursor_id = DokumentRepository.decode_cursor(cursor)
+            page_query = page_query.where(
+                tuple_(SORTIERUNG, Dokument.id) < tuple_(cursor_erstellt_am, cursor_id)
+            )
+        page_query = page_query.order_by(SORTIERUNG.desc(), Dokument.id.desc()).limit(limit + 1)
+        
+        filtered = bool(kategorie or unterkategorie or von or bis)
+        return base, page_query, fields, filtered
+    
+    @staticmethod
+    def _page_result(rows, limit: int, fields: List[str], total: int, geschaetzt: bool) -> dict:
+        """Formt die Zeilen der Seitenabfrage (limit + 1) in das Ergebnis von get_page() um."""
+        next_cursor = None
+        if len(rows) > limit:
+            rows = rows[:limit]
+            next_cursor = DokumentRepository.encode_cursor(rows[-1]["sortierung"], rows[-1]["id"])
+        
+        dokumente = []
+        for row in rows:
+            dokument = {field: row[field] for field in fields}
+            if "erstellt_am" in dokument and dokument["erstellt_am"]:
+                dokument["erstellt_am"] = dokument["erstellt_am"].isoformat()
+            if "metadaten" in dokument:
+                dokument["metadaten"] = dokument["metadaten"] or {}
+            dokumente.append(dokument)
+        
+        return {
+            "dokumente": dokumente,
+            "next_cursor": next_cursor,
+            "total": total,
+            "total_geschaetzt": geschaetzt
+        }
+    
+    @staticmethod
+    def _estimate_total(session, filtered_query=None) -> Tuple[int, bool]:
+        """
+        Gesamtzahl aus der Planer-Schätzung statt count(*) über alle Zeilen.
+        
+        Ohne Filter: pg_class.reltuples; mit Filter: geschätzte Zeilen aus EXPLAIN.
+        Kleine Ergebnisse (< EXACT_COUNT_THRESHOLD) werden exakt gezählt.
+        
+        Returns:
+            (Anzahl, True wenn geschätzt)
+        """
+        try:
+            # Savepoint: ein Fehler (z.B. fehlende Rechte auf pg_class) bricht die Transaktion nicht ab
+            with session.begin_nested():
+                if filtered_query is None:
+                    estimate = session.execute(
+                        text("SELECT reltuples::bigint FROM pg_class WHERE oid = 'dokumente'::regclass")
+                    ).scalar()
+                else:
+                    compiled = filtered_query.compile(dialect=session.bind.dialect)
+                    params = compiled.params
+                    if compiled.positional:  # z.B. asyncpg ($1, $2, ...)
+                        params = tuple(params[name] for name in compiled.positiontup)
+                    plan = session.connection().exec_driver_sql(
+                        f"EXPLAIN (FORMAT JSON) {compiled}", params
+                    ).scalar()
+                    if isinstance(plan, str):
+                        plan = json.loads(plan)
+                    estimate = int(plan[0]["Plan"]["Plan Rows"])
+            
+            if estimate is not None and estimate >= EXACT_COUNT_THRESHOLD:
+                return int(estimate), True
+        except Exception as e:
+            logger.debug(f"Zeilenschätzung nicht verfügbar, zähle exakt: {e}")
+        
+        count_query = select(func.count()).select_from(
+            (filtered_query if filtered_query is not None else select(Dokument.id)).subquery()
+        )
+        return session.execute(count_query).scalar(), False
+    
+    @staticmethod
+    def find_by_original_dateiname(dateiname: str) -> List[dict]:
+        """
+        Sucht Dokumente, die unter diesem Dateinamen angelegt wurden - auch wenn sie
+        inzwischen verschoben und umbenannt sind (indexierte Abfrage, neueste zuerst).
+        
+        Returns:
+            Liste von Dictionaries mit id, dateiname und pfad
+        """
+        try:
+            with get_db_session() as session:
+                rows = session.query(Dokument.id, Dokument.dateiname, Dokument.pfad)\
+                    .filter(Dokument.original_dateiname == dateiname)\
+                    .order_by(Dokument.erstellt_am.desc())\
+                    .all()
+                
+                return [{"id": row.id, "dateiname": row.dateiname, "pfad": row.pfad} for row in rows]
+                
+        except Exception as e:
+            logger.error(f"Fehler beim Suchen von Dokumenten mit Dateiname {dateiname}: {e}")
+            return []
+    
+    @staticmethod
+    def find_by_pfad_or_dateiname(pfad: str, dateiname: str) -> Optional[dict]:
+        """
+        Findet ein Dokument anhand von Pfad oder Dateiname (indexierte Abfrage statt get_all()-Scan).
+        Ein exakter Pfad-Treffer hat Vorrang vor neueren Dokumenten mit gleichem Dateinamen.
+        
+        Returns:
+            Dictionary im Format von get_all() oder None
+        """
+        try:
+            with get_db_session() as session:
+                dokument = session.query(Dokument)\
+                    .options(joinedload(Dokument.unterkategorie).joinedload(Unterkategorie.kategorie))\
+                    .filter(or_(Dokument.pfad == pfad, Dokument.dateiname == dateiname))\
+                    .order_by((Dokument.pfad == pfad).desc(), Dokument.erstellt_am.desc())\
+                    .first()
+                
+                if not dokument:
+                    return None
+                
+                return DokumentRepository._to_list_dict(dokument, session)
+                
+        except Exception as e:
+            logger.error(f"Fehler beim Suchen des Dokuments {dateiname}: {e}")
+            return None
+    
     @staticmethod
     def get_by_id(dokument_id: int) -> Optional[Dokument]:
         """Ruft ein Dokument anhand seiner ID ab."""
@@ -106,6 +363,30 @@ class DokumentRepository:
             logger.error(f"Fehler beim Laden des Dokuments {dateiname}: {e}")
             return None
     
+    @staticmethod
+    def get_existing_filenames(dateinamen: Iterable[str]) -> Set[str]:
+        """
+        Gibt zurück, welche der Dateinamen bereits als Dokument existieren.
+        
+        Eine einzige IN-Abfrage für die komplette Verzeichnisliste statt einer Abfrage pro Datei.
+        """
+        dateinamen = list(dict.fromkeys(dateinamen))
+        if not dateinamen:
+            return set()
+        
+        try:
+            with get_db_session() as session:
+                rows = session.query(Dokument.dateiname)\
+                    .filter(Dokument.dateiname.in_(dateinamen))\
+                    .distinct()\
+                    .all()
+                
+                return {row.dateiname for row in rows}
+                
+        except Exception as e:
+            logger.error(f"Fehler beim Prüfen vorhandener Dateinamen: {e}")
+            return set()
+    
     @staticmethod
     def create(dateiname: str, pfad: str, inhalt_vorschau: Optional[str] = None) -> Optional[dict]:
         """Erstellt ein neues Dokument in der Datenbank. Returns Dictionary."""
@@ -113,6 +394,7 @@ class DokumentRepository:
             with get_db_session() as session:
                 dokument = Dokument(
                     dateiname=dateiname,
+                    original_dateiname=dateiname,
                     pfad=pfad,
                     inhalt_vorschau=inhalt_vorschau
                 )
@@ -325,4 +607,197 @@ class DokumentRepository:
             "inhalt_vorschau": dokument.inhalt_vorschau,
             "erstellt_am": dokument.erstellt_am.isoformat() if dokument.erstellt_am else None,
             "metadaten": dokument.metadaten or {}
-        }
\ No newline at end of file
+        }
+
+class AsyncDokumentRepository:
+    """
+    Async-Variante der von den FastAPI-Routen genutzten DokumentRepository-Methoden
+    (get_async_db_session statt get_db_session; Rückgabeformate identisch).
+    """
+    
+    @staticmethod
+    async def get_page(
+        limit: int = 50,
+        cursor: Optional[str] = None,
+        kategorie: Optional[str] = None,
+        unterkategorie: Optional[str] = None,
+        von: Optional[datetime] = None,
+        bis: Optional[datetime] = None,
+        fields: Optional[Sequence[str]] = None
+    ) -> dict:
+        """
+        Siehe DokumentRepository.get_page().
+        
+        Raises:
+            ValueError: Bei ungültigem Cursor oder unbekanntem Feld
+        """
+        base, page_query, fields, filtered = DokumentRepository._page_queries(
+            limit, cursor, kategorie, unterkategorie, von, bis, fields
+        )
+        
+        async with get_async_db_session() as session:
+            rows = (await session.execute(page_query)).mappings().all()
+            total, geschaetzt = await session.run_sync(
+                DokumentRepository._estimate_total, base if filtered else None
+            )
+        
+        return DokumentRepository._page_result(rows, limit, fields, total, geschaetzt)
+    
+    @staticmethod
+    async def get_by_id(dokument_id: int) -> Optional[Dokument]:
+        """Ruft ein Dokument (inkl. Unterkategorie und Kategorie) anhand seiner ID ab."""
+        try:
+            async with get_async_db_session() as session:
+                result = await session.execute(
+                    select(Dokument)
+                    .options(joinedload(Dokument.unterkategorie).joinedload(Unterkategorie.kategorie))
+                    .where(Dokument.id == dokument_id)
+                )
+                dokument = result.scalars().first()
+                
+                if dokument:
+                    session.expunge(dokument)
+                return dokument
+                
+        except Exception as e:
+            logger.error(f"Fehler beim Laden des Dokuments {dokument_id}: {e}")
+            return None
+    
+    @staticmethod
+    async def get_list_dict_by_id(dokument_id: int) -> Optional[dict]:
+        """Ein Dokument im Listenformat von get_all() (inkl. Legacy-Kategorie über kategorie_id)."""
+        try:
+            async with get_async_db_session() as session:
+                dokument = (await session.execute(
+                    select(Dokument)
+                    .options(joinedload(Dokument.unterkategorie).joinedload(Unterkategorie.kategorie))
+                    .where(Dokument.id == dokument_id)
+                )).scalars().first()
+                
+                if not dokument:
+                    return None
+                
+                return await session.run_sync(
+                    lambda sync_session: DokumentRepository._to_list_dict(dokument, sync_session)
+                )
+                
+        except Exception as e:
+            logger.error(f"Fehler beim Laden des Dokuments {dokument_id}: {e}")
+            return None
+    
+    @staticmethod
+    async def create(dateiname: str, pfad: str, inhalt_vorschau: Optional[str] = None) -> Optional[dict]:
+        """Erstellt ein neues Dokument in der Datenbank. Returns Dictionary."""
+        try:
+            async with get_async_db_session() as session:
+                dokument = Dokument(
+                    dateiname=dateiname,
+                    original_dateiname=dateiname,
+                    pfad=pfad,
+                    inhalt_vorschau=inhalt_vorschau
+                )
+                
+                session.add(dokument)
+                await session.flush()  # Um ID zu bekommen
+                await session.refresh(dokument)
+                
+                return {
+                    "id": dokument.id,
+                    "dateiname": dokument.dateiname,
+                    "kategorie": None,
+                    "unterkategorie": None,
+                    "pfad": dokument.pfad,
+                    "inhalt_vorschau": dokument.inhalt_vorschau,
+                    "erstellt_am": dokument.erstellt_am.isoformat() if dokument.erstellt_am else None,
+                    "metadaten": dokument.metadaten or {}
+                }
+                
+        except Exception as e:
+            logger.error(f"Fehler beim Erstellen des Dokuments {dateiname}: {e}")
+            return None
+    
+    @staticmethod
+    async def update_kategorie(dokument_id: int, kategorie_name: str, unterkategorie_name: str) -> Optional[dict]:
+        """Siehe DokumentRepository.update_kategorie()."""
+        try:
+            async with get_async_db_session() as session:
+                dokument = await session.get(Dokument, dokument_id)
+                if not dokument:
+                    logger.error(f"Dokument {dokument_id} nicht gefunden")
+                    return None
+                
+                unterkategorie = (await session.execute(
+                    select(Unterkategorie)
+                    .join(Kategorie)
+                    .where(Kategorie.name == kategorie_name, Unterkategorie.name == unterkategorie_name)
+                )).scalars().first()
+                
+                if not unterkategorie:
+                    logger.error(f"Unterkategorie {kategorie_name}/{unterkategorie_name} nicht gefunden")
+                    return None
+                
+                dokument.kategorie_id = unterkategorie.kategorie_id
+                dokument.unterkategorie_id = unterkategorie.id
+                await session.flush()
+                
+                # Relationships frisch laden (Lazy-Loading ist in Async-Sessions nicht möglich)
+                updated_dokument = (await session.execute(
+                    select(Dokument)
+                    .options(joinedload(Dokument.unterkategorie).joinedload(Unterkategorie.kategorie))
+                    .where(Dokument.id == dokument_id)
+                    .execution_options(populate_existing=True)
+                )).scalars().first()
+                
+                logger.info(f"Dokument {dokument_id} kategorisiert als {kategorie_name}/{unterkategorie_name}")
+                return DokumentRepository.to_dict(updated_dokument)
+                
+        except Exception as e:
+            logger.error(f"Fehler beim Kategorisieren des Dokuments {dokument_id}: {e}")
+            return None
+    
+    @staticmethod
+    async def update_metadaten(dokument_id: int, metadaten: dict) -> Optional[dict]:
+        """Aktualisiert die Metadaten eines Dokuments. Returns Dictionary."""
+        try:
+            async with get_async_db_session() as session:
+                dokument = (await session.execute(
+                    select(Dokument)
+                    .options(joinedload(Dokument.unterkategorie).joinedload(Unterkategorie.kategorie))
+                    .where(Dokument.id == dokument_id)
+                )).scalars().first()
+                
+                if not dokument:
+                    return None
+                
+                dokument.metadaten = metadaten
+                await session.flush()
+                
+                return DokumentRepository.to_dict(dokument)
+                
+        except Exception as e:
+            logger.error(f"Fehler beim Aktualisieren der Metadaten für Dokument {dokument_id}: {e}")
+            return None
+    
+    @staticmethod
+    async def delete(dokument_id: int) -> bool:
+        """Löscht ein Dokument aus der Datenbank (inkl. Lieferscheine per ORM-Cascade)."""
+        try:
+            async with get_async_db_session() as session:
+                dokument = (await session.execute(
+                    select(Dokument)
+                    .options(
+                        # Cascade-Ziele vorab laden (Lazy-Loading ist in Async-Sessions nicht möglich)
+                        selectinload(Dokument.lieferscheine_extern).selectinload(LieferscheinExtern.chargen_einkauf),
+                        selectinload(Dokument.lieferscheine_intern).selectinload(LieferscheinIntern.chargen_verkauf)
+                    )
+                    .where(Dokument.id == dokument_id)
+                )).scalars().first()
+                if not dokument:
+                    return False
+                
+                await session.delete(dokument)
+                return True
+                
+        except Exception as e:
+            logger.error(f"Fehler beim Löschen des Dokuments {dokument_id}: {e}")
+            return False
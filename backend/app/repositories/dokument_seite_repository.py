@@ -0,0 +1,193 @@
+"""
+Repository für den Volltext der Dokumentseiten (Tabelle dokument_seiten)
+und die Volltextsuche über den deutschen tsvector (GIN-Index)
+"""
+
+import base64
+import json
+import logging
+from typing import List, Optional, Sequence, Tuple
+
+from app.database.postgres_connection import get_async_db_session, get_db_session
+from app.models.database import Dokument, DokumentSeite, Kategorie, Unterkategorie
+from sqlalchemy import delete, exists, func, insert, select, tuple_
+from sqlalchemy.orm import aliased
+
+logger = logging.getLogger(__name__)
+
+# Konfiguration der Textsuche (deutsche Stammformen, Stoppwörter)
+TS_CONFIG = "german"
+
+# ts_headline-Optionen für die Treffer-Ausschnitte
+HEADLINE_OPTIONS = "StartSel=<mark>, StopSel=</mark>, MaxWords=35, MinWords=15, MaxFragments=2, FragmentDelimiter= … "
+
+class DokumentSeiteRepository:
+    """Repository für den Seitentext der Dokumente"""
+
+    @staticmethod
+    def replace_for_dokument(dokument_id: int, seiten: Sequence[str]) -> int:
+        """
+        Ersetzt den gespeicherten Text aller Seiten eines Dokuments.
+
+        Args:
+            dokument_id: ID des Dokuments
+            seiten: Text pro Seite in Seitenreihenfolge
+
+        Returns:
+            Anzahl gespeicherter Seiten (0 bei Fehler)
+        """
+        try:
+            with get_db_session() as session:
+                session.execute(delete(DokumentSeite).where(DokumentSeite.dokument_id == dokument_id))
+
+                rows = [
+                    {"dokument_id": dokument_id, "seite": nummer, "text": text}
+                    for nummer, text in enumerate(seiten, start=1)
+                ]
+                if rows:
+                    session.execute(insert(DokumentSeite), rows)
+
+                return len(rows)
+
+        except Exception as e:
+            logger.error(f"Fehler beim Speichern des Seitentexts für Dokument {dokument_id}: {e}")
+            return 0
+
+    @staticmethod
+    def has_pages(dokument_id: int) -> bool:
+        """Prüft, ob für das Dokument bereits Seitentext gespeichert ist."""
+        try:
+            with get_db_session() as session:
+                return session.execute(
+                    select(exists().where(DokumentSeite.dokument_id == dokument_id))
+                ).scalar()
+
+        except Exception as e:
+            logger.error(f"Fehler beim Prüfen des Seitentexts für Dokument {dokument_id}: {e}")
+            return False
+
+    @staticmethod
+    def get_dokumente_ohne_seiten(limit: int = 500) -> List[dict]:
+        """Dokumente ohne gespeicherten Seitentext (für die nachträgliche Indexierung)."""
+        try:
+            with get_db_session() as session:
+                rows = session.query(Dokument.id, Dokument.dateiname, Dokument.pfad)\
+                    .filter(~exists().where(DokumentSeite.dokument_id == Dokument.id))\
+                    .order_by(Dokument.id)\
+                    .limit(limit)\
+                    .all()
+
+                return [{"id": row.id, "dateiname": row.dateiname, "pfad": row.pfad} for row in rows]
+
+        except Exception as e:
+            logger.error(f"Fehler beim Laden der Dokumente ohne Seitentext: {e}")
+            return []
+
+    @staticmethod
+    def encode_cursor(rang: float, dokument_id: int) -> str:
+        """Opaker Cursor für die Keyset-Pagination über (rang, dokument_id)."""
+        raw = json.dumps([rang, dokument_id]).encode()
+        return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+    @staticmethod
+    def decode_cursor(cursor: str) -> Tuple[float, int]:
+        """
+        Raises:
+            ValueError: Bei ungültigem Cursor
+        """
+        try:
+            raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+            rang, dokument_id = json.loads(raw)
+            return float(rang), int(dokument_id)
+        except Exception as e:
+            raise ValueError(f"Ungültiger Cursor: {cursor}") from e
+
+class AsyncDokumentSeiteRepository:
+    """Volltextsuche für die FastAPI-Routen"""
+
+    @staticmethod
+    async def search(suchbegriff: str, limit: int = 20, cursor: Optional[str] = None) -> dict:
+        """
+        Sucht Dokumente über den Seitentext (websearch-Syntax: "Phrase", -ausschließen, or).
+
+        Ein Dokument erscheint einmal mit seiner bestbewerteten Seite. Sortiert nach
+        ts_rank_cd absteigend; Ausschnitte (ts_headline) werden nur für die Treffer der
+        aktuellen Seite erzeugt. Keine Gesamtzahl: count über alle Treffer wäre bei
+        häufigen Begriffen teurer als die Suche selbst.
+
+        Args:
+            suchbegriff: Suchtext
+            limit: Maximale Anzahl Dokumente
+            cursor: next_cursor der vorherigen Seite
+
+        Returns:
+            Dictionary mit treffer und next_cursor
+
+        Raises:
+            ValueError: Bei ungültigem Cursor
+        """
+        tsquery = func.websearch_to_tsquery(TS_CONFIG, suchbegriff)
+        rang = func.ts_rank_cd(DokumentSeite.suchvektor, tsquery, 32).label("rang")
+
+        # Beste Seite je Dokument (GIN-Index über suchvektor @@ tsquery)
+        beste_seite = select(DokumentSeite.dokument_id, DokumentSeite.seite, rang)\
+            .where(DokumentSeite.suchvektor.op("@@")(tsquery))\
+            .distinct(DokumentSeite.dokument_id)\
+            .order_by(DokumentSeite.dokument_id, rang.desc())\
+            .subquery("beste_seite")
+
+        auswahl = select(beste_seite)
+        if cursor:
+            cursor_rang, cursor_id = DokumentSeiteRepository.decode_cursor(cursor)
+            auswahl = auswahl.where(
+                tuple_(beste_seite.c.rang, beste_seite.c.dokument_id) < tuple_(cursor_rang, cursor_id)
+            )
+        auswahl = auswahl.order_by(beste_seite.c.rang.desc(), beste_seite.c.dokument_id.desc())\
+            .limit(limit + 1)\
+            .subquery("auswahl")
+
+        unterkategorie_kategorie = aliased(Kategorie)
+        legacy_kategorie = aliased(Kategorie)
+
+        query = select(
+            auswahl.c.dokument_id,
+            auswahl.c.seite,
+            auswahl.c.rang,
+            Dokument.dateiname,
+            Dokument.erstellt_am,
+            func.coalesce(unterkategorie_kategorie.name, legacy_kategorie.name).label("kategorie"),
+            Unterkategorie.name.label("unterkategorie"),
+            func.ts_headline(TS_CONFIG, DokumentSeite.text, tsquery, HEADLINE_OPTIONS).label("ausschnitt")
+        )\
+            .select_from(auswahl)\
+            .join(Dokument, Dokument.id == auswahl.c.dokument_id)\
+            .join(DokumentSeite, (DokumentSeite.dokument_id == auswahl.c.dokument_id) & (DokumentSeite.seite == auswahl.c.seite))\
+            .outerjoin(Unterkategorie, Dokument.unterkategorie_id == Unterkategorie.id)\
+            .outerjoin(unterkategorie_kategorie, Unterkategorie.kategorie_id == unterkategorie_kategorie.id)\
+            .outerjoin(legacy_kategorie, Dokument.kategorie_id == legacy_kategorie.id)\
+            .order_by(auswahl.c.rang.desc(), auswahl.c.dokument_id.desc())
+
+        async with get_async_db_session() as session:
+            rows = (await session.execute(query)).mappings().all()
+
+        next_cursor = None
+        if len(rows) > limit:
+            rows = rows[:limit]
+            next_cursor = DokumentSeiteRepository.encode_cursor(rows[-1]["rang"], rows[-1]["dokument_id"])
+
+        return {
+            "treffer": [
+                {
+                    "id": row["dokument_id"],
+                    "dateiname": row["dateiname"],
+                    "kategorie": row["kategorie"],
+                    "unterkategorie": row["unterkategorie"],
+                    "erstellt_am": row["erstellt_am"].isoformat() if row["erstellt_am"] else None,
+                    "seite": row["seite"],
+                    "rang": row["rang"],
+                    "ausschnitt": row["ausschnitt"]
+                }
+                for row in rows
+            ],
+            "next_cursor": next_cursor
+        }
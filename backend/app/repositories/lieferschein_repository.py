@@ -4,14 +4,47 @@ Ersetzt die alten SQLite-basierten Lieferschein-Models
 """
 
 import logging
-from typing import List, Optional
+from collections.abc import Mapping
+from datetime import datetime
+from typing import Iterable, List, Optional
 
-from app.database.postgres_connection import get_db_session
+from app.database.postgres_connection import get_async_db_session, get_db_session
 from app.models.database import ChargenEinkauf, Dokument, LieferscheinExtern
+from sqlalchemy import delete, insert, select, update
 from sqlalchemy.orm import joinedload
 
 logger = logging.getLogger(__name__)
 
+# Spalte in chargen_einkauf -> Spalte im ERP-CSV-Export
+CHARGEN_EINKAUF_CSV_FIELDS = {
+    'linr': 'LINR',
+    'liname': 'LINAME',
+    'name1': 'NAME1',
+    'belfd': 'BELFD',
+    'tlnr': 'TLNR',
+    'auart': 'AUART',
+    'aftnr': 'AFTNR',
+    'aps': 'APS',
+    'absn': 'ABSN',
+    'atnr': 'ATNR',
+    'artikel': 'ARTIKEL',
+    'materialnr': 'MATERIALNR',
+    'urlnd': 'URLND',
+    'wartarnr': 'WARTARNR',
+    'menge': 'MENGE',
+    'erfmenge': 'ERFMENGE',
+    'gebindeme': 'GEBINDEME',
+    'snnr': 'SNNR',
+    'snnralt': 'SNNRALT',
+    'einzelek': 'EINZELEK',
+    'lieferscheinnr': 'LIEFERSCHEINNR',
+    'lieferdatum': 'LIEFERDATUM',
+    'renrex': 'RENREX',
+    'redat': 'REDAT',
+    'bidser': 'BIDSER',
+    'bid': 'BID',
+}
+
 class LieferscheinExternRepository:
     """Repository für externe Lieferscheine"""
     
@@ -140,6 +173,82 @@ class LieferscheinExternRepository:
             "erstellt_am": lieferschein.erstellt_am.isoformat() if lieferschein.erstellt_am else None
         }
 
+class AsyncLieferscheinExternRepository:
+    """Async-Variante der von den FastAPI-Routen genutzten LieferscheinExternRepository-Methoden"""
+    
+    @staticmethod
+    async def get_by_id(lieferschein_id: int) -> Optional[LieferscheinExtern]:
+        """Ruft einen externen Lieferschein (inkl. Dokument) anhand seiner ID ab."""
+        try:
+            async with get_async_db_session() as session:
+                lieferschein = (await session.execute(
+                    select(LieferscheinExtern)
+                    .options(joinedload(LieferscheinExtern.dokument))
+                    .where(LieferscheinExtern.id == lieferschein_id)
+                )).scalars().first()
+                
+                if lieferschein:
+                    session.expunge(lieferschein)
+                return lieferschein
+                
+        except Exception as e:
+            logger.error(f"Fehler beim Laden des Lieferscheins {lieferschein_id}: {e}")
+            return None
+    
+    @staticmethod
+    async def get_by_dokument_id(dokument_id: int) -> Optional[LieferscheinExtern]:
+        """Ruft den externen Lieferschein eines Dokuments ab (indexierte Abfrage statt get_all()-Scan)."""
+        try:
+            async with get_async_db_session() as session:
+                lieferschein = (await session.execute(
+                    select(LieferscheinExtern)
+                    .where(LieferscheinExtern.dokument_id == dokument_id)
+                    .order_by(LieferscheinExtern.erstellt_am.desc())
+                    .limit(1)
+                )).scalars().first()
+                
+                if lieferschein:
+                    session.expunge(lieferschein)
+                return lieferschein
+                
+        except Exception as e:
+            logger.error(f"Fehler beim Laden des Lieferscheins für Dokument {dokument_id}: {e}")
+            return None
+    
+    @staticmethod
+    async def get_by_lieferscheinnummer(lieferscheinnummer: str) -> Optional[LieferscheinExtern]:
+        """Ruft einen Lieferschein anhand der Lieferscheinnummer ab."""
+        try:
+            async with get_async_db_session() as session:
+                lieferschein = (await session.execute(
+                    select(LieferscheinExtern)
+                    .where(LieferscheinExtern.lieferscheinnummer == lieferscheinnummer)
+                )).scalars().first()
+                
+                if lieferschein:
+                    session.expunge(lieferschein)
+                return lieferschein
+                
+        except Exception as e:
+            logger.error(f"Fehler beim Laden des Lieferscheins {lieferscheinnummer}: {e}")
+            return None
+    
+    @staticmethod
+    async def mark_csv_imported(lieferschein_id: int) -> bool:
+        """Markiert einen Lieferschein als CSV-importiert."""
+        try:
+            async with get_async_db_session() as session:
+                result = await session.execute(
+                    update(LieferscheinExtern)
+                    .where(LieferscheinExtern.id == lieferschein_id)
+                    .values(csv_importiert=True)
+                )
+                return result.rowcount > 0
+                
+        except Exception as e:
+            logger.error(f"Fehler beim Markieren des Lieferscheins {lieferschein_id}: {e}")
+            return False
+
 class ChargenEinkaufRepository:
     """Repository für Chargen-Einkauf-Datensätze"""
     
@@ -165,35 +274,7 @@ class ChargenEinkaufRepository:
         """Erstellt einen Chargen-Datensatz aus einer CSV-Zeile."""
         try:
             with get_db_session() as session:
-                charge = ChargenEinkauf(
-                    lieferschein_extern_id=lieferschein_id,
-                    linr=csv_row.get('LINR'),
-                    liname=csv_row.get('LINAME'),
-                    name1=csv_row.get('NAME1'),
-                    belfd=csv_row.get('BELFD'),
-                    tlnr=csv_row.get('TLNR'),
-                    auart=csv_row.get('AUART'),
-                    aftnr=csv_row.get('AFTNR'),
-                    aps=csv_row.get('APS'),
-                    absn=csv_row.get('ABSN'),
-                    atnr=csv_row.get('ATNR'),
-                    artikel=csv_row.get('ARTIKEL'),
-                    materialnr=csv_row.get('MATERIALNR'),
-                    urlnd=csv_row.get('URLND'),
-                    wartarnr=csv_row.get('WARTARNR'),
-                    menge=csv_row.get('MENGE'),
-                    erfmenge=csv_row.get('ERFMENGE'),
-                    gebindeme=csv_row.get('GEBINDEME'),
-                    snnr=csv_row.get('SNNR'),
-                    snnralt=csv_row.get('SNNRALT'),
-                    einzelek=csv_row.get('EINZELEK'),
-                    lieferscheinnr=csv_row.get('LIEFERSCHEINNR'),
-                    lieferdatum=csv_row.get('LIEFERDATUM'),
-                    renrex=csv_row.get('RENREX'),
-                    redat=csv_row.get('REDAT'),
-                    bidser=csv_row.get('BIDSER'),
-                    bid=csv_row.get('BID')
-                )
+                charge = ChargenEinkauf(**ChargenEinkaufRepository._values_from_csv_row(lieferschein_id, csv_row))
                 
                 session.add(charge)
                 session.flush()
@@ -206,6 +287,71 @@ class ChargenEinkaufRepository:
             logger.error(f"Fehler beim Erstellen des Chargen-Datensatzes: {e}")
             return None
     
+    @staticmethod
+    def bulk_create_from_csv_rows(lieferschein_id: int, csv_rows: Iterable[Mapping]) -> int:
+        """
+        Erstellt alle Chargen-Datensätze eines Lieferscheins in einer Transaktion.
+        
+        Nutzt ein einziges INSERT mit executemany (psycopg2: gebündelte VALUES-Listen)
+        statt einer Session pro Zeile. Schlägt der Bulk-Insert fehl (z.B. ein Wert zu lang),
+        wird zeilenweise eingefügt, damit gültige Zeilen wie bisher übernommen werden.
+        
+        Returns:
+            Anzahl eingefügter Datensätze
+        """
+        values = [
+            ChargenEinkaufRepository._values_from_csv_row(lieferschein_id, csv_row)
+            for csv_row in csv_rows
+        ]
+        if not values:
+            return 0
+        
+        try:
+            with get_db_session() as session:
+                session.execute(insert(ChargenEinkauf), values)
+            
+            logger.debug(f"{len(values)} Chargen-Datensätze für Lieferschein {lieferschein_id} eingefügt")
+            return len(values)
+            
+        except Exception as e:
+            logger.warning(f"Bulk-Insert für Lieferschein {lieferschein_id} fehlgeschlagen, füge zeilenweise ein: {e}")
+        
+        inserted = 0
+        for row_values in values:
+            try:
+                with get_db_session() as session:
+                    session.execute(insert(ChargenEinkauf), [row_values])
+                inserted += 1
+            except Exception as e:
+                logger.error(f"Fehler beim Erstellen des Chargen-Datensatzes ({row_values.get('artikel')}): {e}")
+        
+        return inserted
+    
+    @staticmethod
+    def delete_by_lieferschein_id(lieferschein_id: int) -> int:
+        """Löscht alle Chargen eines Lieferscheins mit einem DELETE und gibt die Anzahl zurück."""
+        try:
+            with get_db_session() as session:
+                result = session.execute(
+                    delete(ChargenEinkauf).where(ChargenEinkauf.lieferschein_extern_id == lieferschein_id)
+                )
+                return result.rowcount
+                
+        except Exception as e:
+            logger.error(f"Fehler beim Löschen der Chargen für Lieferschein {lieferschein_id}: {e}")
+            raise
+    
+    @staticmethod
+    def _values_from_csv_row(lieferschein_id: int, csv_row: Mapping) -> dict:
+        """Bildet eine CSV-Zeile auf die Spalten von ChargenEinkauf ab."""
+        values = {
+            column: csv_row.get(csv_field)
+            for column, csv_field in CHARGEN_EINKAUF_CSV_FIELDS.items()
+        }
+        values['lieferschein_extern_id'] = lieferschein_id
+        values['erstellt_am'] = datetime.utcnow()
+        return values
+    
     @staticmethod
     def to_dict(charge: ChargenEinkauf) -> dict:
         """Konvertiert einen Chargen-Datensatz in ein Dictionary."""
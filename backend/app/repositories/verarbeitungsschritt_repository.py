@@ -0,0 +1,154 @@
+"""
+Repository für die Zeitleiste der Verarbeitungsschritte (Start/Ende je Stufe und Dokument)
+"""
+
+import logging
+from datetime import datetime
+from typing import List, Optional, Sequence, Tuple
+
+from app.database.postgres_connection import get_db_session
+from app.models.database import Verarbeitungsschritt
+from sqlalchemy import func, update
+
+logger = logging.getLogger(__name__)
+
+
+class VerarbeitungsschrittRepository:
+    """Repository für Verarbeitungsschritte"""
+
+    @staticmethod
+    def create_many(
+        schritte: Sequence[Tuple[str, str, datetime, datetime, bool, Optional[str], Optional[int]]]
+    ) -> int:
+        """
+        Speichert abgeschlossene Schritte in einer Transaktion.
+
+        Args:
+            schritte: Tupel (dateiname, schritt, gestartet_am, beendet_am, erfolgreich, meldung, dokument_id)
+
+        Returns:
+            Anzahl gespeicherter Schritte
+        """
+        if not schritte:
+            return 0
+
+        try:
+            with get_db_session() as session:
+                session.add_all([
+                    Verarbeitungsschritt(
+                        dateiname=dateiname,
+                        dokument_id=dokument_id,
+                        schritt=schritt,
+                        gestartet_am=gestartet_am,
+                        beendet_am=beendet_am,
+                        dauer_ms=int((beendet_am - gestartet_am).total_seconds() * 1000),
+                        erfolgreich=erfolgreich,
+                        meldung=meldung
+                    )
+                    for dateiname, schritt, gestartet_am, beendet_am, erfolgreich, meldung, dokument_id in schritte
+                ])
+            return len(schritte)
+
+        except Exception as e:
+            logger.error(f"Fehler beim Speichern von {len(schritte)} Verarbeitungsschritten: {e}")
+            return 0
+
+    @staticmethod
+    def link_dokument(dateiname: str, dokument_id: int, seit: datetime) -> int:
+        """
+        Ordnet bisher nur über den Dateinamen erfasste Schritte dem Dokument zu.
+
+        Args:
+            dateiname: Dateiname im Input
+            dokument_id: ID des Dokuments
+            seit: Start des aktuellen Durchlaufs; ältere Schritte gehören ggf. zu einer
+                früheren Datei gleichen Namens und bleiben unverändert
+        """
+        try:
+            with get_db_session() as session:
+                result = session.execute(
+                    update(Verarbeitungsschritt)
+                    .where(
+                        Verarbeitungsschritt.dateiname == dateiname,
+                        Verarbeitungsschritt.dokument_id.is_(None),
+                        Verarbeitungsschritt.gestartet_am >= seit
+                    )
+                    .values(dokument_id=dokument_id)
+                )
+                return result.rowcount
+
+        except Exception as e:
+            logger.error(f"Fehler beim Zuordnen der Verarbeitungsschritte von {dateiname}: {e}")
+            return 0
+
+    @staticmethod
+    def get_by_dokument_id(dokument_id: int) -> List[dict]:
+        """Zeitleiste eines Dokuments in zeitlicher Reihenfolge."""
+        try:
+            with get_db_session() as session:
+                schritte = session.query(Verarbeitungsschritt)\
+                    .filter(Verarbeitungsschritt.dokument_id == dokument_id)\
+                    .order_by(Verarbeitungsschritt.gestartet_am, Verarbeitungsschritt.id)\
+                    .all()
+
+                return [
+                    {
+                        "schritt": schritt.schritt,
+                        "dateiname": schritt.dateiname,
+                        "gestartet_am": schritt.gestartet_am.isoformat(),
+                        "beendet_am": schritt.beendet_am.isoformat(),
+                        "dauer_ms": schritt.dauer_ms,
+                        "erfolgreich": schritt.erfolgreich,
+                        "meldung": schritt.meldung
+                    }
+                    for schritt in schritte
+                ]
+
+        except Exception as e:
+            logger.error(f"Fehler beim Laden der Zeitleiste für Dokument {dokument_id}: {e}")
+            return []
+
+    @staticmethod
+    def get_statistik(seit: Optional[datetime] = None) -> List[dict]:
+        """
+        Aggregierte Dauer je Schritt (Anzahl, Mittelwert, p50, p95, Maximum in ms).
+
+        Args:
+            seit: Nur Schritte ab diesem Zeitpunkt (sonst alle)
+        """
+        dauer = Verarbeitungsschritt.dauer_ms
+
+        try:
+            with get_db_session() as session:
+                query = session.query(
+                    Verarbeitungsschritt.schritt,
+                    func.count(Verarbeitungsschritt.id),
+                    func.avg(dauer),
+                    func.percentile_cont(0.5).within_group(dauer),
+                    func.percentile_cont(0.95).within_group(dauer),
+                    func.max(dauer),
+                    func.count(Verarbeitungsschritt.id).filter(Verarbeitungsschritt.erfolgreich.is_(False))
+                )
+                if seit:
+                    query = query.filter(Verarbeitungsschritt.gestartet_am >= seit)
+
+                rows = query.group_by(Verarbeitungsschritt.schritt)\
+                    .order_by(Verarbeitungsschritt.schritt)\
+                    .all()
+
+                return [
+                    {
+                        "schritt": schritt,
+                        "anzahl": anzahl,
+                        "avg_ms": round(float(avg_ms), 1),
+                        "p50_ms": round(float(p50_ms), 1),
+                        "p95_ms": round(float(p95_ms), 1),
+                        "max_ms": max_ms,
+                        "fehlgeschlagen": fehlgeschlagen
+                    }
+                    for schritt, anzahl, avg_ms, p50_ms, p95_ms, max_ms, fehlgeschlagen in rows
+                ]
+
+        except Exception as e:
+            logger.error(f"Fehler beim Laden der Schritt-Statistik: {e}")
+            return []
@@ -0,0 +1,363 @@
+"""
+Repository für den Verarbeitungsstatus der Pipeline-Stufen
+Ersetzt die .ocr_processed/.doc_processed-Markerdateien neben den PDFs
+"""
+
+import logging
+from datetime import datetime
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+
+from app.database.postgres_connection import get_db_session
+from app.models.database import Verarbeitungsstatus
+from sqlalchemy import and_, delete, func, or_, update
+from sqlalchemy.dialects.postgresql import insert
+
+logger = logging.getLogger(__name__)
+
+# Pipeline-Stufen
+STUFE_OCR = 'ocr'
+STUFE_DOCUMENT_PROCESSING = 'document_processing'
+
+# Status-Werte
+STATUS_ERLEDIGT = 'erledigt'
+STATUS_FEHLGESCHLAGEN = 'fehlgeschlagen'   # Wird nach Backoff (naechster_versuch) wiederholt
+STATUS_DEAD_LETTER = 'dead_letter'         # Versuche erschöpft, nur noch manuell per Requeue
+
+
+class VerarbeitungsstatusRepository:
+    """Repository für den Verarbeitungsstatus (eine Zeile pro Datei und Stufe)"""
+
+    @staticmethod
+    def get_status_map(dateinamen: Optional[Iterable[str]] = None) -> Dict[str, Dict[str, str]]:
+        """
+        Lädt den Status aller (oder der angegebenen) Dateien mit einer Abfrage.
+
+        Args:
+            dateinamen: Optional nur diese Dateinamen (sonst alle)
+
+        Returns:
+            Dictionary {dateiname: {stufe: status}}
+        """
+        if dateinamen is not None:
+            dateinamen = list(dateinamen)
+            if not dateinamen:
+                return {}
+
+        try:
+            with get_db_session() as session:
+                query = session.query(
+                    Verarbeitungsstatus.dateiname,
+                    Verarbeitungsstatus.stufe,
+                    Verarbeitungsstatus.status
+                )
+                if dateinamen is not None:
+                    query = query.filter(Verarbeitungsstatus.dateiname.in_(dateinamen))
+
+                status_map: Dict[str, Dict[str, str]] = {}
+                for dateiname, stufe, status in query:
+                    status_map.setdefault(dateiname, {})[stufe] = status
+
+                return status_map
+
+        except Exception as e:
+            logger.error(f"Fehler beim Laden des Verarbeitungsstatus: {e}")
+            return {}
+
+    @staticmethod
+    def get_hash_map(dateinamen: Iterable[str], stufe: str) -> Dict[str, Tuple[str, datetime]]:
+        """
+        Lädt gespeicherten Hash und Zeitpunkt der letzten Statusänderung einer Stufe.
+
+        Returns:
+            Dictionary {dateiname: (dokument_hash, aktualisiert_am)}, nur Einträge mit Hash
+        """
+        dateinamen = list(dateinamen)
+        if not dateinamen:
+            return {}
+
+        try:
+            with get_db_session() as session:
+                rows = session.query(
+                    Verarbeitungsstatus.dateiname,
+                    Verarbeitungsstatus.dokument_hash,
+                    Verarbeitungsstatus.aktualisiert_am
+                )\
+                    .filter(
+                        Verarbeitungsstatus.dateiname.in_(dateinamen),
+                        Verarbeitungsstatus.stufe == stufe,
+                        Verarbeitungsstatus.dokument_hash.isnot(None)
+                    )
+                return {row.dateiname: (row.dokument_hash, row.aktualisiert_am) for row in rows}
+
+        except Exception as e:
+            logger.error(f"Fehler beim Laden der Dokument-Hashes: {e}")
+            return {}
+
+    @staticmethod
+    def get_status(dateiname: str, stufe: str) -> Optional[str]:
+        """Gibt den Status einer Stufe für eine Datei zurück (None = noch nicht gelaufen)."""
+        return VerarbeitungsstatusRepository.get_status_map([dateiname]).get(dateiname, {}).get(stufe)
+
+    @staticmethod
+    def mark(
+        dateiname: str,
+        stufe: str,
+        status: str,
+        dokument_hash: Optional[str] = None,
+        meldung: Optional[str] = None
+    ) -> bool:
+        """
+        Setzt den Status einer Stufe (Upsert).
+
+        Die Versuche bleiben unverändert; hochgezählt werden nur Fehlschläge (record_failure).
+
+        Returns:
+            True bei Erfolg, False bei Fehler
+        """
+        now = datetime.utcnow()
+        statement = insert(Verarbeitungsstatus).values(
+            dateiname=dateiname,
+            stufe=stufe,
+            status=status,
+            dokument_hash=dokument_hash,
+            meldung=meldung,
+            versuche=0,
+            erstellt_am=now,
+            aktualisiert_am=now
+        )
+        statement = statement.on_conflict_do_update(
+            constraint='uq_verarbeitungsstatus_dateiname_stufe',
+            set_={
+                'status': statement.excluded.status,
+                'dokument_hash': statement.excluded.dokument_hash,
+                'meldung': statement.excluded.meldung,
+                'naechster_versuch': None,
+                'aktualisiert_am': now
+            }
+        )
+
+        try:
+            with get_db_session() as session:
+                session.execute(statement)
+            return True
+
+        except Exception as e:
+            logger.error(f"Fehler beim Setzen des Verarbeitungsstatus {dateiname}/{stufe}: {e}")
+            return False
+
+    @staticmethod
+    def record_failure(
+        dateiname: str,
+        stufe: str,
+        meldung: Optional[str],
+        retry_policy,
+        dokument_hash: Optional[str] = None
+    ) -> Optional[str]:
+        """
+        Verbucht einen Fehlschlag: Versuche hochzählen und nächsten Versuch per Backoff planen
+        bzw. nach Erreichen des Limits auf dead_letter setzen.
+
+        Args:
+            retry_policy: RetryPolicy (is_exhausted/next_attempt_at)
+
+        Returns:
+            Neuer Status (fehlgeschlagen oder dead_letter), None bei DB-Fehler
+        """
+        now = datetime.utcnow()
+
+        try:
+            with get_db_session() as session:
+                eintrag = session.query(Verarbeitungsstatus)\
+                    .filter(Verarbeitungsstatus.dateiname == dateiname, Verarbeitungsstatus.stufe == stufe)\
+                    .with_for_update()\
+                    .first()
+
+                if not eintrag:
+                    eintrag = Verarbeitungsstatus(dateiname=dateiname, stufe=stufe, versuche=0, erstellt_am=now)
+                    session.add(eintrag)
+
+                eintrag.versuche = (eintrag.versuche or 0) + 1
+                eintrag.meldung = meldung
+                eintrag.aktualisiert_am = now
+                if dokument_hash:
+                    eintrag.dokument_hash = dokument_hash
+
+                if retry_policy.is_exhausted(eintrag.versuche):
+                    eintrag.status = STATUS_DEAD_LETTER
+                    eintrag.naechster_versuch = None
+                else:
+                    eintrag.status = STATUS_FEHLGESCHLAGEN
+                    eintrag.naechster_versuch = retry_policy.next_attempt_at(eintrag.versuche, now)
+
+                return eintrag.status
+
+        except Exception as e:
+            logger.error(f"Fehler beim Verbuchen des Fehlschlags {dateiname}/{stufe}: {e}")
+            return None
+
+    @staticmethod
+    def get_blocked_filenames(dateinamen: Iterable[str]) -> Set[str]:
+        """
+        Dateien, die aktuell nicht verarbeitet werden dürfen: eine Stufe ist dead_letter
+        oder fehlgeschlagen mit noch nicht erreichtem naechster_versuch.
+        """
+        dateinamen = list(dateinamen)
+        if not dateinamen:
+            return set()
+
+        now = datetime.utcnow()
+        try:
+            with get_db_session() as session:
+                rows = session.query(Verarbeitungsstatus.dateiname)\
+                    .filter(
+                        Verarbeitungsstatus.dateiname.in_(dateinamen),
+                        or_(
+                            Verarbeitungsstatus.status == STATUS_DEAD_LETTER,
+                            and_(
+                                Verarbeitungsstatus.status == STATUS_FEHLGESCHLAGEN,
+                                Verarbeitungsstatus.naechster_versuch > now
+                            )
+                        )
+                    )\
+                    .distinct()
+                return {row.dateiname for row in rows}
+
+        except Exception as e:
+            logger.error(f"Fehler beim Laden der zurückgestellten Dateien: {e}")
+            return set()
+
+    @staticmethod
+    def get_next_retry_at() -> Optional[datetime]:
+        """Nächster in der Zukunft geplanter Wiederholungszeitpunkt (None wenn keiner geplant ist)."""
+        try:
+            with get_db_session() as session:
+                return session.query(func.min(Verarbeitungsstatus.naechster_versuch))\
+                    .filter(
+                        Verarbeitungsstatus.status == STATUS_FEHLGESCHLAGEN,
+                        Verarbeitungsstatus.naechster_versuch > datetime.utcnow()
+                    )\
+                    .scalar()
+
+        except Exception as e:
+            logger.error(f"Fehler beim Laden des nächsten Wiederholungszeitpunkts: {e}")
+            return None
+
+    @staticmethod
+    def get_failed(status: Optional[str] = None, limit: int = 100) -> List[dict]:
+        """
+        Listet fehlgeschlagene bzw. Dead-Letter-Einträge (neueste zuerst).
+
+        Args:
+            status: Nur diesen Status (fehlgeschlagen oder dead_letter), sonst beide
+        """
+        statuses = [status] if status else [STATUS_FEHLGESCHLAGEN, STATUS_DEAD_LETTER]
+
+        try:
+            with get_db_session() as session:
+                eintraege = session.query(Verarbeitungsstatus)\
+                    .filter(Verarbeitungsstatus.status.in_(statuses))\
+                    .order_by(Verarbeitungsstatus.aktualisiert_am.desc())\
+                    .limit(limit)\
+                    .all()
+
+                return [
+                    {
+                        "dateiname": eintrag.dateiname,
+                        "stufe": eintrag.stufe,
+                        "status": eintrag.status,
+                        "versuche": eintrag.versuche,
+                        "naechster_versuch": eintrag.naechster_versuch.isoformat() if eintrag.naechster_versuch else None,
+                        "meldung": eintrag.meldung,
+                        "aktualisiert_am": eintrag.aktualisiert_am.isoformat() if eintrag.aktualisiert_am else None
+                    }
+                    for eintrag in eintraege
+                ]
+
+        except Exception as e:
+            logger.error(f"Fehler beim Laden fehlgeschlagener Verarbeitungen: {e}")
+            return []
+
+    @staticmethod
+    def requeue(dateiname: str) -> int:
+        """
+        Gibt fehlgeschlagene/Dead-Letter-Stufen einer Datei zur sofortigen Wiederholung frei
+        (Versuchszähler zurückgesetzt).
+
+        Returns:
+            Anzahl zurückgesetzter Stufen
+        """
+        try:
+            with get_db_session() as session:
+                result = session.execute(
+                    update(Verarbeitungsstatus)
+                    .where(
+                        Verarbeitungsstatus.dateiname == dateiname,
+                        Verarbeitungsstatus.status.in_([STATUS_FEHLGESCHLAGEN, STATUS_DEAD_LETTER])
+                    )
+                    .values(
+                        status=STATUS_FEHLGESCHLAGEN,
+                        versuche=0,
+                        naechster_versuch=None,
+                        aktualisiert_am=datetime.utcnow()
+                    )
+                )
+                return result.rowcount
+
+        except Exception as e:
+            logger.error(f"Fehler beim Zurücksetzen von {dateiname}: {e}")
+            raise
+
+    @staticmethod
+    def import_entries(entries: List[dict]) -> int:
+        """
+        Übernimmt mehrere Status-Einträge (z.B. aus Markerdateien); vorhandene bleiben unverändert.
+
+        Args:
+            entries: Dictionaries mit dateiname, stufe, status und optional meldung
+
+        Returns:
+            Anzahl neu angelegter Einträge
+        """
+        if not entries:
+            return 0
+
+        now = datetime.utcnow()
+        values = [
+            {
+                'dateiname': entry['dateiname'],
+                'stufe': entry['stufe'],
+                'status': entry['status'],
+                'meldung': entry.get('meldung'),
+                'versuche': 1,
+                'erstellt_am': now,
+                'aktualisiert_am': now
+            }
+            for entry in entries
+        ]
+
+        try:
+            with get_db_session() as session:
+                result = session.execute(
+                    insert(Verarbeitungsstatus)
+                    .values(values)
+                    .on_conflict_do_nothing(constraint='uq_verarbeitungsstatus_dateiname_stufe')
+                )
+                return result.rowcount
+
+        except Exception as e:
+            logger.error(f"Fehler beim Importieren des Verarbeitungsstatus: {e}")
+            raise
+
+    @staticmethod
+    def delete_for_file(dateiname: str) -> int:
+        """Entfernt alle Status-Einträge einer Datei (z.B. nach Verschieben aus dem Input)."""
+        try:
+            with get_db_session() as session:
+                result = session.execute(
+                    delete(Verarbeitungsstatus).where(Verarbeitungsstatus.dateiname == dateiname)
+                )
+                return result.rowcount
+
+        except Exception as e:
+            logger.error(f"Fehler beim Löschen des Verarbeitungsstatus für {dateiname}: {e}")
+            return 0
@@ -4,12 +4,13 @@ API-Routen für die Datenbankansicht im Frontend
 """
 
 import logging
-from typing import Any, Dict, List
+from typing import Any, Dict, List, Literal, Optional
 
-from fastapi import APIRouter, HTTPException
+from fastapi import APIRouter, HTTPException, Query
+from sqlalchemy import func, select
 from sqlalchemy.orm import joinedload
 
-from ..database.postgres_connection import get_db_session
+from ..database.postgres_connection import get_async_db_session
 from ..models.database import (
     ChargenEinkauf,
     ChargenVerkauf,
@@ -20,6 +21,7 @@ from ..models.database import (
     MetadatenFeld,
     Unterkategorie,
 )
+from ..repositories.chargen_repository import MIN_SUCHBEGRIFF_LAENGE, SUCHFELDER, AsyncChargenRepository
 
 logger = logging.getLogger(__name__)
 router = APIRouter(prefix="/database", tags=["Database"])
@@ -41,17 +43,45 @@ async def get_tables():
     return {"tables": tables}
 
 
+@router.get("/chargen/suche")
+async def suche_chargen(
+    q: str = Query(..., min_length=MIN_SUCHBEGRIFF_LAENGE, description="Teil der Seriennummer/Charge, Materialnummer, des Artikels oder der ATNR"),
+    feld: Optional[List[str]] = Query(None, description=f"Nur diese Felder durchsuchen ({', '.join(SUCHFELDER)})"),
+    richtung: Optional[Literal["einkauf", "verkauf"]] = Query(None, description="Nur Einkauf (Wareneingang) oder Verkauf"),
+    limit: int = Query(50, ge=1, le=200, description="Treffer pro Seite"),
+    cursor: Optional[str] = Query(None, description="next_cursor der vorherigen Seite")
+):
+    """
+    Rückverfolgung von Chargen: In welchem Wareneingang/Lieferschein steckte Seriennummer X?
+    
+    Durchsucht chargen_einkauf und chargen_verkauf (Trigramm-Indizes) und liefert je Charge
+    den Lieferschein (extern/intern) und das Dokument. Weitere Treffer über next_cursor.
+    """
+    try:
+        ergebnis = await AsyncChargenRepository.search(q, felder=feld, richtung=richtung, limit=limit, cursor=cursor)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except Exception as e:
+        logger.error(f"Fehler bei der Chargen-Suche nach '{q}': {e}")
+        raise HTTPException(status_code=500, detail="Fehler bei der Chargen-Suche")
+    
+    return {
+        "suchbegriff": q,
+        **ergebnis
+    }
+
+
 @router.get("/tables/{table_name}")
 async def get_table_data(table_name: str, limit: int = 100):
     """Daten einer bestimmten Tabelle abrufen."""
     
     try:
-        with get_db_session() as session:
+        async with get_async_db_session() as session:
             if table_name == "dokumente":
-                query = session.query(Dokument)\
+                query = select(Dokument)\
                     .options(joinedload(Dokument.unterkategorie))\
                     .limit(limit)
-                items = query.all()
+                items = (await session.execute(query)).scalars().all()
                 data = []
                 for item in items:
                     data.append({
@@ -67,15 +97,15 @@ async def get_table_data(table_name: str, limit: int = 100):
                     })
                     
             elif table_name == "kategorien":
-                items = session.query(Kategorie).limit(limit).all()
+                items = (await session.execute(select(Kategorie).limit(limit))).scalars().all()
                 data = [{"id": item.id, "name": item.name, "beschreibung": item.beschreibung, 
                         "erstellt_am": item.erstellt_am.isoformat() if item.erstellt_am else None} for item in items]
                         
             elif table_name == "unterkategorien":
-                query = session.query(Unterkategorie)\
+                query = select(Unterkategorie)\
                     .options(joinedload(Unterkategorie.kategorie))\
                     .limit(limit)
-                items = query.all()
+                items = (await session.execute(query)).scalars().all()
                 data = []
                 for item in items:
                     data.append({
@@ -88,15 +118,15 @@ async def get_table_data(table_name: str, limit: int = 100):
                     })
                     
             elif table_name == "metadaten_felder":
-                items = session.query(MetadatenFeld).limit(limit).all()
+                items = (await session.execute(select(MetadatenFeld).limit(limit))).scalars().all()
                 data = [{"id": item.id, "feldname": item.feldname, "beschreibung": item.beschreibung,
                         "erstellt_am": item.erstellt_am.isoformat() if item.erstellt_am else None} for item in items]
                         
             elif table_name == "lieferscheine_extern":
-                query = session.query(LieferscheinExtern)\
+                query = select(LieferscheinExtern)\
                     .options(joinedload(LieferscheinExtern.dokument))\
                     .limit(limit)
-                items = query.all()
+                items = (await session.execute(query)).scalars().all()
                 data = []
                 for item in items:
                     data.append({
@@ -109,10 +139,10 @@ async def get_table_data(table_name: str, limit: int = 100):
                     })
                     
             elif table_name == "lieferscheine_intern":
-                query = session.query(LieferscheinIntern)\
+                query = select(LieferscheinIntern)\
                     .options(joinedload(LieferscheinIntern.dokument))\
                     .limit(limit)
-                items = query.all()
+                items = (await session.execute(query)).scalars().all()
                 data = []
                 for item in items:
                     data.append({
@@ -125,10 +155,10 @@ async def get_table_data(table_name: str, limit: int = 100):
                     })
                     
             elif table_name == "chargen_einkauf":
-                query = session.query(ChargenEinkauf)\
+                query = select(ChargenEinkauf)\
                     .options(joinedload(ChargenEinkauf.lieferschein_extern))\
                     .limit(limit)
-                items = query.all()
+                items = (await session.execute(query)).scalars().all()
                 data = []
                 for item in items:
                     data.append({
@@ -143,10 +173,10 @@ async def get_table_data(table_name: str, limit: int = 100):
                     })
                     
             elif table_name == "chargen_verkauf":
-                query = session.query(ChargenVerkauf)\
+                query = select(ChargenVerkauf)\
                     .options(joinedload(ChargenVerkauf.lieferschein_intern))\
                     .limit(limit)
-                items = query.all()
+                items = (await session.execute(query)).scalars().all()
                 data = []
                 for item in items:
                     data.append({
@@ -179,17 +209,24 @@ async def get_table_data(table_name: str, limit: int = 100):
 async def get_database_stats():
     """Allgemeine Datenbankstatistiken."""
     try:
-        with get_db_session() as session:
-            stats = {
-                "dokumente_count": session.query(Dokument).count(),
-                "kategorien_count": session.query(Kategorie).count(),
-                "unterkategorien_count": session.query(Unterkategorie).count(),
-                "metadaten_felder_count": session.query(MetadatenFeld).count(),
-                "lieferscheine_extern_count": session.query(LieferscheinExtern).count(),
-                "lieferscheine_intern_count": session.query(LieferscheinIntern).count(),
-                "chargen_einkauf_count": session.query(ChargenEinkauf).count(),
-                "chargen_verkauf_count": session.query(ChargenVerkauf).count()
-            }
+        models = {
+            "dokumente_count": Dokument,
+            "kategorien_count": Kategorie,
+            "unterkategorien_count": Unterkategorie,
+            "metadaten_felder_count": MetadatenFeld,
+            "lieferscheine_extern_count": LieferscheinExtern,
+            "lieferscheine_intern_count": LieferscheinIntern,
+            "chargen_einkauf_count": ChargenEinkauf,
+            "chargen_verkauf_count": ChargenVerkauf
+        }
+        
+        async with get_async_db_session() as session:
+            # Alle Zählungen in einer Abfrage (ein Roundtrip statt acht)
+            counts = select(*(
+                select(func.count()).select_from(model).scalar_subquery().label(key)
+                for key, model in models.items()
+            ))
+            stats = dict((await session.execute(counts)).mappings().one())
             
             return {"stats": stats}
             
@@ -8,9 +8,11 @@ import logging
 logger = logging.getLogger(__name__)
 logger.info("🔍 dokumente.py wurde neu geladen!")
 
+import asyncio
 import logging
 import os
 import shutil
+from datetime import datetime
 from pathlib import Path as PathLib
 from typing import Any, Dict, List, Optional
 
@@ -19,7 +21,14 @@ from fastapi.responses import FileResponse, JSONResponse
 
 from ..config.settings import PDF_INPUT_DIR
 from ..database.seed_data import get_unterkategorie_by_name
-from ..repositories.dokument_repository import DokumentRepository
+from ..database.postgres_connection import get_async_db_session
+from ..repositories.dokument_repository import AsyncDokumentRepository, DokumentRepository
+from ..repositories.dokument_seite_repository import AsyncDokumentSeiteRepository
+from ..repositories.verarbeitungsstatus_repository import (
+    STATUS_ERLEDIGT,
+    STUFE_OCR,
+    VerarbeitungsstatusRepository,
+)
 from ..schemas.dokument import (
     DokumentList,
     DokumentResponse,
@@ -30,6 +39,7 @@ from ..schemas.dokument import (
     MetadatenFeldResponse,
     SuccessResponse,
 )
+from ..services.ocr_scheduler import ocr_scheduler
 from ..services.ocr_service import OCRService
 from ..services.storage_service import StorageService
 
@@ -38,48 +48,82 @@ router = APIRouter(prefix="/dokumente", tags=["Dokumente"])
 
 
 @router.get("/", response_model=DokumentList)
-async def get_dokumente():
+async def get_dokumente(
+    limit: int = Query(50, ge=1, le=500, description="Dokumente pro Seite"),
+    cursor: Optional[str] = Query(None, description="next_cursor der vorherigen Seite"),
+    kategorie: Optional[str] = Query(None, description="Filter auf Kategorie-Namen"),
+    unterkategorie: Optional[str] = Query(None, description="Filter auf Unterkategorie-Namen"),
+    von: Optional[datetime] = Query(None, description="Erstellt ab (inklusive)"),
+    bis: Optional[datetime] = Query(None, description="Erstellt vor (exklusive)"),
+    fields: Optional[str] = Query(None, description="Kommagetrennte Felder, z.B. id,dateiname,kategorie")
+):
     """
-    Ruft alle Dokumente ab und scannt nach neuen Dateien im Eingangsverzeichnis.
-    OCR wird automatisch beim Scannen neuer Dateien durchgeführt.
+    Ruft eine Seite der Dokumente ab (neueste zuerst, reiner Lesezugriff).
+    
+    Keyset-Pagination über next_cursor; total ist bei großen Ergebnissen eine Schätzung
+    (total_geschaetzt). Neue Dateien im Eingangsverzeichnis werden an den OCR-Scheduler
+    übergeben, der OCR und DB-Eintrag im Hintergrund erledigt; pending_processing zählt diese Dateien,
+    blocked_processing die Dateien im Backoff bzw. Dead-Letter-Status.
     """
     
-    # Neue PDF-Dateien prüfen und mit OCR verarbeiten
-    neue_dateien = StorageService.get_input_files()  # OCR wird hier automatisch durchgeführt
+    # Neue PDF-Dateien nur auflisten und dem Scheduler melden (keine OCR im Request)
+    neue_dateien = await asyncio.to_thread(StorageService.get_input_files)
+    pending_processing, blocked_processing = await ocr_scheduler.enqueue_files(
+        [datei["dateiname"] for datei in neue_dateien]
+    )
     
-    for datei in neue_dateien:
-        # Prüfen, ob Datei bereits in DB (mit neuem Repository)
-        vorhandenes_dokument = DokumentRepository.get_by_filename(datei["dateiname"])
-        
-        if not vorhandenes_dokument:
-            # Bessere Vorschau aus OCR-verarbeiteter PDF erstellen
-            vorschau = OCRService.extract_preview_text(datei["pfad"], max_chars=300)
-            
-            # In DB speichern (mit neuem Repository)
-            DokumentRepository.create(
-                dateiname=datei["dateiname"],
-                pfad=datei["pfad"],
-                inhalt_vorschau=vorschau
-            )
+    field_list = [field.strip() for field in fields.split(",") if field.strip()] if fields else None
     
-    # Alle Dokumente abrufen (Repository gibt schon Dictionaries zurück)
-    dokumente = DokumentRepository.get_all()
+    try:
+        page = await AsyncDokumentRepository.get_page(
+            limit=limit,
+            cursor=cursor,
+            kategorie=kategorie,
+            unterkategorie=unterkategorie,
+            von=von,
+            bis=bis,
+            fields=field_list
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
     
-    # TEMPORÄRES DEBUG
-    logger.info(f"🔍 DEBUG: Gefunden {len(dokumente)} Dokumente")
-    for doc in dokumente[-2:]:  # Letzte 2 anzeigen
-        logger.info(f"🔍 DEBUG: {doc['dateiname']} -> kategorie={doc.get('kategorie')}, unterkategorie={doc.get('unterkategorie')}")
+    return {
+        **page,
+        "pending_processing": pending_processing,
+        "blocked_processing": blocked_processing
+    }
+
+
+@router.get("/suche")
+async def suche_dokumente(
+    q: str = Query(..., min_length=2, description='Suchbegriffe (websearch-Syntax: "Phrase", -ausschließen, or)'),
+    limit: int = Query(20, ge=1, le=100, description="Treffer pro Seite"),
+    cursor: Optional[str] = Query(None, description="next_cursor der vorherigen Seite")
+):
+    """
+    Volltextsuche über den OCR-Text aller Seiten (deutscher tsvector, GIN-Index).
+    
+    Sortiert nach Relevanz; pro Dokument die bestbewertete Seite mit hervorgehobenem
+    Ausschnitt (<mark>…</mark>). Weitere Treffer über next_cursor.
+    """
+    try:
+        ergebnis = await AsyncDokumentSeiteRepository.search(q, limit=limit, cursor=cursor)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except Exception as e:
+        logger.error(f"Fehler bei der Volltextsuche nach '{q}': {e}")
+        raise HTTPException(status_code=500, detail="Fehler bei der Volltextsuche")
     
     return {
-        "dokumente": dokumente,
-        "total": len(dokumente)
+        "suchbegriff": q,
+        **ergebnis
     }
 
 
 @router.get("/{dokument_id}", response_model=DokumentResponse)
 async def get_dokument(dokument_id: int = Path(..., description="Die ID des Dokuments")):
     """Ruft ein einzelnes Dokument anhand seiner ID ab."""
-    dokument = DokumentRepository.get_by_id(dokument_id)
+    dokument = await AsyncDokumentRepository.get_by_id(dokument_id)
     
     if not dokument:
         raise HTTPException(status_code=404, detail="Dokument nicht gefunden")
@@ -91,7 +135,7 @@ async def get_dokument(dokument_id: int = Path(..., description="Die ID des Doku
 @router.get("/file/{dokument_id}")
 async def get_dokument_file(dokument_id: int):
     """Liefert die PDF-Datei eines Dokuments (bereits OCR-verarbeitet)."""
-    dokument = DokumentRepository.get_by_id(dokument_id)
+    dokument = await AsyncDokumentRepository.get_by_id(dokument_id)
     
     if not dokument:
         raise HTTPException(status_code=404, detail="Dokument nicht gefunden")
@@ -116,50 +160,79 @@ async def get_dokument_file(dokument_id: int):
     )
 
 
+# Endung für Uploads während der OCR; Watcher und Scans beachten nur *.pdf
+UPLOAD_TEMP_SUFFIX = ".part"
+
+
+def _save_upload_with_ocr(source, file_path: str) -> bool:
+    """Speichert den Upload und führt OCR in-place durch (blockierend)."""
+    with open(file_path, "wb") as f:
+        shutil.copyfileobj(source, f)
+    return StorageService._process_pdf_with_ocr_inplace(file_path)
+
+
+def _discard_upload(temp_path: str):
+    """Entfernt eine unvollständige Upload-Datei (blockierend)."""
+    try:
+        os.remove(temp_path)
+    except FileNotFoundError:
+        pass
+
+
 @router.post("/upload", response_model=DokumentResponse)
 async def upload_dokument(file: UploadFile = File(...)):
     """
     Lädt ein neues PDF-Dokument hoch und führt sofort OCR durch.
+
+    Die Datei wird zunächst als <name>.pdf.part gespeichert, die der Input-Watcher ignoriert.
+    Erst nach OCR, Statuseintrag und DB-Eintrag wird sie atomar in <name>.pdf umbenannt,
+    damit der Scheduler sie nicht parallel zur Upload-OCR einreiht.
     """
     if not file.filename.lower().endswith('.pdf'):
         raise HTTPException(status_code=400, detail="Nur PDF-Dateien werden unterstützt")
     
     # Datei speichern
     file_path = os.path.join(PDF_INPUT_DIR, file.filename)
+    temp_path = file_path + UPLOAD_TEMP_SUFFIX
     
     try:
-        # Datei ins Input-Verzeichnis speichern
-        with open(file_path, "wb") as f:
-            shutil.copyfileobj(file.file, f)
-        
-        # Sofort OCR durchführen
-        success = StorageService._process_pdf_with_ocr_inplace(file_path)
+        # Datei unter temporärem Namen speichern und sofort OCR durchführen (im Worker-Thread)
+        success = await asyncio.to_thread(_save_upload_with_ocr, file.file, temp_path)
         
         if not success:
             # Fallback: Datei bleibt, aber ohne OCR
             logger.warning(f"OCR fehlgeschlagen für hochgeladene Datei: {file.filename}")
         
-        # OCR-Marker erstellen
-        ocr_marker_path = file_path + '.ocr_processed'
-        with open(ocr_marker_path, 'w') as marker:
-            marker.write(f"OCR processed at upload: {os.path.getmtime(file_path)}")
+        # OCR-Status setzen (auch ohne OCR, damit der Scheduler nicht erneut verarbeitet)
+        await asyncio.to_thread(
+            VerarbeitungsstatusRepository.mark,
+            file.filename,
+            STUFE_OCR,
+            STATUS_ERLEDIGT,
+            meldung=None if success else "OCR beim Upload fehlgeschlagen"
+        )
         
     except Exception as e:
+        await asyncio.to_thread(_discard_upload, temp_path)
         raise HTTPException(status_code=500, detail=f"Fehler beim Speichern der Datei: {str(e)}")
     
     # Vorschau-Text aus OCR-verarbeiteter PDF erstellen
-    vorschau = OCRService.extract_preview_text(file_path, max_chars=300)
+    vorschau = await asyncio.to_thread(OCRService.extract_preview_text, temp_path, max_chars=300)
     
-    # In DB speichern (mit neuem Repository)
-    dokument_dict = DokumentRepository.create(
+    # In DB speichern (mit neuem Repository, bereits mit endgültigem Pfad)
+    dokument_dict = await AsyncDokumentRepository.create(
         dateiname=file.filename,
         pfad=file_path,
         inhalt_vorschau=vorschau
     )
     
     if not dokument_dict:
+        await asyncio.to_thread(_discard_upload, temp_path)
         raise HTTPException(status_code=500, detail="Fehler beim Speichern in der Datenbank")
     
+    # Erst jetzt sichtbar für Watcher und Scheduler (atomar im selben Verzeichnis)
+    await asyncio.to_thread(os.replace, temp_path, file_path)
+    
     return dokument_dict
 
 
@@ -172,7 +245,7 @@ async def kategorisiere_dokument(
     Kategorisiert ein Dokument und verschiebt es (ohne weitere OCR-Verarbeitung).
     Verwendet jetzt die neue Kategorien-Struktur mit Haupt- und Unterkategorien.
     """
-    dokument = DokumentRepository.get_by_id(dokument_id)
+    dokument = await AsyncDokumentRepository.get_by_id(dokument_id)
     
     if not dokument:
         raise HTTPException(status_code=404, detail="Dokument nicht gefunden")
@@ -199,7 +272,7 @@ async def kategorisiere_dokument(
             )
         
         # Unterkategorie-ID ermitteln
-        unterkategorie_id = get_unterkategorie_by_name(kategorie_name, unterkategorie_name)
+        unterkategorie_id = await asyncio.to_thread(get_unterkategorie_by_name, kategorie_name, unterkategorie_name)
         if not unterkategorie_id:
             raise HTTPException(
                 status_code=500, 
@@ -207,7 +280,7 @@ async def kategorisiere_dokument(
             )
         
         # Kategorie in Repository aktualisieren
-        updated_dokument = DokumentRepository.update_kategorie(
+        updated_dokument = await AsyncDokumentRepository.update_kategorie(
             dokument_id, 
             kategorie_name, 
             unterkategorie_name
@@ -225,7 +298,7 @@ async def kategorisiere_dokument(
     
     # Metadaten aktualisieren, falls vorhanden
     if update_data.metadaten:
-        updated_dokument = DokumentRepository.update_metadaten(dokument_id, update_data.metadaten)
+        updated_dokument = await AsyncDokumentRepository.update_metadaten(dokument_id, update_data.metadaten)
         if updated_dokument:
             dokument = updated_dokument
     
@@ -235,16 +308,16 @@ async def kategorisiere_dokument(
 @router.delete("/{dokument_id}", response_model=SuccessResponse)
 async def delete_dokument(dokument_id: int = Path(..., description="Die ID des Dokuments")):
     """Löscht ein Dokument aus der Datenbank und die Datei."""
-    dokument = DokumentRepository.get_by_id(dokument_id)
+    dokument = await AsyncDokumentRepository.get_by_id(dokument_id)
     
     if not dokument:
         raise HTTPException(status_code=404, detail="Dokument nicht gefunden")
     
     # Datei und OCR-Marker löschen
-    StorageService.delete_file(dokument.pfad)
+    await asyncio.to_thread(StorageService.delete_file, dokument.pfad)
     
     # Aus DB löschen (mit neuem Repository)
-    success = DokumentRepository.delete(dokument_id)
+    success = await AsyncDokumentRepository.delete(dokument_id)
     
     if not success:
         raise HTTPException(status_code=500, detail="Fehler beim Löschen des Dokuments")
@@ -261,12 +334,13 @@ async def delete_dokument(dokument_id: int = Path(..., description="Die ID des D
 async def get_metadatenfelder():
     """Ruft alle verfügbaren Metadatenfelder ab."""
     # TODO: Auch auf Repository-Pattern umstellen
-    from ..database.postgres_connection import get_db_session
+    from sqlalchemy import select
+
     from ..models.database import MetadatenFeld
     
     try:
-        with get_db_session() as session:
-            felder = session.query(MetadatenFeld).order_by(MetadatenFeld.feldname).all()
+        async with get_async_db_session() as session:
+            felder = (await session.execute(select(MetadatenFeld).order_by(MetadatenFeld.feldname))).scalars().all()
             
             felder_dict = []
             for feld in felder:
@@ -289,17 +363,16 @@ async def create_metadatenfeld(feld: MetadatenFeldCreate):
     # TODO: Auch auf Repository-Pattern umstellen
     from sqlalchemy.exc import IntegrityError
 
-    from ..database.postgres_connection import get_db_session
     from ..models.database import MetadatenFeld
     
     try:
-        with get_db_session() as session:
+        async with get_async_db_session() as session:
             neues_feld = MetadatenFeld(
                 feldname=feld.feldname,
                 beschreibung=feld.beschreibung
             )
             session.add(neues_feld)
-            # Commit erfolgt automatisch durch get_db_session()
+            # Commit erfolgt automatisch durch get_async_db_session()
             
             return {
                 "success": True,
@@ -317,18 +390,17 @@ async def create_metadatenfeld(feld: MetadatenFeldCreate):
 async def delete_metadatenfeld(feld_id: int = Path(..., description="Die ID des Metadatenfelds")):
     """Löscht ein Metadatenfeld."""
     # TODO: Auch auf Repository-Pattern umstellen
-    from ..database.postgres_connection import get_db_session
     from ..models.database import MetadatenFeld
     
     try:
-        with get_db_session() as session:
-            feld = session.query(MetadatenFeld).filter(MetadatenFeld.id == feld_id).first()
+        async with get_async_db_session() as session:
+            feld = await session.get(MetadatenFeld, feld_id)
             
             if not feld:
                 raise HTTPException(status_code=404, detail="Metadatenfeld nicht gefunden")
             
-            session.delete(feld)
-            # Commit erfolgt automatisch durch get_db_session()
+            await session.delete(feld)
+            # Commit erfolgt automatisch durch get_async_db_session()
             
             return {
                 "success": True,
@@ -354,13 +426,7 @@ async def csv_reimport_wareneingang(dokument_id: int = Path(..., description="Di
     """
     try:
         # 1. Dokument-Dictionary statt ORM-Objekt verwenden (vermeidet Session-Probleme)
-        dokument_dict = None
-        all_dokumente = DokumentRepository.get_all()
-        
-        for dok in all_dokumente:
-            if dok["id"] == dokument_id:
-                dokument_dict = dok
-                break
+        dokument_dict = await AsyncDokumentRepository.get_list_dict_by_id(dokument_id)
         
         if not dokument_dict:
             raise HTTPException(status_code=404, detail="Dokument nicht gefunden")
@@ -381,16 +447,11 @@ async def csv_reimport_wareneingang(dokument_id: int = Path(..., description="Di
         
         # 3. Zugehörigen externen Lieferschein finden
         from ..repositories.lieferschein_repository import (
+            AsyncLieferscheinExternRepository,
             ChargenEinkaufRepository,
-            LieferscheinExternRepository,
         )
         
-        lieferscheine = LieferscheinExternRepository.get_all()
-        lieferschein = None
-        for ls in lieferscheine:
-            if ls.dokument_id == dokument_id:
-                lieferschein = ls
-                break
+        lieferschein = await AsyncLieferscheinExternRepository.get_by_dokument_id(dokument_id)
         
         if not lieferschein:
             raise HTTPException(
@@ -406,38 +467,21 @@ async def csv_reimport_wareneingang(dokument_id: int = Path(..., description="Di
                 detail="Lieferscheinnummer nicht verfügbar"
             )
         
-        # 5. Vorhandene Chargen-Datensätze löschen (in neuer Session)
-        from ..database.postgres_connection import get_db_session
-        from ..models.database import ChargenEinkauf
-        
-        deleted_count = 0
-        with get_db_session() as session:
-            existing_chargen = session.query(ChargenEinkauf)\
-                .filter(ChargenEinkauf.lieferschein_extern_id == lieferschein.id)\
-                .all()
-            
-            for charge in existing_chargen:
-                session.delete(charge)
-                deleted_count += 1
+        # 5. Vorhandene Chargen-Datensätze löschen (ein DELETE-Statement)
+        deleted_count = await asyncio.to_thread(ChargenEinkaufRepository.delete_by_lieferschein_id, lieferschein.id)
         
         logger.info(f"🗑️  {deleted_count} vorhandene Chargen-Datensätze für Lieferschein {lieferschein.lieferscheinnummer} gelöscht")
         
         # 6. CSV-Reimport durchführen
-        from ..services.document_processing.wareneingang_processor import (
-            WareneingangProcessor,
-        )
-        
-        processor = WareneingangProcessor()
-        
-        # CSV-Cache leeren für frische Daten
-        processor.clear_cache()
+        # Gemeinsamer Processor: der CSV-Index lädt geänderte/neue Dateien selbstständig nach
+        from ..services.document_processing import wareneingang_processor
         
         # CSV-Import durchführen
-        import_count = await processor._import_csv_data(lieferschein, lieferschein.lieferscheinnummer)
+        import_count = await wareneingang_processor._import_csv_data(lieferschein, lieferschein.lieferscheinnummer)
         
         # 7. Lieferschein als importiert markieren
         if import_count > 0:
-            LieferscheinExternRepository.mark_csv_imported(lieferschein.id)
+            await AsyncLieferscheinExternRepository.mark_csv_imported(lieferschein.id)
         
         # 8. Erfolgsantwort
         success_message = (
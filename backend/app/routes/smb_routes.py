@@ -3,6 +3,7 @@ SMB-Routes für Windows Server Integration
 Datei: backend/app/routes/smb_routes.py
 """
 
+import asyncio
 import logging
 from typing import Optional
 
@@ -58,7 +59,8 @@ async def configure_smb_connection(config: SMBConnectionConfig):
             from ..services.windows_smb_service import windows_smb_service
             logger.info("✅ windows_smb_service erfolgreich importiert")
             
-            result = windows_smb_service.configure_connection(
+            result = await asyncio.to_thread(
+                windows_smb_service.configure_connection,
                 server=config.server,
                 share=config.share,
                 username=config.username,
@@ -122,7 +124,7 @@ async def get_smb_status():
                 config = windows_smb_service.connection_config
                 
                 # Verbindungstest
-                test_result = windows_smb_service._test_connection()
+                test_result = await asyncio.to_thread(windows_smb_service._test_connection)
                 
                 return {
                     "configured": True,
@@ -167,7 +169,7 @@ async def scan_smb_files():
         if not windows_smb_service.connection_config:
             raise HTTPException(status_code=400, detail="Keine SMB-Verbindung konfiguriert")
         
-        scan_result = windows_smb_service.scan_for_new_files()
+        scan_result = await asyncio.to_thread(windows_smb_service.scan_for_new_files)
         
         if scan_result["success"]:
             results = scan_result["results"]
@@ -213,7 +215,7 @@ async def download_smb_files():
     logger.info("📥 SMB Download aufgerufen")
     
     try:
-        from ..repositories.dokument_repository import DokumentRepository
+        from ..repositories.dokument_repository import AsyncDokumentRepository
         from ..services.ocr_service import OCRService
         from ..services.windows_smb_service import windows_smb_service
         
@@ -221,7 +223,7 @@ async def download_smb_files():
             raise HTTPException(status_code=400, detail="Keine SMB-Verbindung konfiguriert")
         
         # Download durchführen
-        download_result = windows_smb_service.download_new_files()
+        download_result = await asyncio.to_thread(windows_smb_service.download_new_files)
         
         if not download_result["success"]:
             raise HTTPException(status_code=500, detail=download_result["message"])
@@ -233,10 +235,12 @@ async def download_smb_files():
         for file_info in results["downloaded_files"]:
             try:
                 # Vorschau-Text extrahieren
-                preview_text = OCRService.extract_preview_text(file_info["local_path"], max_chars=300)
+                preview_text = await asyncio.to_thread(
+                    OCRService.extract_preview_text, file_info["local_path"], max_chars=300
+                )
                 
                 # In Datenbank speichern
-                doc_dict = DokumentRepository.create(
+                doc_dict = await AsyncDokumentRepository.create(
                     dateiname=file_info["local_filename"],
                     pfad=file_info["local_path"],
                     inhalt_vorschau=preview_text
@@ -296,7 +300,7 @@ async def sync_smb_files():
     logger.info("🔄 SMB Sync aufgerufen")
     
     try:
-        from ..repositories.dokument_repository import DokumentRepository
+        from ..repositories.dokument_repository import AsyncDokumentRepository
         from ..services.ocr_service import OCRService
         from ..services.windows_smb_service import windows_smb_service
         
@@ -305,7 +309,7 @@ async def sync_smb_files():
         
         # 1. Scan durchführen
         logger.info("🔍 Starte SMB-Sync: Scanning...")
-        scan_result = windows_smb_service.scan_for_new_files()
+        scan_result = await asyncio.to_thread(windows_smb_service.scan_for_new_files)
         
         if not scan_result["success"]:
             raise HTTPException(status_code=500, detail=f"Scan fehlgeschlagen: {scan_result['error']}")
@@ -328,7 +332,7 @@ async def sync_smb_files():
         
         # 2. Download durchführen
         logger.info(f"📥 Starte SMB-Sync: Download von {scan_data['new_files_count']} Dateien...")
-        download_result = windows_smb_service.download_new_files()
+        download_result = await asyncio.to_thread(windows_smb_service.download_new_files)
         
         if not download_result["success"]:
             raise HTTPException(status_code=500, detail=f"Download fehlgeschlagen: {download_result['message']}")
@@ -341,9 +345,11 @@ async def sync_smb_files():
         
         for file_info in download_data["downloaded_files"]:
             try:
-                preview_text = OCRService.extract_preview_text(file_info["local_path"], max_chars=300)
+                preview_text = await asyncio.to_thread(
+                    OCRService.extract_preview_text, file_info["local_path"], max_chars=300
+                )
                 
-                doc_dict = DokumentRepository.create(
+                doc_dict = await AsyncDokumentRepository.create(
                     dateiname=file_info["local_filename"],
                     pfad=file_info["local_path"],
                     inhalt_vorschau=preview_text
@@ -455,7 +461,7 @@ async def test_smb_write_permissions():
         if not windows_smb_service.connection_config:
             raise HTTPException(status_code=400, detail="Keine SMB-Verbindung konfiguriert")
         
-        test_result = windows_smb_service.test_smb_write_permissions()
+        test_result = await asyncio.to_thread(windows_smb_service.test_smb_write_permissions)
         
         if test_result["success"]:
             # Empfehlung basierend auf Schreibrechten
@@ -0,0 +1,89 @@
+"""
+API-Routen für den Verarbeitungsstatus der Pipeline:
+Fehlgeschlagene und Dead-Letter-Dateien anzeigen und erneut einplanen,
+Zeitleisten der Verarbeitungsschritte und Latenz-Statistik je Schritt.
+"""
+
+import asyncio
+import logging
+from datetime import datetime, timedelta
+from typing import Optional
+
+from fastapi import APIRouter, HTTPException, Path, Query
+
+from ..repositories.verarbeitungsschritt_repository import VerarbeitungsschrittRepository
+from ..repositories.verarbeitungsstatus_repository import (
+    STATUS_DEAD_LETTER,
+    STATUS_FEHLGESCHLAGEN,
+    VerarbeitungsstatusRepository,
+)
+from ..services.ocr_scheduler import ocr_scheduler
+from ..services.retry_policy import retry_policy
+
+logger = logging.getLogger(__name__)
+router = APIRouter(prefix="/verarbeitung", tags=["Verarbeitung"])
+
+
+@router.get("/fehler")
+async def get_failed_processing(
+    status: Optional[str] = Query(None, description="fehlgeschlagen oder dead_letter (Standard: beide)"),
+    limit: int = Query(100, ge=1, le=1000)
+):
+    """Listet Dateien mit fehlgeschlagenen Verarbeitungsstufen inkl. Versuchen und nächstem Versuch."""
+    if status and status not in (STATUS_FEHLGESCHLAGEN, STATUS_DEAD_LETTER):
+        raise HTTPException(status_code=400, detail=f"Ungültiger Status: {status}")
+
+    eintraege = await asyncio.to_thread(VerarbeitungsstatusRepository.get_failed, status, limit)
+    return {
+        "eintraege": eintraege,
+        "total": len(eintraege),
+        "max_versuche": retry_policy.max_attempts
+    }
+
+
+@router.post("/{dateiname}/requeue")
+async def requeue_processing(dateiname: str = Path(..., description="Dateiname im Input-Verzeichnis")):
+    """Setzt fehlgeschlagene/Dead-Letter-Stufen einer Datei zurück und plant sie sofort neu ein."""
+    try:
+        reset = await asyncio.to_thread(VerarbeitungsstatusRepository.requeue, dateiname)
+    except Exception as e:
+        logger.error(f"Fehler beim Requeue von {dateiname}: {e}")
+        raise HTTPException(status_code=500, detail=f"Fehler beim Requeue: {str(e)}")
+
+    if reset == 0:
+        raise HTTPException(status_code=404, detail="Keine fehlgeschlagene Verarbeitung für diese Datei")
+
+    ocr_scheduler.requeue(dateiname)
+    logger.info(f"🔁 {dateiname} erneut eingeplant ({reset} Stufen zurückgesetzt)")
+
+    return {
+        "success": True,
+        "message": f"{dateiname} wurde erneut eingeplant",
+        "stufen_zurueckgesetzt": reset
+    }
+
+
+@router.get("/zeitleiste/statistik")
+async def get_timeline_statistics(
+    tage: int = Query(7, ge=0, description="Nur Schritte der letzten N Tage (0 = alle)")
+):
+    """Dauer je Verarbeitungsschritt über alle Dokumente: Anzahl, Mittelwert, p50, p95, Maximum (ms)."""
+    seit = datetime.utcnow() - timedelta(days=tage) if tage else None
+    return {
+        "seit": seit.isoformat() if seit else None,
+        "schritte": await asyncio.to_thread(VerarbeitungsschrittRepository.get_statistik, seit)
+    }
+
+
+@router.get("/zeitleiste/{dokument_id}")
+async def get_document_timeline(dokument_id: int = Path(..., description="Die ID des Dokuments")):
+    """Zeitleiste eines Dokuments: alle Schritte mit Start, Ende und Dauer."""
+    schritte = await asyncio.to_thread(VerarbeitungsschrittRepository.get_by_dokument_id, dokument_id)
+    if not schritte:
+        raise HTTPException(status_code=404, detail="Keine Verarbeitungsschritte für dieses Dokument")
+
+    return {
+        "dokument_id": dokument_id,
+        "schritte": schritte,
+        "gesamt_ms": sum(schritt["dauer_ms"] for schritt in schritte)
+    }
@@ -41,9 +41,13 @@ class DokumentResponse(DokumentBase):
 
 
 class DokumentList(BaseModel):
-    """Schema für eine Liste von Dokumenten."""
-    dokumente: List[DokumentResponse]
+    """Schema für eine Seite der Dokumentliste (Felder je nach ?fields=-Projektion)."""
+    dokumente: List[Dict[str, Any]]
     total: int
+    total_geschaetzt: bool = False  # total stammt aus der Planer-Schätzung
+    next_cursor: Optional[str] = None  # Cursor für die nächste Seite, None auf der letzten Seite
+    pending_processing: int = 0  # Dateien im Input, die noch nicht vollständig verarbeitet sind
+    blocked_processing: int = 0  # Dateien im Backoff bzw. Dead-Letter-Status (nicht in pending_processing)
 
 
 class MetadatenFeldBase(BaseModel):
@@ -0,0 +1,147 @@
+"""
+Leerseiten-Erkennung auf Basis roher Graustufen-Pixmaps.
+Die Pixeldaten werden ohne PNG-Umweg direkt als NumPy-Array ausgewertet.
+"""
+
+import logging
+from typing import List, Optional, Tuple
+
+import numpy as np
+
+from ..config.settings import BLANK_PAGE_DETECTION
+
+logger = logging.getLogger(__name__)
+
+
+def compute_pixel_stats(pix, white_threshold: int, ink_threshold: int) -> Tuple[float, float]:
+    """
+    Berechnet Weiß-Anteil und Tinten-Dichte einer Graustufen-Pixmap.
+
+    Args:
+        pix: fitz.Pixmap mit einem Kanal (csGRAY, ohne Alpha)
+        white_threshold: Grauwert ab dem ein Pixel als weiß zählt
+        ink_threshold: Grauwert unter dem ein Pixel als Tinte zählt
+
+    Returns:
+        Tuple (white_ratio, ink_density)
+    """
+    total_pixels = pix.width * pix.height
+    if total_pixels == 0:
+        return 1.0, 0.0
+
+    # Zero-Copy: memoryview auf den Pixmap-Puffer (ältere PyMuPDF-Versionen: bytes)
+    buffer = pix.samples_mv if hasattr(pix, "samples_mv") else pix.samples
+    samples = np.frombuffer(buffer, dtype=np.uint8)
+
+    # Zeilen können aufgefüllt sein (stride > width)
+    if pix.stride != pix.width:
+        samples = samples.reshape(pix.height, pix.stride)[:, :pix.width]
+
+    white_ratio = np.count_nonzero(samples >= white_threshold) / total_pixels
+    ink_density = np.count_nonzero(samples < ink_threshold) / total_pixels
+    return float(white_ratio), float(ink_density)
+
+
+class BlankPageDetector:
+    """Erkennt leere Seiten über Pixelstatistik mit Text-Prüfung für Grenzfälle."""
+
+    def __init__(self, config: Optional[dict] = None):
+        """
+        Args:
+            config: Schwellenwerte (Standard: BLANK_PAGE_DETECTION aus settings.py)
+        """
+        self.config = {**BLANK_PAGE_DETECTION, **(config or {})}
+
+    @property
+    def enabled(self) -> bool:
+        return self.config["enabled"]
+
+    def analyze_page(self, page) -> Tuple[float, float]:
+        """
+        Rendert eine Seite in Graustufen und berechnet deren Pixelstatistik.
+
+        Returns:
+            Tuple (white_ratio, ink_density)
+        """
+        import fitz  # PyMuPDF
+
+        scale = self.config["render_scale"]
+        pix = page.get_pixmap(matrix=fitz.Matrix(scale, scale), colorspace=fitz.csGRAY, alpha=False)
+        return compute_pixel_stats(
+            pix,
+            self.config["white_pixel_threshold"],
+            self.config["ink_pixel_threshold"]
+        )
+
+    def is_blank(self, white_ratio: float, ink_density: float, page_text: str) -> bool:
+        """
+        Entscheidet anhand von Pixelstatistik und Text, ob eine Seite leer ist.
+
+        Seite ist nur leer, wenn sie pixelbasiert leer ist UND kein relevanter Text vorliegt.
+        """
+        pixel_based_blank = (
+            white_ratio > self.config["blank_page_threshold"] and
+            ink_density <= self.config["max_ink_density"]
+        )
+        if not pixel_based_blank:
+            return False
+
+        # Textbasierte Zusatzprüfung für Grenzfälle
+        text = page_text.strip()
+        meaningful_text = len(text) > self.config["min_text_length"] and any(c.isalnum() for c in text)
+        contains_keywords = any(keyword in text.lower() for keyword in self.config["preserve_keywords"])
+
+        if meaningful_text or contains_keywords:
+            logger.debug(f"Seite fast leer, aber Text gefunden (weiß: {white_ratio:.1%}): '{text[:50]}...'")
+            return False
+
+        return True
+
+    def find_blank_pages(self, doc) -> List[int]:
+        """
+        Ermittelt die Indizes aller leeren Seiten eines geöffneten Dokuments.
+
+        Args:
+            doc: Geöffnetes fitz.Document
+
+        Returns:
+            Liste der Seitenindizes (0-basiert)
+        """
+        blank_pages = []
+
+        for page_num in range(len(doc)):
+            page = doc[page_num]
+            white_ratio, ink_density = self.analyze_page(page)
+
+            # Text nur für pixelbasiert leere Seiten extrahieren
+            if white_ratio <= self.config["blank_page_threshold"]:
+                continue
+
+            if self.is_blank(white_ratio, ink_density, page.get_text()):
+                blank_pages.append(page_num)
+                logger.debug(f"Seite {page_num + 1} ist leer (weiß: {white_ratio:.1%}, Tinte: {ink_density:.2%})")
+
+        return blank_pages
+
+    def find_blank_pages_in_analysis(self, analysis) -> List[int]:
+        """
+        Wie find_blank_pages, nutzt aber eine bestehende PdfAnalysis (Text + Render-Statistik).
+
+        Args:
+            analysis: PdfAnalysis der zu prüfenden Dateiversion
+
+        Returns:
+            Liste der Seitenindizes (0-basiert)
+        """
+        blank_pages = []
+
+        for page_num, (white_ratio, ink_density) in enumerate(analysis.render_stats):
+            if self.is_blank(white_ratio, ink_density, analysis.page_texts[page_num]):
+                blank_pages.append(page_num)
+                logger.debug(f"Seite {page_num + 1} ist leer (weiß: {white_ratio:.1%}, Tinte: {ink_density:.2%})")
+
+        return blank_pages
+
+
+# Globale Detector-Instanz mit den Einstellungen aus settings.py
+blank_page_detector = BlankPageDetector()
@@ -0,0 +1,87 @@
+"""
+Auflösung des aktuellen Dateipfads eines Dokuments.
+Ersetzt die Suche über DokumentRepository.get_all() und os.walk über das processed-Verzeichnis.
+"""
+
+import logging
+import os
+import threading
+from typing import Dict, Optional
+
+from ..config.settings import PDF_INPUT_DIR
+from ..repositories.dokument_repository import DokumentRepository
+
+logger = logging.getLogger(__name__)
+
+
+class DocumentPathResolver:
+    """
+    Findet den aktuellen Pfad einer Datei anhand ihres ursprünglichen Dateinamens im Input.
+
+    Reihenfolge:
+    1. Input-Verzeichnis
+    2. In-Memory-Map (wird bei Verschiebungen über record_move aktualisiert)
+    3. Indexierte DB-Abfrage auf original_dateiname (findet auch verschobene und
+       umbenannte Dokumente, z.B. nach einem Neustart ohne In-Memory-Map)
+    """
+
+    def __init__(self):
+        self._paths: Dict[str, str] = {}  # Ursprünglicher Dateiname -> aktueller Pfad
+        self._lock = threading.Lock()
+
+    def resolve(self, filename: str) -> Optional[str]:
+        """
+        Gibt den aktuellen Pfad einer Datei zurück.
+
+        Returns:
+            Aktueller Pfad oder None wenn nicht gefunden
+        """
+        input_path = os.path.join(PDF_INPUT_DIR, filename)
+        if os.path.exists(input_path):
+            return input_path
+
+        with self._lock:
+            cached_path = self._paths.get(filename)
+        if cached_path:
+            if os.path.exists(cached_path):
+                return cached_path
+            self.forget(filename)  # Veraltet (extern verschoben/gelöscht)
+
+        for dok_dict in DokumentRepository.find_by_original_dateiname(filename):
+            if os.path.exists(dok_dict["pfad"]):
+                self._remember(filename, dok_dict["pfad"])
+                return dok_dict["pfad"]
+
+        logger.debug(f"Datei {filename} nicht gefunden")
+        return None
+
+    def record_move(self, old_path: str, new_path: str):
+        """
+        Vermerkt eine Verschiebung/Umbenennung.
+
+        Alle Einträge, die auf old_path zeigen, sowie der Dateiname von old_path
+        zeigen danach auf new_path.
+        """
+        old_path = str(old_path)
+        new_path = str(new_path)
+
+        with self._lock:
+            for filename, path in self._paths.items():
+                if path == old_path:
+                    self._paths[filename] = new_path
+            self._paths[os.path.basename(old_path)] = new_path
+
+        logger.debug(f"Pfad aktualisiert: {os.path.basename(old_path)} -> {new_path}")
+
+    def forget(self, filename: str):
+        """Entfernt eine Datei aus der In-Memory-Map."""
+        with self._lock:
+            self._paths.pop(filename, None)
+
+    def _remember(self, filename: str, path: str):
+        with self._lock:
+            self._paths[filename] = path
+
+
+# Globale Resolver-Instanz
+document_path_resolver = DocumentPathResolver()
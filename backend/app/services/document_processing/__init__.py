@@ -5,6 +5,7 @@ Modulares System für die Verarbeitung verschiedener Dokumenttypen.
 
 from .base_processor import (
     BaseDocumentProcessor,
+    DocumentProcessingError,
     DocumentProcessorManager,
     document_processor_manager,
 )
@@ -16,6 +17,7 @@ document_processor_manager.register_processor(wareneingang_processor)
 
 __all__ = [
     'BaseDocumentProcessor',
+    'DocumentProcessingError',
     'DocumentProcessorManager', 
     'document_processor_manager',
     'WareneingangProcessor',
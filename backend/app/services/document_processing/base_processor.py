@@ -7,9 +7,15 @@ import logging
 from abc import ABC, abstractmethod
 from typing import Optional
 
+from ..pdf_analysis import get_pdf_analysis
+
 logger = logging.getLogger(__name__)
 
 
+class DocumentProcessingError(Exception):
+    """Ein zuständiger Processor ist fehlgeschlagen (Exception oder process() == False)."""
+
+
 class BaseDocumentProcessor(ABC):
     """
     Abstrakte Basisklasse für Document Processors.
@@ -65,21 +71,11 @@ class BaseDocumentProcessor(ABC):
             Liste der Textzeilen
         """
         try:
-            import fitz  # PyMuPDF
-            
-            doc = fitz.open(pdf_path)
-            if len(doc) == 0:
-                return []
-            
-            # Text von der ersten Seite extrahieren
-            page = doc[0]
-            text = page.get_text()
-            doc.close()
+            # Gemeinsame (gecachte) Analyse statt erneutem fitz.open
+            analysis = get_pdf_analysis(pdf_path)
             
-            # In Zeilen aufteilen und bereinigen
-            lines = [line.strip() for line in text.split('\n') if line.strip()]
-            
-            return lines[:max_lines]
+            # Text von der ersten Seite, in Zeilen aufgeteilt und bereinigt
+            return analysis.get_lines(0, max_lines)
             
         except Exception as e:
             self.logger.error(f"Fehler beim Extrahieren des PDF-Texts: {e}")
@@ -127,27 +123,47 @@ class DocumentProcessorManager:
             filename: Name der Datei
             
         Returns:
-            True wenn ein Processor das Dokument verarbeitet hat
+            True wenn ein Processor das Dokument verarbeitet hat,
+            False wenn kein Processor zuständig ist
+            
+        Raises:
+            DocumentProcessingError: Der zuständige Processor ist fehlgeschlagen bzw. die
+                Zuständigkeit konnte nicht geprüft werden (der Aufrufer soll es erneut versuchen)
         """
         if not self.processors:
             self.logger.debug(f"Keine Processors registriert für: {filename}")
             return False
         
+        erkennungsfehler = None
+        
         for processor in self.processors:
             try:
-                if await processor.can_handle(pdf_path):
-                    self.logger.info(f"📄 Verarbeite mit {processor.name}: {filename}")
-                    success = await processor.process(pdf_path, filename)
-                    
-                    if success:
-                        self.logger.info(f"✨ Dokument erfolgreich verarbeitet: {filename}")
-                        return True
-                    else:
-                        self.logger.warning(f"⚠️  Processor {processor.name} konnte {filename} nicht verarbeiten")
-                        
+                zustaendig = await processor.can_handle(pdf_path)
             except Exception as e:
-                self.logger.error(f"Fehler in Processor {processor.name} für {filename}: {e}")
+                self.logger.error(f"Fehler in Processor {processor.name} (can_handle) für {filename}: {e}")
+                erkennungsfehler = f"{processor.name}: Erkennung fehlgeschlagen ({e})"
                 continue
+            
+            if not zustaendig:
+                continue
+            
+            self.logger.info(f"📄 Verarbeite mit {processor.name}: {filename}")
+            try:
+                success = await processor.process(pdf_path, filename)
+            except Exception as e:
+                self.logger.error(f"Fehler in Processor {processor.name} für {filename}: {e}")
+                raise DocumentProcessingError(f"{processor.name}: {e}") from e
+            
+            if not success:
+                self.logger.warning(f"⚠️  Processor {processor.name} konnte {filename} nicht verarbeiten")
+                raise DocumentProcessingError(f"{processor.name}: Verarbeitung fehlgeschlagen")
+            
+            self.logger.info(f"✨ Dokument erfolgreich verarbeitet: {filename}")
+            return True
+        
+        if erkennungsfehler:
+            # Ein Processor hätte zuständig sein können - nicht als "kein Processor" abschließen
+            raise DocumentProcessingError(erkennungsfehler)
         
         self.logger.debug(f"Kein passender Processor gefunden für: {filename}")
         return False
@@ -0,0 +1,119 @@
+"""
+Spaltenorientierter Speicher für ERP-CSV-Datensätze (Feldsatz der Chargen-Tabelle).
+Werte werden pro Spalte dictionary-kodiert; pro Zeile bleibt nur ein 4-Byte-Code je Spalte.
+"""
+
+from array import array
+from collections.abc import Mapping
+from typing import Dict, Iterable, Iterator, List, Optional, Sequence
+
+# Spalten der ERP-Exporte, die in ChargenEinkauf übernommen werden
+CHARGEN_EINKAUF_FIELDS = (
+    'LINR', 'LINAME', 'NAME1', 'BELFD', 'TLNR', 'AUART', 'AFTNR', 'APS', 'ABSN', 'ATNR',
+    'ARTIKEL', 'MATERIALNR', 'URLND', 'WARTARNR', 'MENGE', 'ERFMENGE', 'GEBINDEME', 'SNNR',
+    'SNNRALT', 'EINZELEK', 'LIEFERSCHEINNR', 'LIEFERDATUM', 'RENREX', 'REDAT', 'BIDSER', 'BID'
+)
+
+
+class ChargenEinkaufColumnStore:
+    """
+    Spaltenspeicher für CSV-Datensätze.
+
+    Jede Spalte besteht aus einem Wörterbuch (Wert -> Code), der Werteliste (Code -> Wert)
+    und einem array('I') mit einem Code pro Zeile. Gleiche Werte (Lieferant, Datum,
+    Lieferscheinnummer, ...) werden so nur einmal gespeichert.
+    Code 0 steht für "Spalte fehlt in der CSV" (None, wie dict.get).
+    """
+
+    def __init__(self, fields: Sequence[str] = CHARGEN_EINKAUF_FIELDS):
+        self.fields = tuple(fields)
+        self._field_index: Dict[str, int] = {field: index for index, field in enumerate(self.fields)}
+        self._codes: List[array] = [array('I') for _ in self.fields]
+        self._encoders: List[Dict[Optional[str], int]] = [{None: 0} for _ in self.fields]
+        self._dictionaries: List[List[Optional[str]]] = [[None] for _ in self.fields]
+        self._length = 0
+
+    @classmethod
+    def from_rows(cls, rows: Iterable[Mapping]) -> "ChargenEinkaufColumnStore":
+        """Erstellt einen Spaltenspeicher aus beliebigen Datensätzen mit get()."""
+        store = cls()
+        store.extend(rows)
+        return store
+
+    def append(self, record: Mapping) -> int:
+        """
+        Fügt einen Datensatz hinzu (dict oder CsvRecord).
+
+        Returns:
+            Zeilennummer im Speicher
+        """
+        for field, codes, encoder, dictionary in zip(self.fields, self._codes, self._encoders, self._dictionaries):
+            value = record.get(field)
+            code = encoder.get(value)
+            if code is None:
+                code = encoder[value] = len(dictionary)
+                dictionary.append(value)
+            codes.append(code)
+
+        self._length += 1
+        return self._length - 1
+
+    def extend(self, records: Iterable[Mapping]) -> int:
+        """Fügt mehrere Datensätze hinzu und gibt deren Anzahl zurück."""
+        start = self._length
+        for record in records:
+            self.append(record)
+        return self._length - start
+
+    def value(self, row_id: int, field: str) -> Optional[str]:
+        """Gibt den Wert einer Zelle zurück (KeyError bei unbekannter Spalte)."""
+        column = self._field_index[field]
+        return self._dictionaries[column][self._codes[column][row_id]]
+
+    def column(self, field: str) -> Iterator[Optional[str]]:
+        """Iteriert über alle Werte einer Spalte in Zeilenreihenfolge."""
+        column = self._field_index[field]
+        dictionary = self._dictionaries[column]
+        return (dictionary[code] for code in self._codes[column])
+
+    def row(self, row_id: int) -> "ChargenEinkaufRow":
+        """Gibt eine Zeilen-Ansicht zurück (verhält sich wie ein schreibgeschütztes dict)."""
+        if not 0 <= row_id < self._length:
+            raise IndexError(row_id)
+        return ChargenEinkaufRow(self, row_id)
+
+    def distinct_counts(self) -> Dict[str, int]:
+        """Anzahl unterschiedlicher Werte pro Spalte (ohne den None-Platzhalter)."""
+        return {field: len(dictionary) - 1 for field, dictionary in zip(self.fields, self._dictionaries)}
+
+    def __len__(self) -> int:
+        return self._length
+
+    def __iter__(self) -> Iterator["ChargenEinkaufRow"]:
+        return (ChargenEinkaufRow(self, row_id) for row_id in range(self._length))
+
+
+class ChargenEinkaufRow(Mapping):
+    """
+    Zeilen-Ansicht auf einen ChargenEinkaufColumnStore.
+
+    Kompatibel zu ChargenEinkaufRepository.create_from_csv_row (csv_row.get('LINR') ...).
+    """
+
+    __slots__ = ('_store', '_row_id')
+
+    def __init__(self, store: ChargenEinkaufColumnStore, row_id: int):
+        self._store = store
+        self._row_id = row_id
+
+    def __getitem__(self, field: str) -> Optional[str]:
+        return self._store.value(self._row_id, field)
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._store.fields)
+
+    def __len__(self) -> int:
+        return len(self._store.fields)
+
+    def __repr__(self):
+        return f"ChargenEinkaufRow({dict(self)!r})"
@@ -0,0 +1,172 @@
+"""
+Index über CSV-Datensätze für das Wareneingang-Matching.
+Exakte Treffer über Hash-Index, ähnliche Nummern über einen N-Gramm-Index.
+"""
+
+from array import array
+from collections import defaultdict
+from collections.abc import Mapping
+from typing import Dict, Iterable, List, Set
+
+from .csv_column_store import ChargenEinkaufColumnStore, ChargenEinkaufRow
+
+
+def normalize_lieferscheinnummer(value) -> str:
+    """Normalisiert eine Lieferscheinnummer: ohne Whitespace, Großschreibung."""
+    return "".join(str(value or "").split()).upper()
+
+
+class CsvLieferscheinIndex:
+    """
+    Index der CSV-Datensätze nach normalisierter LIEFERSCHEINNR.
+
+    - Datensätze liegen pro Quelldatei in einem ChargenEinkaufColumnStore
+    - Exakte Suche: O(1) über ein Dictionary Nummer -> Zeilennummern
+    - Ähnliche Nummern (Teilstring in beide Richtungen): über einen Trigramm-Index
+      statt Teilstring-Vergleich mit jeder Zeile
+    """
+
+    NGRAM_SIZE = 3
+    KEY_COLUMN = 'LIEFERSCHEINNR'
+
+    def __init__(self, rows: Iterable[Mapping] = ()):
+        # Normalisierte Nummer -> {Quelldatei: Zeilennummern im Spaltenspeicher der Datei}
+        self._exact: Dict[str, Dict[str, array]] = {}
+        self._display: Dict[str, str] = {}  # Normalisiert -> Originalschreibweise
+        self._ngrams: Dict[str, Set[str]] = defaultdict(set)
+        self._stores: Dict[str, ChargenEinkaufColumnStore] = {}
+        self._source_keys: Dict[str, Set[str]] = {}
+
+        # rows kann ein Generator sein (immer truthy) - erst einlesen, dann auf Inhalt prüfen
+        store = ChargenEinkaufColumnStore.from_rows(rows)
+        if len(store):
+            self.add_file('', store)
+
+    def add_file(self, source: str, store: ChargenEinkaufColumnStore):
+        """
+        Nimmt die Datensätze einer Quelldatei auf (ersetzt einen vorherigen Stand).
+
+        Args:
+            source: Quelldatei (für gezieltes Entfernen über remove_file)
+            store: Spaltenspeicher mit den Datensätzen der Datei
+        """
+        self.remove_file(source)
+        self._stores[source] = store
+        source_keys = self._source_keys[source] = set()
+
+        for row_id, value in enumerate(store.column(self.KEY_COLUMN)):
+            raw_value = str(value or '').strip()
+            key = normalize_lieferscheinnummer(raw_value)
+            if not key:
+                continue
+
+            buckets = self._exact.get(key)
+            if buckets is None:
+                # Neue Nummer: N-Gramme nur einmal pro Schlüssel eintragen
+                buckets = self._exact[key] = {}
+                self._display[key] = raw_value
+                for gram in self._iter_ngrams(key):
+                    self._ngrams[gram].add(key)
+
+            row_ids = buckets.get(source)
+            if row_ids is None:
+                row_ids = buckets[source] = array('I')
+            row_ids.append(row_id)
+            source_keys.add(key)
+
+    def remove_file(self, source: str):
+        """Entfernt alle Datensätze einer Quelldatei aus dem Index."""
+        for key in self._source_keys.pop(source, set()):
+            buckets = self._exact[key]
+            buckets.pop(source, None)
+            if buckets:
+                continue
+
+            # Letzte Quelle der Nummer entfernt: Schlüssel komplett austragen
+            del self._exact[key]
+            del self._display[key]
+            for gram in self._iter_ngrams(key):
+                posting = self._ngrams.get(gram)
+                if posting is not None:
+                    posting.discard(key)
+                    if not posting:
+                        del self._ngrams[gram]
+
+        self._stores.pop(source, None)
+
+    def find_exact(self, lieferscheinnummer: str) -> List[ChargenEinkaufRow]:
+        """Gibt alle Datensätze mit exakt dieser (normalisierten) Nummer zurück."""
+        buckets = self._exact.get(normalize_lieferscheinnummer(lieferscheinnummer))
+        if not buckets:
+            return []
+        return [
+            self._stores[source].row(row_id)
+            for source, row_ids in buckets.items()
+            for row_id in row_ids
+        ]
+
+    def find_similar(self, lieferscheinnummer: str, limit: int = 5) -> List[str]:
+        """
+        Findet Nummern, die die gesuchte enthalten oder in ihr enthalten sind.
+
+        Args:
+            lieferscheinnummer: Gesuchte Nummer
+            limit: Maximale Anzahl Vorschläge
+
+        Returns:
+            Liste ähnlicher Nummern in Originalschreibweise (ohne exakten Treffer)
+        """
+        query = normalize_lieferscheinnummer(lieferscheinnummer)
+        if len(query) < self.NGRAM_SIZE:
+            return []
+
+        similar: List[str] = []
+
+        # 1. Indexierte Nummern, die in der Suche enthalten sind (Teilstrings der Suche nachschlagen)
+        for length in range(len(query) - 1, self.NGRAM_SIZE - 1, -1):
+            for start in range(len(query) - length + 1):
+                candidate = query[start:start + length]
+                if candidate in self._exact and candidate not in similar:
+                    similar.append(candidate)
+                    if len(similar) >= limit:
+                        return [self._display[key] for key in similar]
+
+        # 2. Indexierte Nummern, die die Suche enthalten: Schnittmenge der Trigramm-Listen
+        postings = sorted(
+            (self._ngrams.get(gram, set()) for gram in set(self._iter_ngrams(query))),
+            key=len
+        )
+        if postings and postings[0]:
+            candidates = set(postings[0])
+            for posting in postings[1:]:
+                candidates &= posting
+                if not candidates:
+                    break
+
+            for key in sorted(candidates):
+                if key != query and query in key and key not in similar:
+                    similar.append(key)
+                    if len(similar) >= limit:
+                        break
+
+        return [self._display[key] for key in similar]
+
+    @property
+    def row_count(self) -> int:
+        """Anzahl indexierter Datensätze über alle Quelldateien."""
+        return sum(len(store) for store in self._stores.values())
+
+    @property
+    def sources(self) -> List[str]:
+        """Quelldateien, deren Datensätze im Index enthalten sind."""
+        return [source for source, store in self._stores.items() if len(store)]
+
+    @property
+    def key_count(self) -> int:
+        """Anzahl unterschiedlicher Lieferscheinnummern."""
+        return len(self._exact)
+
+    @classmethod
+    def _iter_ngrams(cls, key: str) -> Iterable[str]:
+        for start in range(len(key) - cls.NGRAM_SIZE + 1):
+            yield key[start:start + cls.NGRAM_SIZE]
@@ -0,0 +1,150 @@
+"""
+Streaming-Einleser für ERP-CSV-Exporte.
+Encoding und Dialekt werden einmalig aus einer Stichprobe ermittelt, die Datei wird genau einmal gelesen.
+"""
+
+import codecs
+import csv
+import logging
+from typing import Dict, Iterator, List, Optional, Sequence, Tuple
+
+logger = logging.getLogger(__name__)
+
+SNIFF_SAMPLE_BYTES = 64 * 1024
+CANDIDATE_DELIMITERS = ';,\t|'
+
+
+class CsvRecord(tuple):
+    """
+    Kompakter CSV-Datensatz: ein Tupel mit gemeinsam genutztem Header.
+
+    Bietet die lesenden Dict-Methoden (get, keys, items), damit bestehender Code
+    wie ChargenEinkaufRepository.create_from_csv_row unverändert funktioniert.
+    """
+
+    __slots__ = ()
+    _columns: Dict[str, int] = {}
+
+    def get(self, key: str, default=None):
+        index = self._columns.get(key)
+        if index is None:
+            return default
+        return self[index]
+
+    def keys(self) -> List[str]:
+        return list(self._columns)
+
+    def items(self) -> List[Tuple[str, str]]:
+        return list(zip(self._columns, self))
+
+    def __repr__(self):
+        return f"CsvRecord({dict(self.items())!r})"
+
+
+def make_record_type(header: Sequence[str]) -> type:
+    """Erzeugt eine CsvRecord-Klasse für einen Header (eine Klasse pro Datei, nicht pro Zeile)."""
+    columns = {}
+    for index, name in enumerate(header):
+        columns.setdefault(name, index)  # Bei doppelten Spalten gilt die erste
+    return type('CsvRecord', (CsvRecord,), {'__slots__': (), '_columns': columns})
+
+
+def detect_encoding(sample: bytes) -> str:
+    """Ermittelt das Encoding aus der Stichprobe: UTF-8 (mit/ohne BOM), sonst Windows-1252."""
+    if sample.startswith(codecs.BOM_UTF8):
+        return 'utf-8-sig'
+
+    try:
+        # Inkrementell dekodieren, da die Stichprobe mitten in einem Zeichen enden kann
+        codecs.getincrementaldecoder('utf-8')().decode(sample, final=False)
+        return 'utf-8'
+    except UnicodeDecodeError:
+        return 'cp1252'
+
+
+def detect_dialect(sample_text: str) -> Optional[type]:
+    """
+    Ermittelt den CSV-Dialekt aus der Stichprobe.
+
+    Nutzt csv.Sniffer auf den vollständigen Zeilen der Stichprobe; schlägt das fehl,
+    wird das in der Kopfzeile häufigste Trennzeichen verwendet.
+    """
+    lines = sample_text.splitlines()
+    if len(lines) > 1:
+        lines = lines[:-1]  # Letzte Zeile ist evtl. abgeschnitten
+    if not lines or not lines[0].strip():
+        return None
+
+    try:
+        return csv.Sniffer().sniff('\n'.join(lines[:50]), delimiters=CANDIDATE_DELIMITERS)
+    except csv.Error:
+        header_line = lines[0]
+        delimiter = max(CANDIDATE_DELIMITERS, key=header_line.count)
+        if not header_line.count(delimiter):
+            return None
+        return delimiter_dialect(delimiter)
+
+
+def delimiter_dialect(delimiter: str) -> type:
+    """Standard-CSV-Dialekt (wie csv.DictReader) mit dem angegebenen Trennzeichen."""
+
+    class DelimiterDialect(csv.excel):
+        pass
+
+    DelimiterDialect.delimiter = delimiter
+    return DelimiterDialect
+
+
+def read_csv_records(csv_path: str, min_columns: int = 11) -> Tuple[List[str], Iterator[CsvRecord]]:
+    """
+    Liest eine CSV-Datei in einem Durchlauf.
+
+    Args:
+        csv_path: Pfad zur CSV-Datei
+        min_columns: Mindestanzahl Spalten im Header (sonst kein gültiger Export)
+
+    Returns:
+        Tuple (Header, Iterator über CsvRecord). Header ist leer, wenn die Datei
+        nicht als CSV erkannt wurde.
+    """
+    with open(csv_path, 'rb') as f:
+        sample = f.read(SNIFF_SAMPLE_BYTES)
+
+    encoding = detect_encoding(sample)
+    dialect = detect_dialect(sample.decode(encoding, errors='ignore'))
+    if dialect is None:
+        return [], iter(())
+
+    # Der Sniffer kann sich irren (z.B. ungequotetes Trennzeichen im Artikeltext einer
+    # Stichprobenzeile) - dann die Trennzeichen in fester Reihenfolge durchprobieren
+    candidates = [dialect] + [
+        delimiter_dialect(delimiter) for delimiter in CANDIDATE_DELIMITERS
+        if delimiter != dialect.delimiter
+    ]
+
+    for candidate in candidates:
+        csvfile = open(csv_path, 'r', encoding=encoding, errors='ignore', newline='')
+        reader = csv.reader(csvfile, candidate)
+        header = [name.strip() for name in next(reader, [])]
+
+        if len(header) >= min_columns:
+            logger.debug(f"CSV-Format erkannt: encoding={encoding}, delimiter={candidate.delimiter!r}, {len(header)} Spalten")
+            return header, _iter_records(csvfile, reader, make_record_type(header), len(header))
+
+        csvfile.close()
+        logger.debug(f"Zu wenige Spalten ({len(header)}) mit Delimiter {candidate.delimiter!r}: {csv_path}")
+
+    return [], iter(())
+
+
+def _iter_records(csvfile, reader, record_type: type, column_count: int) -> Iterator[CsvRecord]:
+    with csvfile:
+        for row in reader:
+            if not row:
+                continue  # Leerzeilen überspringen (wie csv.DictReader)
+
+            if len(row) != column_count:
+                # Fehlende Spalten auffüllen, überzählige abschneiden
+                row = (row + [''] * column_count)[:column_count]
+
+            yield record_type(map(str.strip, row))
@@ -4,12 +4,14 @@ Verarbeitet PDFs mit "Wareneingang" und importiert zugehörige CSV-Daten.
 Aktualisiert für PostgreSQL-Repository-Pattern mit DB-basierter Dateiverwaltung.
 """
 
-import csv
+import asyncio
 import os
 import re
 import shutil
+import time
+from contextlib import nullcontext
 from pathlib import Path
-from typing import List, Optional
+from typing import Dict, Optional, Tuple
 
 from ...config.settings import CSV_LIST_DIR, PDF_PROCESSED_DIR
 from ...database.postgres_connection import get_db_session
@@ -19,7 +21,14 @@ from ...repositories.lieferschein_repository import (
     ChargenEinkaufRepository,
     LieferscheinExternRepository,
 )
+from ...repositories.verarbeitungsstatus_repository import VerarbeitungsstatusRepository
+from ..document_path_resolver import document_path_resolver
+from ..metrics import CSV_ROWS_MATCHED
+from ..processing_timeline import processing_timeline
 from .base_processor import BaseDocumentProcessor
+from .csv_column_store import ChargenEinkaufColumnStore
+from .csv_index import CsvLieferscheinIndex
+from .csv_reader import read_csv_records
 
 
 class WareneingangProcessor(BaseDocumentProcessor):
@@ -37,7 +46,9 @@ class WareneingangProcessor(BaseDocumentProcessor):
     
     def __init__(self):
         super().__init__("Wareneingang")
-        self._csv_cache = {}  # Cache für CSV-Daten
+        self._csv_index = CsvLieferscheinIndex()  # Index über alle CSV-Datensätze
+        self._csv_file_signatures: Dict[str, Tuple[int, int]] = {}  # Pfad -> (mtime_ns, size)
+        self._csv_lock = asyncio.Lock()
     
     async def can_handle(self, pdf_path: str) -> bool:
         """
@@ -46,7 +57,7 @@ class WareneingangProcessor(BaseDocumentProcessor):
         Sucht nach dem Wort "Wareneingang" in den ersten Zeilen.
         """
         try:
-            lines = self._extract_text_from_pdf(pdf_path, max_lines=20)
+            lines = await asyncio.to_thread(self._extract_text_from_pdf, pdf_path, max_lines=20)
             
             # Suche nach "Wareneingang" (case-insensitive)
             for line in lines:
@@ -75,35 +86,42 @@ class WareneingangProcessor(BaseDocumentProcessor):
         
         try:
             # 1. Lieferscheinnummer extrahieren
-            lieferscheinnummer = self._extract_lieferscheinnummer(pdf_path)
+            with processing_timeline.step(filename, "wareneingang.lieferscheinnummer"):
+                lieferscheinnummer = await asyncio.to_thread(self._extract_lieferscheinnummer, pdf_path)
             if not lieferscheinnummer:
                 self._log_processing_error(pdf_path, "Keine Lieferscheinnummer gefunden")
                 return False
             
             self.logger.info(f"📦 Lieferscheinnummer extrahiert: {lieferscheinnummer}")
             
-            # 2. Zugehöriges Dokument in DB finden
-            dokument_dict = self._find_document_by_path(pdf_path)
-            if not dokument_dict:
-                self._log_processing_error(pdf_path, "Dokument nicht in Datenbank gefunden")
-                return False
-            
-            # 3. Dokument als Lieferschein_extern kategorisieren
-            updated_dokument = self._categorize_document(dokument_dict["id"])
+            # 2. Zugehöriges Dokument in DB finden und 3. als Lieferschein_extern kategorisieren
+            with processing_timeline.step(filename, "wareneingang.kategorisieren") as step:
+                dokument_dict = await asyncio.to_thread(self._find_document_by_path, pdf_path)
+                if not dokument_dict:
+                    step.fail("Dokument nicht in Datenbank gefunden")
+                    self._log_processing_error(pdf_path, "Dokument nicht in Datenbank gefunden")
+                    return False
+                
+                updated_dokument = await asyncio.to_thread(self._categorize_document, dokument_dict["id"])
             if not updated_dokument:
                 self._log_processing_error(pdf_path, "Fehler beim Kategorisieren")
                 return False
             
             # 4. Prüfen ob Lieferschein bereits existiert
-            existing_lieferschein = LieferscheinExternRepository.get_by_lieferscheinnummer(lieferscheinnummer)
+            existing_lieferschein = await asyncio.to_thread(
+                LieferscheinExternRepository.get_by_lieferscheinnummer, lieferscheinnummer
+            )
             if existing_lieferschein:
                 self.logger.info(f"Lieferschein bereits vorhanden: {lieferscheinnummer}")
                 # Trotzdem Datei verschieben falls noch nicht geschehen
-                await self._move_document_to_category(updated_dokument, lieferscheinnummer)
+                with processing_timeline.step(filename, "wareneingang.verschieben"):
+                    await self._move_document_to_category(updated_dokument, lieferscheinnummer)
                 return True
             
             # 5. Neuen externen Lieferschein erstellen
-            lieferschein = LieferscheinExternRepository.create(lieferscheinnummer, dokument_dict["id"])
+            lieferschein = await asyncio.to_thread(
+                LieferscheinExternRepository.create, lieferscheinnummer, dokument_dict["id"]
+            )
             if not lieferschein:
                 self._log_processing_error(pdf_path, "Fehler beim Erstellen des Lieferscheins")
                 return False
@@ -111,14 +129,17 @@ class WareneingangProcessor(BaseDocumentProcessor):
             self.logger.info(f"📋 Externer Lieferschein erstellt: ID {lieferschein.id}")
             
             # 6. CSV-Daten laden und importieren
-            csv_import_count = await self._import_csv_data(lieferschein, lieferscheinnummer)
+            csv_import_count = await self._import_csv_data(lieferschein, lieferscheinnummer, filename)
             
             if csv_import_count > 0:
                 # Als importiert markieren
-                LieferscheinExternRepository.mark_csv_imported(lieferschein.id)
+                await asyncio.to_thread(LieferscheinExternRepository.mark_csv_imported, lieferschein.id)
                 
             # 7. Dokument ins Lieferschein_extern-Verzeichnis verschieben
-            move_success = await self._move_document_to_category(updated_dokument, lieferscheinnummer)
+            with processing_timeline.step(filename, "wareneingang.verschieben") as step:
+                move_success = await self._move_document_to_category(updated_dokument, lieferscheinnummer)
+                if not move_success:
+                    step.fail("Verschieben fehlgeschlagen")
             if move_success:
                 self.logger.info(f"📁 Wareneingang erfolgreich als Lieferschein_extern abgelegt")
             else:
@@ -187,11 +208,10 @@ class WareneingangProcessor(BaseDocumentProcessor):
             # Dateiname aus Pfad extrahieren
             filename = os.path.basename(pdf_path)
             
-            # Alle Dokumente durchsuchen (gibt bereits Dictionaries zurück)
-            all_dokumente = DokumentRepository.get_all()
-            for dok_dict in all_dokumente:
-                if dok_dict["dateiname"] == filename or dok_dict["pfad"] == pdf_path:
-                    return dok_dict
+            # Indexierte Suche über Pfad oder Dateiname (gibt Dictionary zurück)
+            dok_dict = DokumentRepository.find_by_pfad_or_dateiname(pdf_path, filename)
+            if dok_dict:
+                return dok_dict
             
             self.logger.warning(f"Dokument nicht gefunden: {filename}")
             return None
@@ -222,6 +242,13 @@ class WareneingangProcessor(BaseDocumentProcessor):
             return None
     
     async def _move_document_to_category(self, dokument_dict: dict, lieferscheinnummer: str = None) -> bool:
+        """
+        Verschiebt das Dokument ins Lieferschein_extern-Verzeichnis mit eindeutiger Benennung
+        (Dateisystem und DB-Zugriffe im Worker-Thread).
+        """
+        return await asyncio.to_thread(self._move_document_file, dokument_dict, lieferscheinnummer)
+    
+    def _move_document_file(self, dokument_dict: dict, lieferscheinnummer: str = None) -> bool:
         """
         Verschiebt das Dokument ins Lieferschein_extern-Verzeichnis mit eindeutiger Benennung.
         Format: lief_ext_[Lieferscheinnummer]_[DDMMYY_hhmmss]_[DB_ID].pdf
@@ -270,9 +297,10 @@ class WareneingangProcessor(BaseDocumentProcessor):
             
             # Datei verschieben und umbenennen
             shutil.move(alter_pfad, str(neuer_pfad))
+            document_path_resolver.record_move(alter_pfad, neuer_pfad)
             
-            # Marker-Dateien auch aufräumen
-            self._cleanup_marker_files(alter_pfad)
+            # Verarbeitungsstatus auch aufräumen
+            self._cleanup_processing_state(alter_pfad)
             
             # Pfad UND Dateiname in DB aktualisieren
             DokumentRepository.update_pfad_und_dateiname(
@@ -313,67 +341,49 @@ class WareneingangProcessor(BaseDocumentProcessor):
             self.logger.error(f"Fehler beim Ermitteln des Kategoriepfads: {e}")
             return None
     
-    def _cleanup_marker_files(self, original_path: str):
-        """Räumt Marker-Dateien auf."""
+    def _cleanup_processing_state(self, original_path: str):
+        """Räumt den Verarbeitungsstatus (OCR, Document Processing) der Originaldatei auf."""
         try:
-            # OCR-Marker entfernen
-            ocr_marker = original_path + '.ocr_processed'
-            if os.path.exists(ocr_marker):
-                os.remove(ocr_marker)
-            
-            # Document Processing Marker entfernen
-            doc_marker = original_path + '.doc_processed'
-            if os.path.exists(doc_marker):
-                os.remove(doc_marker)
+            VerarbeitungsstatusRepository.delete_for_file(os.path.basename(original_path))
                 
         except Exception as e:
-            self.logger.warning(f"Fehler beim Aufräumen der Marker-Dateien: {e}")
+            self.logger.warning(f"Fehler beim Aufräumen des Verarbeitungsstatus: {e}")
     
-    async def _import_csv_data(self, lieferschein, lieferscheinnummer: str) -> int:
+    async def _import_csv_data(self, lieferschein, lieferscheinnummer: str, filename: Optional[str] = None) -> int:
         """
         Importiert CSV-Daten für die gegebene Lieferscheinnummer.
+        
+        Args:
+            filename: Original-Dateiname; wenn gesetzt, werden Laden und Import in der Zeitleiste erfasst
         """
         try:
-            # CSV-Dateien laden (mit Cache)
-            csv_data = await self._load_csv_files()
+            # CSV-Index laden (mit Cache)
+            with self._timeline_step(filename, "wareneingang.csv_laden"):
+                csv_index = await self._load_csv_files()
             
-            if not csv_data:
+            if not csv_index or not csv_index.row_count:
                 self.logger.warning("Keine CSV-Daten verfügbar")
                 return 0
             
-            import_count = 0
-            found_similar = []  # Für Debugging bei nicht gefundenen Nummern
-            
-            self.logger.info(f"🔍 Suche nach Lieferscheinnummer: '{lieferscheinnummer}' in {len(csv_data)} CSV-Datensätzen")
+            self.logger.info(f"🔍 Suche nach Lieferscheinnummer: '{lieferscheinnummer}' in {csv_index.row_count} CSV-Datensätzen")
             
-            # In allen CSV-Datensätzen nach der Lieferscheinnummer suchen
-            for csv_row in csv_data:
-                csv_lieferscheinnr = str(csv_row.get('LIEFERSCHEINNR', '')).strip()
-                
-                # Exakter Match
-                if csv_lieferscheinnr == lieferscheinnummer:
-                    # Datensatz importieren
-                    charge = ChargenEinkaufRepository.create_from_csv_row(lieferschein.id, csv_row)
-                    if charge:
-                        import_count += 1
-                        artikel = csv_row.get('ARTIKEL', 'N/A')
-                        self.logger.debug(f"✅ CSV-Datensatz importiert: {artikel}")
-                
-                # Für Debugging: ähnliche Nummern sammeln
-                elif (csv_lieferscheinnr and 
-                      len(csv_lieferscheinnr) >= 3 and
-                      (lieferscheinnummer in csv_lieferscheinnr or csv_lieferscheinnr in lieferscheinnummer)):
-                    found_similar.append(csv_lieferscheinnr)
+            # Exakte Treffer direkt über den Index, Import in einer Transaktion
+            with self._timeline_step(filename, "wareneingang.csv_import"):
+                csv_rows = csv_index.find_exact(lieferscheinnummer)
+                import_count = await asyncio.to_thread(
+                    ChargenEinkaufRepository.bulk_create_from_csv_rows, lieferschein.id, csv_rows
+                )
             
             if import_count > 0:
+                CSV_ROWS_MATCHED.inc(import_count)
                 self.logger.info(f"📊 {import_count} CSV-Datensätze für Lieferschein '{lieferscheinnummer}' importiert")
             else:
                 self.logger.warning(f"❌ Keine CSV-Datensätze für '{lieferscheinnummer}' gefunden")
                 
-                # Debug: ähnliche Nummern anzeigen
-                if found_similar:
-                    similar_unique = list(set(found_similar[:5]))  # Erste 5 unique
-                    self.logger.info(f"🔍 Ähnliche Lieferscheinnummern gefunden: {similar_unique}")
+                # Debug: ähnliche Nummern anzeigen (über N-Gramm-Index)
+                similar = csv_index.find_similar(lieferscheinnummer, limit=5)
+                if similar:
+                    self.logger.info(f"🔍 Ähnliche Lieferscheinnummern gefunden: {similar}")
             
             return import_count
             
@@ -381,100 +391,114 @@ class WareneingangProcessor(BaseDocumentProcessor):
             self.logger.error(f"Fehler beim Importieren der CSV-Daten: {e}")
             return 0
     
-    async def _load_csv_files(self) -> List[dict]:
+    @staticmethod
+    def _timeline_step(filename: Optional[str], schritt: str):
+        """Zeitleisten-Schritt, falls ein Dateiname bekannt ist (sonst z.B. beim manuellen CSV-Reimport)."""
+        return processing_timeline.step(filename, schritt) if filename else nullcontext()
+    
+    async def _load_csv_files(self) -> Optional[CsvLieferscheinIndex]:
         """
-        Lädt alle CSV-Dateien aus dem csv_lists Verzeichnis.
+        Lädt die CSV-Dateien aus dem csv_lists Verzeichnis in den Lieferscheinnummer-Index.
         
-        Verwendet Caching um bei mehreren Aufrufen performant zu bleiben.
+        Inkrementell: Pro Datei wird (Pfad, mtime, Größe) gemerkt. Nur neue oder geänderte
+        Dateien werden neu eingelesen, gelöschte Dateien aus dem Index entfernt.
+        Verzeichnis-Scan und Parsing laufen in einem Worker-Thread.
         """
-        if self._csv_cache:
-            return self._csv_cache.get('data', [])
-        
-        try:
-            if not os.path.exists(CSV_LIST_DIR):
-                self.logger.warning(f"CSV-Verzeichnis nicht gefunden: {CSV_LIST_DIR}")
-                return []
-            
-            all_csv_data = []
-            csv_files_found = 0
-            
-            # Alle CSV-Dateien im Verzeichnis durchsuchen
-            for filename in os.listdir(CSV_LIST_DIR):
-                if filename.lower().endswith('.csv'):
-                    csv_path = os.path.join(CSV_LIST_DIR, filename)
-                    csv_data = self._load_single_csv(csv_path)
+        async with self._csv_lock:
+            try:
+                current_files = await asyncio.to_thread(self._scan_csv_files)
+                if current_files is None:
+                    self.logger.warning(f"CSV-Verzeichnis nicht gefunden: {CSV_LIST_DIR}")
+                    return None
+                
+                csv_index = self._csv_index
+                
+                # Gelöschte Dateien austragen
+                for csv_path in list(self._csv_file_signatures):
+                    if csv_path not in current_files:
+                        csv_index.remove_file(csv_path)
+                        del self._csv_file_signatures[csv_path]
+                        self.logger.info(f"🗑️  CSV aus Index entfernt: {os.path.basename(csv_path)}")
+                
+                # Neue oder geänderte Dateien (neu) einlesen
+                changed_files = [
+                    csv_path for csv_path, signature in current_files.items()
+                    if self._csv_file_signatures.get(csv_path) != signature
+                ]
+                for csv_path in changed_files:
+                    csv_store = await asyncio.to_thread(self._load_single_csv, csv_path)
+                    csv_index.add_file(csv_path, csv_store)
+                    self._csv_file_signatures[csv_path] = current_files[csv_path]
                     
-                    if csv_data:
-                        all_csv_data.extend(csv_data)
-                        csv_files_found += 1
-                        self.logger.info(f"📄 CSV geladen: {filename} ({len(csv_data)} Datensätze)")
-            
-            # Cache aktualisieren
-            self._csv_cache = {
-                'data': all_csv_data,
-                'files_count': csv_files_found
-            }
-            
-            self.logger.info(f"📚 Gesamt: {len(all_csv_data)} Datensätze aus {csv_files_found} CSV-Dateien geladen")
-            return all_csv_data
-            
-        except Exception as e:
-            self.logger.error(f"Fehler beim Laden der CSV-Dateien: {e}")
-            return []
+                    if len(csv_store):
+                        self.logger.info(f"📄 CSV geladen: {os.path.basename(csv_path)} ({len(csv_store)} Datensätze)")
+                
+                if changed_files:
+                    self.logger.info(
+                        f"📚 Gesamt: {csv_index.row_count} Datensätze aus {len(csv_index.sources)} CSV-Dateien "
+                        f"({csv_index.key_count} Lieferscheinnummern indexiert, {len(changed_files)} Dateien neu geladen)"
+                    )
+                
+                return csv_index
+                
+            except Exception as e:
+                self.logger.error(f"Fehler beim Laden der CSV-Dateien: {e}")
+                return None
+    
+    def _scan_csv_files(self) -> Optional[Dict[str, Tuple[int, int]]]:
+        """
+        Ermittelt alle CSV-Dateien mit ihrer Signatur (mtime_ns, Größe).
+        
+        Returns:
+            Dict Pfad -> (mtime_ns, size) oder None wenn das Verzeichnis fehlt
+        """
+        if not os.path.exists(CSV_LIST_DIR):
+            return None
+        
+        csv_files = {}
+        with os.scandir(CSV_LIST_DIR) as entries:
+            for entry in entries:
+                if entry.is_file() and entry.name.lower().endswith('.csv'):
+                    try:
+                        stat = entry.stat()
+                    except FileNotFoundError:
+                        continue  # Während des Scans gelöscht
+                    csv_files[entry.path] = (stat.st_mtime_ns, stat.st_size)
+        return csv_files
     
-    def _load_single_csv(self, csv_path: str) -> List[dict]:
+    def _load_single_csv(self, csv_path: str) -> ChargenEinkaufColumnStore:
         """
-        Lädt eine einzelne CSV-Datei mit robustem Delimiter-Detection.
+        Lädt eine einzelne CSV-Datei in einem Durchlauf in einen Spaltenspeicher.
+        
+        Encoding und Delimiter werden einmalig aus einer Stichprobe erkannt,
+        die Datensätze direkt (ohne Zwischenliste) spaltenweise kodiert abgelegt.
         """
+        csv_store = ChargenEinkaufColumnStore()
+        
         try:
-            csv_data = []
-            
-            # Encoding detection
-            with open(csv_path, 'rb') as f:
-                raw_data = f.read(1024)
+            started = time.perf_counter()
+            header, records = read_csv_records(csv_path)
             
-            # UTF-8 BOM prüfen
-            if raw_data.startswith(b'\xef\xbb\xbf'):
-                encoding = 'utf-8-sig'
-            else:
-                encoding = 'utf-8'
+            if not header:
+                self.logger.error(f"❌ CSV-Format nicht erkannt (mind. 11 Spalten erwartet): {csv_path}")
+                return csv_store
             
-            # Robuster CSV-Loading mit mehreren Delimiter-Versuchen
-            delimiters_to_try = [';', ',', '\t', '|']
+            csv_store.extend(records)
             
-            for delimiter in delimiters_to_try:
-                try:
-                    with open(csv_path, 'r', encoding=encoding, errors='ignore') as csvfile:
-                        reader = csv.DictReader(csvfile, delimiter=delimiter)
-                        
-                        # Test: Ersten Datensatz lesen
-                        first_row = next(reader, None)
-                        if first_row and len(first_row) > 10:  # Mind. 10 Spalten erwarten
-                            # Reset und alle Daten laden
-                            csvfile.seek(0)
-                            reader = csv.DictReader(csvfile, delimiter=delimiter)
-                            
-                            for row in reader:
-                                # Whitespace entfernen
-                                cleaned_row = {key.strip(): value.strip() for key, value in row.items()}
-                                csv_data.append(cleaned_row)
-                            
-                            self.logger.info(f"✅ CSV erfolgreich mit Delimiter '{delimiter}' geladen: {csv_path}")
-                            break
-                            
-                except Exception:
-                    continue  # Nächsten Delimiter versuchen
-            
-            if not csv_data:
-                self.logger.error(f"❌ CSV konnte mit keinem Delimiter geladen werden: {csv_path}")
-            
-            return csv_data
+            duration = time.perf_counter() - started
+            rows_per_second = len(csv_store) / duration if duration > 0 else 0
+            self.logger.info(
+                f"✅ CSV eingelesen: {os.path.basename(csv_path)} "
+                f"({len(csv_store)} Datensätze, {duration:.2f}s, {rows_per_second:,.0f} Zeilen/s)"
+            )
+            return csv_store
             
         except Exception as e:
             self.logger.error(f"Fehler beim Laden der CSV-Datei {csv_path}: {e}")
-            return []
+            return ChargenEinkaufColumnStore()
     
     def clear_cache(self):
         """Leert den CSV-Cache (für Tests oder manuelle Aktualisierung)."""
-        self._csv_cache = {}
+        self._csv_index = CsvLieferscheinIndex()
+        self._csv_file_signatures = {}
         self.logger.info("CSV-Cache geleert")
\ No newline at end of file
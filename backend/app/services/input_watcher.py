@@ -0,0 +1,187 @@
+"""
+Ereignisbasierte Überwachung des Input-Verzeichnisses über Linux inotify.
+Neue PDFs werden nach Abschluss des Schreibvorgangs (close-write / moved-to) gemeldet,
+statt das Verzeichnis periodisch zu scannen.
+"""
+
+import asyncio
+import ctypes
+import ctypes.util
+import logging
+import os
+import struct
+from pathlib import Path
+from typing import Callable, Dict, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+# Konstanten aus <sys/inotify.h>
+IN_CLOSE_WRITE = 0x00000008
+IN_MOVED_TO = 0x00000080
+IN_Q_OVERFLOW = 0x00004000
+IN_IGNORED = 0x00008000
+IN_ISDIR = 0x40000000
+IN_NONBLOCK = 0o4000
+IN_CLOEXEC = 0o2000000
+
+_EVENT_HEADER = struct.Struct('iIII')  # wd, mask, cookie, len
+
+
+class InotifyUnavailableError(OSError):
+    """inotify ist auf dieser Plattform bzw. für dieses Verzeichnis nicht verfügbar."""
+
+
+class Inotify:
+    """Minimale ctypes-Anbindung an inotify (ein Verzeichnis, nicht-blockierend)."""
+
+    def __init__(self, directory: str, mask: int):
+        """
+        Args:
+            directory: Zu überwachendes Verzeichnis
+            mask: inotify-Ereignismaske (z.B. IN_CLOSE_WRITE | IN_MOVED_TO)
+
+        Raises:
+            InotifyUnavailableError: Wenn inotify nicht initialisiert werden kann
+        """
+        libc_name = ctypes.util.find_library('c') or 'libc.so.6'
+        try:
+            libc = ctypes.CDLL(libc_name, use_errno=True)
+            init1 = libc.inotify_init1
+            add_watch = libc.inotify_add_watch
+        except (OSError, AttributeError) as e:
+            raise InotifyUnavailableError(f"inotify nicht verfügbar: {e}")
+
+        self.fd = init1(IN_NONBLOCK | IN_CLOEXEC)
+        if self.fd < 0:
+            errno = ctypes.get_errno()
+            raise InotifyUnavailableError(errno, f"inotify_init1 fehlgeschlagen: {os.strerror(errno)}")
+
+        if add_watch(self.fd, os.fsencode(directory), mask) < 0:
+            errno = ctypes.get_errno()
+            os.close(self.fd)
+            raise InotifyUnavailableError(errno, f"inotify_add_watch fehlgeschlagen für {directory}: {os.strerror(errno)}")
+
+    def read_events(self) -> List[Tuple[int, str]]:
+        """Liest alle anstehenden Ereignisse als Liste von (mask, name)."""
+        events = []
+        while True:
+            try:
+                buffer = os.read(self.fd, 64 * 1024)
+            except BlockingIOError:
+                break
+
+            offset = 0
+            while offset + _EVENT_HEADER.size <= len(buffer):
+                _, mask, _, name_length = _EVENT_HEADER.unpack_from(buffer, offset)
+                offset += _EVENT_HEADER.size
+                raw_name = buffer[offset:offset + name_length].rstrip(b'\0')
+                offset += name_length
+                events.append((mask, os.fsdecode(raw_name)))
+
+        return events
+
+    def close(self):
+        os.close(self.fd)
+
+
+class InputDirectoryWatcher:
+    """
+    Meldet fertig geschriebene PDFs im Input-Verzeichnis an einen Callback.
+
+    Debounce: Nach jedem Ereignis wird debounce_seconds gewartet. Nur wenn sich Größe und
+    mtime in dieser Zeit nicht geändert haben, gilt die Datei als fertig (z.B. bei SMB-Kopien,
+    die eine Datei mehrfach öffnen und schreiben).
+    """
+
+    WATCH_MASK = IN_CLOSE_WRITE | IN_MOVED_TO
+
+    def __init__(
+        self,
+        directory: Path,
+        on_file_ready: Callable[[str], None],
+        on_overflow: Callable[[], None],
+        debounce_seconds: float = 2.0
+    ):
+        """
+        Args:
+            directory: Input-Verzeichnis
+            on_file_ready: Wird mit dem Dateinamen aufgerufen, sobald eine PDF fertig ist
+            on_overflow: Wird aufgerufen, wenn Ereignisse verloren gingen (Vollscan nötig)
+            debounce_seconds: Ruhezeit nach dem letzten Schreibzugriff
+        """
+        self.directory = str(directory)
+        self.on_file_ready = on_file_ready
+        self.on_overflow = on_overflow
+        self.debounce_seconds = debounce_seconds
+        self._inotify: Optional[Inotify] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._timers: Dict[str, asyncio.TimerHandle] = {}
+
+    def start(self):
+        """
+        Startet die Überwachung im laufenden Event-Loop.
+
+        Raises:
+            InotifyUnavailableError: Wenn inotify nicht genutzt werden kann
+        """
+        self._loop = asyncio.get_running_loop()
+        self._inotify = Inotify(self.directory, self.WATCH_MASK)
+        self._loop.add_reader(self._inotify.fd, self._on_readable)
+        logger.info(f"👀 inotify-Überwachung aktiv: {self.directory} (Debounce {self.debounce_seconds}s)")
+
+    def stop(self):
+        """Beendet die Überwachung und verwirft ausstehende Debounce-Timer."""
+        for handle in self._timers.values():
+            handle.cancel()
+        self._timers.clear()
+
+        if self._inotify:
+            self._loop.remove_reader(self._inotify.fd)
+            self._inotify.close()
+            self._inotify = None
+
+    @property
+    def pending_count(self) -> int:
+        """Anzahl Dateien, deren Debounce-Zeit noch läuft."""
+        return len(self._timers)
+
+    def _on_readable(self):
+        for mask, name in self._inotify.read_events():
+            if mask & IN_Q_OVERFLOW:
+                logger.warning("⚠️  inotify-Ereignispuffer übergelaufen, Vollscan angefordert")
+                self.on_overflow()
+                continue
+
+            if mask & (IN_ISDIR | IN_IGNORED) or not name.lower().endswith('.pdf'):
+                continue
+
+            self._schedule(name, self._stat(name))
+
+    def _schedule(self, name: str, signature: Optional[Tuple[int, int]]):
+        """(Neu-)Startet den Debounce-Timer einer Datei."""
+        handle = self._timers.pop(name, None)
+        if handle:
+            handle.cancel()
+        self._timers[name] = self._loop.call_later(self.debounce_seconds, self._check_stable, name, signature)
+
+    def _check_stable(self, name: str, previous: Optional[Tuple[int, int]]):
+        self._timers.pop(name, None)
+
+        current = self._stat(name)
+        if current is None:
+            return  # Inzwischen gelöscht oder verschoben
+
+        if current != previous:
+            # Datei wird noch geschrieben
+            self._schedule(name, current)
+            return
+
+        logger.debug(f"Neue Datei bereit: {name}")
+        self.on_file_ready(name)
+
+    def _stat(self, name: str) -> Optional[Tuple[int, int]]:
+        try:
+            stat = os.stat(os.path.join(self.directory, name))
+            return stat.st_size, stat.st_mtime_ns
+        except FileNotFoundError:
+            return None
@@ -0,0 +1,283 @@
+"""
+Prozessinterne Metriken im Prometheus-Textformat (ohne externe Abhängigkeit).
+Counter, Gauge und Histogram mit optionalen Labels; ausgeliefert über GET /metrics.
+"""
+
+import math
+import threading
+import time
+from abc import ABC, abstractmethod
+from contextlib import contextmanager
+from typing import Callable, Dict, Iterator, List, Optional, Sequence, Tuple
+
+# Standard-Buckets in Sekunden (von Millisekunden-DB-Zugriffen bis zu minutenlanger OCR)
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0, 120.0, 300.0, 600.0)
+
+LabelValues = Tuple[str, ...]
+
+
+def _format_value(value: float) -> str:
+    if value == math.inf:
+        return "+Inf"
+    if float(value).is_integer():
+        return str(int(value))
+    return repr(float(value))
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_labels(names: Sequence[str], values: Sequence[str]) -> str:
+    if not names:
+        return ""
+    return "{" + ",".join(f'{name}="{_escape(str(value))}"' for name, value in zip(names, values)) + "}"
+
+
+class _Metric(ABC):
+    """Basisklasse: Name, Hilfetext, Labels und threadsichere Werte je Label-Kombination."""
+
+    type_name = ""
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = ()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._lock = threading.Lock()
+
+    def _label_values(self, labels: Dict[str, str]) -> LabelValues:
+        if set(labels) != set(self.labelnames):
+            raise ValueError(f"{self.name}: Labels {sorted(labels)} passen nicht zu {list(self.labelnames)}")
+        return tuple(str(labels[name]) for name in self.labelnames)
+
+    def render(self) -> List[str]:
+        lines = [
+            f"# HELP {self.name} {self.documentation}",
+            f"# TYPE {self.name} {self.type_name}"
+        ]
+        lines.extend(self._samples())
+        return lines
+
+    @abstractmethod
+    def _samples(self) -> Iterator[str]:
+        """Sample-Zeilen der Metrik (ohne HELP/TYPE)."""
+        pass
+
+
+class Counter(_Metric):
+    """Monoton steigender Zähler."""
+
+    type_name = "counter"
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = ()):
+        super().__init__(name, documentation, labelnames)
+        self._values: Dict[LabelValues, float] = {} if labelnames else {(): 0.0}
+
+    def inc(self, amount: float = 1.0, **labels):
+        if amount < 0:
+            raise ValueError("Counter können nur erhöht werden")
+        key = self._label_values(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0.0) + amount
+
+    def _samples(self) -> Iterator[str]:
+        with self._lock:
+            values = sorted(self._values.items())
+        for key, value in values:
+            yield f"{self.name}{_format_labels(self.labelnames, key)} {_format_value(value)}"
+
+
+class Gauge(_Metric):
+    """Momentanwert; optional beim Abruf über eine Funktion ermittelt (z.B. Queue-Tiefe)."""
+
+    type_name = "gauge"
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = ()):
+        super().__init__(name, documentation, labelnames)
+        self._values: Dict[LabelValues, float] = {} if labelnames else {(): 0.0}
+        self._function: Optional[Callable[[], Dict[LabelValues, float]]] = None
+
+    def set(self, value: float, **labels):
+        key = self._label_values(labels)
+        with self._lock:
+            self._values[key] = value
+
+    def set_function(self, function: Callable[[], Dict[LabelValues, float]]):
+        """
+        Registriert eine Funktion, die beim Abruf die Werte liefert.
+
+        Args:
+            function: Gibt {Label-Werte-Tupel: Wert} zurück (ohne Labels: {(): Wert})
+        """
+        self._function = function
+
+    def _samples(self) -> Iterator[str]:
+        if self._function:
+            try:
+                values = sorted(self._function().items())
+            except Exception:
+                values = []
+        else:
+            with self._lock:
+                values = sorted(self._values.items())
+        for key, value in values:
+            yield f"{self.name}{_format_labels(self.labelnames, key)} {_format_value(value)}"
+
+
+class Histogram(_Metric):
+    """Verteilung von Messwerten in kumulativen Buckets plus Summe und Anzahl."""
+
+    type_name = "histogram"
+
+    def __init__(
+        self,
+        name: str,
+        documentation: str,
+        labelnames: Sequence[str] = (),
+        buckets: Sequence[float] = DEFAULT_BUCKETS
+    ):
+        super().__init__(name, documentation, labelnames)
+        self.buckets = tuple(sorted(buckets)) + (math.inf,)
+        self._values: Dict[LabelValues, List[float]] = {}  # Bucket-Zähler..., Summe, Anzahl
+        if not labelnames:
+            self._values[()] = [0.0] * (len(self.buckets) + 2)
+
+    def observe(self, value: float, **labels):
+        key = self._label_values(labels)
+        with self._lock:
+            data = self._values.get(key)
+            if data is None:
+                data = self._values[key] = [0.0] * (len(self.buckets) + 2)
+            for index, bound in enumerate(self.buckets):
+                if value <= bound:
+                    data[index] += 1
+                    break
+            data[-2] += value
+            data[-1] += 1
+
+    @contextmanager
+    def time(self, **labels):
+        """Misst die Dauer des with-Blocks in Sekunden."""
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(time.perf_counter() - started, **labels)
+
+    def _samples(self) -> Iterator[str]:
+        with self._lock:
+            values = sorted((key, list(data)) for key, data in self._values.items())
+        for key, data in values:
+            cumulative = 0.0
+            for bound, count in zip(self.buckets, data):
+                cumulative += count
+                labels = _format_labels(self.labelnames + ("le",), key + (_format_value(bound),))
+                yield f"{self.name}_bucket{labels} {_format_value(cumulative)}"
+            labels = _format_labels(self.labelnames, key)
+            yield f"{self.name}_sum{labels} {_format_value(data[-2])}"
+            yield f"{self.name}_count{labels} {_format_value(data[-1])}"
+
+
+class MetricsRegistry:
+    """Sammelt alle Metriken und erzeugt die Textausgabe."""
+
+    def __init__(self):
+        self._metrics: Dict[str, _Metric] = {}
+
+    def register(self, metric: _Metric) -> _Metric:
+        if metric.name in self._metrics:
+            raise ValueError(f"Metrik bereits registriert: {metric.name}")
+        self._metrics[metric.name] = metric
+        return metric
+
+    def counter(self, name: str, documentation: str, labelnames: Sequence[str] = ()) -> Counter:
+        return self.register(Counter(name, documentation, labelnames))
+
+    def gauge(self, name: str, documentation: str, labelnames: Sequence[str] = ()) -> Gauge:
+        return self.register(Gauge(name, documentation, labelnames))
+
+    def histogram(
+        self,
+        name: str,
+        documentation: str,
+        labelnames: Sequence[str] = (),
+        buckets: Sequence[float] = DEFAULT_BUCKETS
+    ) -> Histogram:
+        return self.register(Histogram(name, documentation, labelnames, buckets))
+
+    def render(self) -> str:
+        """Alle Metriken im Prometheus-Textformat (Version 0.0.4)."""
+        lines = []
+        for metric in self._metrics.values():
+            lines.extend(metric.render())
+        return "\n".join(lines) + "\n"
+
+
+# Content-Type des Prometheus-Textformats
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+# Globale Registry und die Metriken der Verarbeitung
+registry = MetricsRegistry()
+
+DOCUMENTS_PROCESSED = registry.counter(
+    "docs_documents_processed_total",
+    "Dokumente mit endgültigem Ergebnis (erledigt oder dead_letter)",
+    ["result"]
+)
+STAGE_FAILURES = registry.counter(
+    "docs_processing_stage_failures_total",
+    "Fehlgeschlagene Versuche einer Verarbeitungsstufe (inkl. später wiederholter)",
+    ["stage"]
+)
+PAGES_PROCESSED = registry.counter(
+    "docs_ocr_pages_processed_total",
+    "Von OCR-Jobs erfolgreich verarbeitete Seiten"
+)
+OCR_DURATION = registry.histogram(
+    "docs_ocr_duration_seconds",
+    "Dauer eines OCR-Jobs pro Datei",
+    ["result"]
+)
+BLANK_PAGES_REMOVED = registry.counter(
+    "docs_blank_pages_removed_total",
+    "Entfernte Leerseiten"
+)
+CSV_ROWS_MATCHED = registry.counter(
+    "docs_csv_rows_matched_total",
+    "ERP-CSV-Zeilen, die einem Lieferschein zugeordnet wurden"
+)
+SMB_BYTES_DOWNLOADED = registry.counter(
+    "docs_smb_bytes_downloaded_total",
+    "Vom SMB-Server heruntergeladene Bytes"
+)
+DB_SESSION_DURATION = registry.histogram(
+    "docs_db_session_duration_seconds",
+    "Dauer von get_db_session()-Blöcken inkl. Commit/Rollback",
+    ["result"]
+)
+STEP_DURATION = registry.histogram(
+    "docs_processing_step_duration_seconds",
+    "Dauer der einzelnen Verarbeitungsschritte (Zeitleiste)",
+    ["step"]
+)
+PIPELINE_QUEUE_DEPTH = registry.gauge(
+    "docs_pipeline_queue_depth",
+    "Wartende Dateien vor jeder Pipeline-Stufe bzw. im OCR-Worker-Pool",
+    ["stage"]
+)
+DB_POOL_CHECKOUT_WAIT = registry.histogram(
+    "docs_db_pool_checkout_wait_seconds",
+    "Wartezeit auf eine freie Verbindung aus dem Connection-Pool",
+    ["engine"],
+    buckets=(0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+)
+DB_POOL_CHECKOUT_TIMEOUTS = registry.counter(
+    "docs_db_pool_checkout_timeouts_total",
+    "Checkouts, die nach DB_POOL_TIMEOUT ohne Verbindung abgebrochen wurden",
+    ["engine"]
+)
+DB_POOL_CONNECTIONS = registry.gauge(
+    "docs_db_pool_connections",
+    "Verbindungen je Pool: in_use (ausgeliehen), idle (frei im Pool), limit (pool_size + max_overflow)",
+    ["engine", "state"]
+)
@@ -0,0 +1,159 @@
+"""
+Inhaltsadressierter Cache für OCR-Ergebnisse.
+Identische PDFs (z.B. Upload + SMB-Sync derselben Scans) werden nur einmal mit OCR verarbeitet.
+"""
+
+import hashlib
+import logging
+import os
+import shutil
+import tempfile
+from pathlib import Path
+
+from ..config.settings import OCR_CACHE_DIR, OCR_CACHE_MAX_BYTES
+
+logger = logging.getLogger(__name__)
+
+
+class OCRResultCache:
+    """
+    Cache für durchsuchbare PDFs.
+
+    Schlüssel ist der SHA-256 der Eingabedatei, pro Eintrag wird <hash>.pdf abgelegt. Der Text
+    wird nicht mitgecacht: Nach der OCR entfernt die Pipeline noch Leerseiten, der Text wird
+    daher immer aus der endgültigen Datei gelesen (siehe pdf_analysis).
+    Die Größe ist begrenzt; verdrängt wird nach LRU (mtime wird bei Treffern aktualisiert).
+    """
+
+    def __init__(self, cache_dir: Path, max_bytes: int):
+        """
+        Args:
+            cache_dir: Verzeichnis für die Cache-Dateien
+            max_bytes: Maximale Gesamtgröße des Caches in Bytes
+        """
+        self.cache_dir = Path(cache_dir)
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def compute_hash(file_path: str) -> str:
+        """Berechnet den SHA-256 einer Datei blockweise."""
+        sha256 = hashlib.sha256()
+        with open(file_path, 'rb') as f:
+            for chunk in iter(lambda: f.read(1024 * 1024), b''):
+                sha256.update(chunk)
+        return sha256.hexdigest()
+
+    def fetch(self, content_hash: str, output_pdf_path: str) -> bool:
+        """
+        Kopiert die gecachte durchsuchbare PDF nach output_pdf_path.
+
+        Returns:
+            True bei Cache-Treffer, False sonst
+        """
+        cached_pdf = self._pdf_path(content_hash)
+
+        try:
+            shutil.copyfile(cached_pdf, output_pdf_path)
+        except FileNotFoundError:
+            self.misses += 1
+            return False
+        except Exception as e:
+            logger.warning(f"OCR-Cache-Eintrag nicht lesbar ({content_hash[:12]}): {e}")
+            self.misses += 1
+            return False
+
+        # Zugriff für LRU vermerken
+        self._touch(content_hash)
+        self.hits += 1
+        return True
+
+    def store(self, content_hash: str, searchable_pdf_path: str):
+        """Legt eine durchsuchbare PDF im Cache ab."""
+        try:
+            self.cache_dir.mkdir(parents=True, exist_ok=True)
+
+            # Atomar schreiben: erst temporäre Datei, dann umbenennen
+            self._atomic_copy(searchable_pdf_path, self._pdf_path(content_hash))
+
+            logger.debug(f"OCR-Ergebnis gecacht: {content_hash[:12]}")
+            self._evict()
+
+        except Exception as e:
+            logger.warning(f"OCR-Ergebnis konnte nicht gecacht werden: {e}")
+
+    def get_stats(self) -> dict:
+        """
+        Gibt die Belegung des Caches auf der Platte zurück (blockierend, liest das Verzeichnis).
+
+        Trefferzähler sind prozesslokal und werden über OCRService.get_counters an den
+        OCR-Pool gemeldet (cache_hits/cache_misses in dessen Statistik).
+        """
+        entries = self._scan_entries()
+        return {
+            "entries": len(entries),
+            "bytes": sum(entry[2] for entry in entries),
+            "max_bytes": self.max_bytes
+        }
+
+    def _evict(self):
+        """Entfernt die am längsten nicht genutzten Einträge, bis das Größenlimit passt."""
+        entries = sorted(self._scan_entries(), key=lambda entry: entry[1])
+        total_bytes = sum(entry[2] for entry in entries)
+
+        removed = 0
+        for content_hash, _, size in entries:
+            if total_bytes <= self.max_bytes:
+                break
+            try:
+                os.remove(self._pdf_path(content_hash))
+            except FileNotFoundError:
+                pass  # Parallel von anderem Prozess entfernt
+            total_bytes -= size
+            removed += 1
+
+        if removed:
+            logger.info(f"🧹 OCR-Cache: {removed} Einträge verdrängt ({total_bytes / 1024 ** 2:.1f} MB belegt)")
+
+    def _scan_entries(self) -> list:
+        """Liefert (hash, mtime, Größe) für alle Cache-Einträge."""
+        entries = []
+        try:
+            with os.scandir(self.cache_dir) as it:
+                for dir_entry in it:
+                    if not dir_entry.name.endswith('.pdf'):
+                        continue
+                    content_hash = dir_entry.name[:-4]
+                    try:
+                        stat = dir_entry.stat()
+                        entries.append((content_hash, stat.st_mtime, stat.st_size))
+                    except FileNotFoundError:
+                        continue
+        except FileNotFoundError:
+            pass
+        return entries
+
+    def _touch(self, content_hash: str):
+        """Aktualisiert die mtime eines Eintrags (LRU)."""
+        try:
+            os.utime(self._pdf_path(content_hash))
+        except OSError:
+            pass
+
+    def _pdf_path(self, content_hash: str) -> Path:
+        return self.cache_dir / f"{content_hash}.pdf"
+
+    def _atomic_copy(self, source: str, target: Path):
+        fd, temp_path = tempfile.mkstemp(dir=self.cache_dir, suffix='.tmp')
+        os.close(fd)
+        try:
+            shutil.copyfile(source, temp_path)
+            os.replace(temp_path, target)
+        finally:
+            if os.path.exists(temp_path):
+                os.remove(temp_path)
+
+
+# Globale Cache-Instanz (pro Prozess, Daten liegen gemeinsam auf der Platte)
+ocr_result_cache = OCRResultCache(OCR_CACHE_DIR, OCR_CACHE_MAX_BYTES)
@@ -7,31 +7,428 @@ import asyncio
 import logging
 import os
 import shutil
+import signal
 import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from datetime import datetime
 from pathlib import Path
-from typing import Set
+from typing import Callable, Dict, List, Optional, Set, Tuple
 
-from ..config.settings import PDF_INPUT_DIR
+from ..config.settings import (
+    OCR_JOB_TIMEOUT,
+    OCR_QUEUE_SIZE,
+    OCR_WATCH_DEBOUNCE_SECONDS,
+    OCR_WATCH_MODE,
+    OCR_WATCH_RESCAN_INTERVAL,
+    OCR_WORKER_COUNT,
+    PDF_INPUT_DIR,
+    PIPELINE_CLASSIFY_CONCURRENCY,
+    PIPELINE_CLEANUP_CONCURRENCY,
+    PIPELINE_DB_CONCURRENCY,
+    PIPELINE_OCR_CONCURRENCY,
+    PIPELINE_QUEUE_SIZE,
+)
 
 # GEÄNDERT: Verwende Repository statt alte Models
 from ..repositories.dokument_repository import DokumentRepository
+from ..repositories.dokument_seite_repository import DokumentSeiteRepository
+from ..repositories.verarbeitungsstatus_repository import (
+    STATUS_DEAD_LETTER,
+    STATUS_ERLEDIGT,
+    STATUS_FEHLGESCHLAGEN,
+    STUFE_DOCUMENT_PROCESSING,
+    STUFE_OCR,
+    VerarbeitungsstatusRepository,
+)
+from ..services.blank_page_detector import blank_page_detector
+from ..services.document_path_resolver import document_path_resolver
+from ..services.input_watcher import InotifyUnavailableError, InputDirectoryWatcher
+from ..services.metrics import (
+    BLANK_PAGES_REMOVED,
+    DOCUMENTS_PROCESSED,
+    OCR_DURATION,
+    PAGES_PROCESSED,
+    PIPELINE_QUEUE_DEPTH,
+    STAGE_FAILURES,
+)
+from ..services.ocr_cache import OCRResultCache
 from ..services.ocr_service import OCRService
+from ..services.pdf_analysis import get_pdf_analysis
+from ..services.processing_pipeline import PipelineJob, PipelineStage, ProcessingPipeline
+from ..services.processing_timeline import processing_timeline
+from ..services.retry_policy import retry_policy
 
 logger = logging.getLogger(__name__)
 
+
+# Zeit, die ein Worker-Prozess nach Ablauf des Job-Timeouts hat, um sich selbst zu beenden
+OCR_KILL_GRACE_SECONDS = 30
+
+
+class OCRJobTimeout(BaseException):
+    """
+    Job-Timeout im Worker-Prozess (SIGALRM).
+    
+    Erbt von BaseException, damit die Fallbacks im OCRService (Kopieren ohne OCR) ihn nicht abfangen.
+    """
+
+
+def _raise_job_timeout(signum, frame):
+    raise OCRJobTimeout()
+
+
+def _init_ocr_worker():
+    """
+    Initializer der Worker-Prozesse: eigene Prozessgruppe, damit beim Abbruch
+    eines Jobs auch die Kindprozesse (Tesseract, Ghostscript) beendet werden.
+    """
+    os.setpgrp()
+
+
+def _run_ocr_job(file_path: str, timeout: Optional[int] = None) -> dict:
+    """
+    OCR-Job für den Worker-Prozess: Erstellt die durchsuchbare PDF und ersetzt das Original.
+    
+    Muss auf Modulebene liegen, damit der ProcessPoolExecutor sie picklen kann.
+    
+    Args:
+        file_path: Zu verarbeitende PDF
+        timeout: Job-Timeout in Sekunden; danach bricht der Prozess den Job selbst ab (SIGALRM)
+    
+    Returns:
+        Dictionary mit success, pages, duration, timed_out und counters (Zähler-Differenzen des Jobs)
+    """
+    started = time.perf_counter()
+    success = False
+    timed_out = False
+    pages = 0
+    counters_before = OCRService.get_counters()
+    
+    if timeout:
+        signal.signal(signal.SIGALRM, _raise_job_timeout)
+        signal.alarm(timeout)
+    
+    try:
+        # Temporäre Datei für OCR-Output
+        with tempfile.NamedTemporaryFile(suffix='.pdf', delete=False) as temp_file:
+            temp_path = temp_file.name
+        
+        try:
+            success = OCRService.create_searchable_pdf(file_path, temp_path)
+            
+            # Ab hier kein Abbruch mehr, das Original wird nur vollständig ersetzt
+            signal.alarm(0)
+            
+            if success:
+                # Original durch OCR-Version ersetzen
+                shutil.move(temp_path, file_path)
+                pages = _count_pages(file_path)
+        finally:
+            # Temporäre Datei aufräumen
+            if os.path.exists(temp_path):
+                os.remove(temp_path)
+    
+    except OCRJobTimeout:
+        logger.error(f"⏱️  OCR-Job nach {timeout}s abgebrochen: {file_path}")
+        success = False
+        timed_out = True
+                
+    except Exception as e:
+        logger.error(f"Fehler beim OCR-Job für {file_path}: {e}")
+        success = False
+    
+    finally:
+        signal.alarm(0)
+    
+    # OCRService-Zähler sind prozesslokal, daher die Differenz an den Pool zurückmelden
+    counters = {
+        key: value - counters_before.get(key, 0)
+        for key, value in OCRService.get_counters().items()
+    }
+    
+    return {
+        "success": success,
+        "pages": pages,
+        "duration": time.perf_counter() - started,
+        "timed_out": timed_out,
+        "counters": counters
+    }
+
+
+def _count_pages(pdf_path: str) -> int:
+    """Ermittelt die Seitenzahl einer PDF (0 bei Fehler)."""
+    try:
+        import fitz
+        
+        with fitz.open(pdf_path) as doc:
+            return len(doc)
+    except Exception:
+        return 0
+
+
+class OCRWorkerPool:
+    """
+    Prozess-Pool für parallele OCR-Verarbeitung.
+    
+    Jobs landen in einer begrenzten Queue (Backpressure bei vollen Queues) und werden
+    von asyncio-Workern ausgeführt. Jeder Worker hat einen eigenen Prozess (ProcessPoolExecutor
+    mit einem Prozess), der bei einem Timeout samt Kindprozessen beendet und ersetzt wird -
+    ohne die Jobs der anderen Worker abzubrechen.
+    """
+    
+    def __init__(self, worker_count: int = 2, queue_size: int = 50, job_timeout: int = 600):
+        """
+        Args:
+            worker_count: Anzahl paralleler OCR-Prozesse
+            queue_size: Maximale Anzahl wartender Jobs
+            job_timeout: Timeout pro Job in Sekunden
+        """
+        self.worker_count = max(1, worker_count)
+        self.queue_size = max(1, queue_size)
+        self.job_timeout = job_timeout
+        self.running = False
+        
+        self._executors: List[ProcessPoolExecutor] = []
+        self._queue: Optional[asyncio.Queue] = None
+        self._workers: List[asyncio.Task] = []
+        
+        # Statistiken für Durchsatz-Messung
+        self._active_jobs = 0
+        self._active_since = 0.0
+        self._active_seconds = 0.0
+        self.stats = {
+            "jobs_completed": 0,
+            "jobs_failed": 0,
+            "jobs_timed_out": 0,
+            "pages_processed": 0,
+            "ocr_seconds": 0.0
+        }
+        # Aus den Worker-Prozessen aggregierte OCRService-Zähler (Cache, Text-Layer)
+        self.ocr_counters: Dict[str, int] = {}
+    
+    async def start(self):
+        """Startet Prozess-Pool und Worker-Tasks."""
+        if self.running:
+            return
+        
+        self._executors = [self._new_executor() for _ in range(self.worker_count)]
+        self._queue = asyncio.Queue(maxsize=self.queue_size)
+        self._workers = [
+            asyncio.create_task(self._worker(index)) for index in range(self.worker_count)
+        ]
+        self.running = True
+        
+        logger.info(
+            f"OCR-Worker-Pool gestartet - Worker: {self.worker_count}, "
+            f"Queue: {self.queue_size}, Timeout: {self.job_timeout}s"
+        )
+    
+    async def stop(self):
+        """Stoppt Worker-Tasks und fährt den Prozess-Pool herunter."""
+        if not self.running:
+            return
+        
+        self.running = False
+        
+        for worker in self._workers:
+            worker.cancel()
+        await asyncio.gather(*self._workers, return_exceptions=True)
+        self._workers = []
+        
+        # Laufende Jobs beenden statt sie verwaist weiterlaufen zu lassen
+        for index in range(len(self._executors)):
+            self._kill_executor(index)
+        self._executors = []
+        
+        logger.info("OCR-Worker-Pool gestoppt")
+    
+    async def submit(self, file_path: str) -> dict:
+        """
+        Reiht einen OCR-Job ein und wartet auf das Ergebnis.
+        
+        Blockiert (asynchron), solange die Queue voll ist.
+        
+        Returns:
+            Job-Ergebnis (success, pages, duration, timed_out)
+        """
+        if not self.running:
+            raise RuntimeError("OCR-Worker-Pool läuft nicht")
+        
+        future = asyncio.get_running_loop().create_future()
+        await self._queue.put((file_path, future))
+        return await future
+    
+    async def _worker(self, index: int):
+        """Worker-Task: Holt Jobs aus der Queue und führt sie im eigenen Worker-Prozess aus."""
+        loop = asyncio.get_running_loop()
+        
+        while True:
+            file_path, future = await self._queue.get()
+            self._job_started()
+            
+            try:
+                # Der Prozess bricht nach job_timeout selbst ab; die Karenzzeit greift nur, wenn er hängt
+                result = await asyncio.wait_for(
+                    loop.run_in_executor(self._executors[index], _run_ocr_job, file_path, self.job_timeout),
+                    timeout=self.job_timeout + OCR_KILL_GRACE_SECONDS
+                )
+                
+            except asyncio.TimeoutError:
+                logger.error(
+                    f"⏱️  OCR-Timeout nach {self.job_timeout}s: {os.path.basename(file_path)} "
+                    f"- beende Worker-Prozess {index}"
+                )
+                self._kill_executor(index)
+                self._executors[index] = self._new_executor()
+                result = {"success": False, "pages": 0, "duration": float(self.job_timeout), "timed_out": True}
+                
+            except BrokenProcessPool as e:
+                logger.error(f"OCR-Worker-Prozess {index} defekt, wird neu gestartet: {e}")
+                self._kill_executor(index)
+                self._executors[index] = self._new_executor()
+                result = {"success": False, "pages": 0, "duration": 0.0, "timed_out": False}
+                
+            except asyncio.CancelledError:
+                if not future.done():
+                    future.cancel()
+                self._active_jobs -= 1
+                self._queue.task_done()
+                raise
+                
+            except Exception as e:
+                logger.error(f"Fehler im OCR-Worker {index}: {e}")
+                result = {"success": False, "pages": 0, "duration": 0.0, "timed_out": False}
+            
+            self._job_finished(result)
+            self._queue.task_done()
+            
+            if not future.done():
+                future.set_result(result)
+    
+    @staticmethod
+    def _new_executor() -> ProcessPoolExecutor:
+        """Erstellt den Prozess eines Workers (eigene Prozessgruppe, siehe _init_ocr_worker)."""
+        return ProcessPoolExecutor(max_workers=1, initializer=_init_ocr_worker)
+    
+    def _kill_executor(self, index: int):
+        """Beendet den Prozess eines Workers inkl. Kindprozessen und fährt seinen Executor herunter."""
+        executor = self._executors[index]
+        
+        # ProcessPoolExecutor bietet kein öffentliches API, um laufende Jobs abzubrechen
+        for process in list((executor._processes or {}).values()):
+            try:
+                os.killpg(process.pid, signal.SIGKILL)
+            except (ProcessLookupError, PermissionError):
+                process.kill()
+        
+        executor.shutdown(wait=False, cancel_futures=True)
+    
+    def _job_started(self):
+        """Aktualisiert die Aktiv-Zeit für die Durchsatz-Berechnung."""
+        if self._active_jobs == 0:
+            self._active_since = time.perf_counter()
+        self._active_jobs += 1
+    
+    def _job_finished(self, result: dict):
+        """Verbucht ein Job-Ergebnis in den Statistiken."""
+        self._active_jobs -= 1
+        if self._active_jobs == 0:
+            self._active_seconds += time.perf_counter() - self._active_since
+        
+        if result.get("timed_out"):
+            self.stats["jobs_timed_out"] += 1
+            OCR_DURATION.observe(result["duration"], result="timeout")
+        else:
+            OCR_DURATION.observe(result["duration"], result="success" if result["success"] else "failed")
+        for key, value in result.get("counters", {}).items():
+            self.ocr_counters[key] = self.ocr_counters.get(key, 0) + value
+        if result["success"]:
+            self.stats["jobs_completed"] += 1
+            self.stats["pages_processed"] += result["pages"]
+            PAGES_PROCESSED.inc(result["pages"])
+        else:
+            self.stats["jobs_failed"] += 1
+        self.stats["ocr_seconds"] += result["duration"]
+    
+    def get_stats(self) -> dict:
+        """Gibt Pool-Statistiken inkl. Seiten/s über die aktive Laufzeit zurück."""
+        active_seconds = self._active_seconds
+        if self._active_jobs > 0:
+            active_seconds += time.perf_counter() - self._active_since
+        
+        pages_per_second = self.stats["pages_processed"] / active_seconds if active_seconds > 0 else 0.0
+        
+        # Eingesparte Tesseract-Zeit: übersprungene Seiten x mittlere OCR-Dauer pro Seite
+        ocr_pages = self.ocr_counters.get("ocr_pages", 0)
+        seconds_per_page = self.stats["ocr_seconds"] / ocr_pages if ocr_pages else 0.0
+        tesseract_seconds_saved = self.ocr_counters.get("text_layer_skipped_pages", 0) * seconds_per_page
+        
+        return {
+            "running": self.running,
+            "workers": self.worker_count,
+            "queue_size": self.queue_size,
+            "queue_depth": self._queue.qsize() if self._queue else 0,
+            "active_jobs": self._active_jobs,
+            **self.stats,
+            **self.ocr_counters,
+            "active_seconds": round(active_seconds, 2),
+            "pages_per_second": round(pages_per_second, 3),
+            "estimated_tesseract_seconds_saved": round(tesseract_seconds_saved, 1)
+        }
+
+
 class OCRScheduler:
     """Background-Service für periodische OCR-Verarbeitung mit Document Processing."""
     
     def __init__(self, check_interval: int = 30):
         """
         Args:
-            check_interval: Prüfintervall in Sekunden (Standard: 30s)
+            check_interval: Prüfintervall in Sekunden im Polling-Modus (Standard: 30s)
         """
         self.check_interval = check_interval
         self.running = False
         self.processed_files: Set[str] = set()
         self._task = None
         self._document_processor_manager = None
+        
+        # Ereignisbasierte Überwachung (inotify) mit Polling als Fallback
+        self.watch_mode = "polling"
+        self._watcher: Optional[InputDirectoryWatcher] = None
+        self._wakeup = asyncio.Event()
+        self._pending_files: Set[str] = set()
+        self._full_scan_requested = True
+        self.ocr_pool = OCRWorkerPool(
+            worker_count=OCR_WORKER_COUNT,
+            queue_size=OCR_QUEUE_SIZE,
+            job_timeout=OCR_JOB_TIMEOUT
+        )
+        
+        # Gestufte Pipeline: Klassifizierung von Datei N läuft parallel zur OCR von Datei N+1
+        self.pipeline = ProcessingPipeline(
+            [
+                PipelineStage(
+                    "ocr",
+                    self._timed("ocr", self._stage_ocr, lambda job: self._ocr_done(job.context["status"])),
+                    PIPELINE_OCR_CONCURRENCY, PIPELINE_QUEUE_SIZE
+                ),
+                PipelineStage("cleanup", self._timed("cleanup", self._stage_cleanup), PIPELINE_CLEANUP_CONCURRENCY, PIPELINE_QUEUE_SIZE),
+                PipelineStage(
+                    "database",
+                    self._timed("database", self._stage_database, lambda job: job.context["in_database"]),
+                    PIPELINE_DB_CONCURRENCY, PIPELINE_QUEUE_SIZE
+                ),
+                PipelineStage(
+                    "classify",
+                    self._timed("classify", self._stage_classify, lambda job: self._doc_processing_done(job.context["status"])),
+                    PIPELINE_CLASSIFY_CONCURRENCY, PIPELINE_QUEUE_SIZE
+                ),
+            ],
+            on_job_failed=self._on_job_failed,
+            on_job_done=lambda job: processing_timeline.finish(job.filename)
+        )
+        PIPELINE_QUEUE_DEPTH.set_function(self._queue_depths)
     
     async def start(self):
         """Startet den Background-Scheduler."""
@@ -40,13 +437,26 @@ class OCRScheduler:
             return
         
         self.running = True
-        logger.info(f"OCR-Scheduler gestartet - Prüfintervall: {self.check_interval}s")
         
         # Document Processing System initialisieren
         await self._init_document_processing()
         
+        # Alte Markerdateien einmalig in die Status-Tabelle übernehmen
+        await asyncio.to_thread(self._migrate_marker_files)
+        
         # Initial bereits verarbeitete Dateien laden
-        self._load_processed_files()
+        await asyncio.to_thread(self._load_processed_files)
+        
+        # OCR-Worker-Pool starten
+        await self.ocr_pool.start()
+        self.pipeline.start()
+        
+        # Input-Überwachung starten (erster Durchlauf ist immer ein Vollscan)
+        self._start_watcher()
+        if self._watcher:
+            logger.info(f"OCR-Scheduler gestartet - inotify-Modus, Sicherheits-Scan alle {OCR_WATCH_RESCAN_INTERVAL}s")
+        else:
+            logger.info(f"OCR-Scheduler gestartet - Polling-Modus, Prüfintervall: {self.check_interval}s")
         
         # Background-Task starten
         self._task = asyncio.create_task(self._background_loop())
@@ -65,8 +475,57 @@ class OCRScheduler:
             except asyncio.CancelledError:
                 pass
         
+        if self._watcher:
+            self._watcher.stop()
+            self._watcher = None
+        
+        await self.pipeline.stop()
+        await self.ocr_pool.stop()
+        await asyncio.to_thread(processing_timeline.flush)
+        
         logger.info("OCR-Scheduler gestoppt")
     
+    def _queue_depths(self) -> Dict[tuple, int]:
+        """Queue-Tiefen für die Metrik docs_pipeline_queue_depth (je Stufe und OCR-Worker-Pool)."""
+        depths = {(stage.name,): stage.queue_depth for stage in self.pipeline.stages}
+        depths[("ocr_pool",)] = self.ocr_pool.get_stats()["queue_depth"]
+        return depths
+    
+    def _start_watcher(self):
+        """Startet die inotify-Überwachung gemäß OCR_WATCH_MODE, sonst bleibt Polling aktiv."""
+        if OCR_WATCH_MODE == "polling":
+            self.watch_mode = "polling"
+            return
+        
+        watcher = InputDirectoryWatcher(
+            PDF_INPUT_DIR,
+            on_file_ready=self._on_file_ready,
+            on_overflow=self._request_full_scan,
+            debounce_seconds=OCR_WATCH_DEBOUNCE_SECONDS
+        )
+        try:
+            watcher.start()
+            self._watcher = watcher
+            self.watch_mode = "inotify"
+        except InotifyUnavailableError as e:
+            if OCR_WATCH_MODE == "inotify":
+                logger.error(f"❌ inotify-Modus angefordert, aber nicht verfügbar: {e}")
+            else:
+                logger.info(f"inotify nicht verfügbar, verwende Polling: {e}")
+            self.watch_mode = "polling"
+    
+    def _on_file_ready(self, filename: str):
+        """Callback des Watchers: Datei ist fertig geschrieben und wird eingeplant."""
+        # Neu geschrieben - auch eine bereits verarbeitete Datei erneut prüfen (wiederverwendeter Name)
+        self.processed_files.discard(filename)
+        self._pending_files.add(filename)
+        self._wakeup.set()
+    
+    def _request_full_scan(self):
+        """Fordert einen vollständigen Scan des Input-Verzeichnisses an."""
+        self._full_scan_requested = True
+        self._wakeup.set()
+    
     async def _init_document_processing(self):
         """Initialisiert das Document Processing System."""
         try:
@@ -85,30 +544,146 @@ class OCRScheduler:
             logger.error(f"Fehler beim Initialisieren des Document Processing: {e}")
             self._document_processor_manager = None
     
+    def _migrate_marker_files(self):
+        """
+        Übernimmt vorhandene .ocr_processed/.doc_processed-Marker in die Tabelle verarbeitungsstatus
+        und entfernt die Markerdateien danach. Ohne Marker (nach der ersten Migration) ein No-Op.
+        """
+        marker_stages = {'.ocr_processed': STUFE_OCR, '.doc_processed': STUFE_DOCUMENT_PROCESSING}
+        
+        try:
+            entries = []
+            marker_paths = []
+            with os.scandir(PDF_INPUT_DIR) as it:
+                for entry in it:
+                    for suffix, stufe in marker_stages.items():
+                        if not entry.name.endswith(suffix):
+                            continue
+                        try:
+                            with open(entry.path, 'r', errors='ignore') as marker:
+                                content = marker.read(500)
+                        except OSError:
+                            content = ""
+                        
+                        entries.append({
+                            'dateiname': entry.name[:-len(suffix)],
+                            'stufe': stufe,
+                            'status': STATUS_FEHLGESCHLAGEN if 'failed' in content else STATUS_ERLEDIGT,
+                            'meldung': content or None
+                        })
+                        marker_paths.append(entry.path)
+            
+            if not entries:
+                return
+            
+            imported = VerarbeitungsstatusRepository.import_entries(entries)
+            
+            for marker_path in marker_paths:
+                try:
+                    os.remove(marker_path)
+                except OSError:
+                    pass
+            
+            logger.info(f"📦 {len(marker_paths)} Markerdateien migriert ({imported} neue Status-Einträge)")
+            
+        except Exception as e:
+            logger.error(f"Fehler bei der Migration der Markerdateien: {e}")
+    
     def _load_processed_files(self):
-        """Lädt bereits verarbeitete Dateien beim Start."""
+        """Lädt bereits verarbeitete Dateien beim Start (eine Status-Abfrage statt Marker-Checks)."""
         try:
-            for filename in os.listdir(PDF_INPUT_DIR):
-                if filename.lower().endswith('.pdf'):
-                    file_path = os.path.join(PDF_INPUT_DIR, filename)
-                    ocr_marker = file_path + '.ocr_processed'
-                    doc_marker = file_path + '.doc_processed'
-                    
-                    # Als verarbeitet markieren wenn beide Marker vorhanden sind
-                    if os.path.exists(ocr_marker) and os.path.exists(doc_marker):
-                        self.processed_files.add(filename)
+            filenames = [f for f in os.listdir(PDF_INPUT_DIR) if f.lower().endswith('.pdf')]
+            status_map = VerarbeitungsstatusRepository.get_status_map(filenames)
+            self._discard_outdated_status(status_map)
+            
+            for filename in filenames:
+                # Als verarbeitet markieren wenn OCR und Document Processing abgeschlossen sind
+                status = status_map.get(filename, {})
+                if self._ocr_done(status) and self._doc_processing_done(status):
+                    self.processed_files.add(filename)
             
             logger.info(f"Bereits vollständig verarbeitete Dateien geladen: {len(self.processed_files)}")
             
         except Exception as e:
             logger.error(f"Fehler beim Laden verarbeiteter Dateien: {e}")
     
+    @staticmethod
+    def _ocr_done(status: Dict[str, str]) -> bool:
+        """OCR gilt nur bei Erfolg als erledigt (Fehlschläge werden per Backoff erneut versucht)."""
+        return status.get(STUFE_OCR) == STATUS_ERLEDIGT
+    
+    @staticmethod
+    def _doc_processing_done(status: Dict[str, str]) -> bool:
+        """Document Processing ist erledigt oder nach erschöpften Versuchen im Dead-Letter-Status."""
+        return status.get(STUFE_DOCUMENT_PROCESSING) in (STATUS_ERLEDIGT, STATUS_DEAD_LETTER)
+    
+    async def _mark_stage(self, filename: str, stufe: str, status: str, meldung: Optional[str] = None, dokument_hash: Optional[str] = None):
+        """Schreibt den Status einer Stufe (DB-Zugriff im Thread)."""
+        await asyncio.to_thread(
+            VerarbeitungsstatusRepository.mark, filename, stufe, status, dokument_hash=dokument_hash, meldung=meldung
+        )
+    
+    def _discard_outdated_status(self, status_map: Dict[str, Dict[str, str]]):
+        """
+        Verwirft den Status von Dateien, deren Name für eine neue Datei wiederverwendet wurde
+        (z.B. Scanner-Dateinamen mit Zähler), damit sie erneut verarbeitet werden.
+        
+        Verglichen wird der beim Document Processing gespeicherte Hash. Gehasht wird nur,
+        wenn die Datei nach der letzten Statusänderung geschrieben wurde - für unveränderte
+        Dateien bleibt es bei einem stat.
+        """
+        hash_map = VerarbeitungsstatusRepository.get_hash_map(status_map, STUFE_DOCUMENT_PROCESSING)
+        
+        for filename, (dokument_hash, aktualisiert_am) in hash_map.items():
+            file_path = os.path.join(PDF_INPUT_DIR, filename)
+            try:
+                geaendert_am = datetime.utcfromtimestamp(os.path.getmtime(file_path))
+                if aktualisiert_am and geaendert_am <= aktualisiert_am:
+                    continue
+                if OCRResultCache.compute_hash(file_path) == dokument_hash:
+                    continue
+            except OSError:
+                continue
+            
+            logger.info(f"🆕 Dateiname wiederverwendet, verarbeite neu: {filename}")
+            VerarbeitungsstatusRepository.delete_for_file(filename)
+            status_map.pop(filename, None)
+    
+    async def _record_failure(self, filename: str, stufe: str, meldung: str):
+        """Verbucht einen Fehlschlag: nächster Versuch per Backoff oder Dead-Letter nach RETRY_MAX_ATTEMPTS."""
+        status = await asyncio.to_thread(
+            VerarbeitungsstatusRepository.record_failure, filename, stufe, meldung, retry_policy
+        )
+        
+        # Jeder Versuch zählt als Stufen-Fehlschlag, das Dokument selbst erst mit dem Endergebnis
+        STAGE_FAILURES.inc(stage=stufe)
+        
+        if status == STATUS_DEAD_LETTER:
+            DOCUMENTS_PROCESSED.inc(result=status)
+            logger.error(f"☠️  {filename}: Stufe {stufe} nach {retry_policy.max_attempts} Versuchen aufgegeben ({meldung})")
+        elif status == STATUS_FEHLGESCHLAGEN:
+            logger.warning(f"🔁 {filename}: Stufe {stufe} fehlgeschlagen, neuer Versuch nach Backoff ({meldung})")
+    
     async def _background_loop(self):
-        """Haupt-Background-Loop für periodische Prüfung."""
+        """
+        Haupt-Background-Loop.
+        
+        Polling-Modus: Vollscan alle check_interval Sekunden.
+        inotify-Modus: Verarbeitet nur gemeldete Dateien; Vollscan beim Start, nach
+        Ereignis-Überlauf, bei force_check und als Sicherheitsnetz alle OCR_WATCH_RESCAN_INTERVAL.
+        """
         while self.running:
             try:
-                await self._check_and_process_files()
-                await asyncio.sleep(self.check_interval)
+                if self._full_scan_requested or not self._watcher:
+                    self._full_scan_requested = False
+                    self._pending_files.clear()
+                    await self._check_and_process_files()
+                elif self._pending_files:
+                    filenames = sorted(self._pending_files)
+                    self._pending_files.clear()
+                    await self._check_and_process_files(filenames)
+                
+                await self._wait_for_next_run()
                 
             except asyncio.CancelledError:
                 logger.info("OCR-Scheduler wurde abgebrochen")
@@ -118,164 +693,282 @@ class OCRScheduler:
                 # Bei Fehlern kurz warten und weitermachen
                 await asyncio.sleep(5)
     
-    async def _check_and_process_files(self):
-        """Prüft auf neue Dateien und verarbeitet sie."""
+    async def _wait_for_next_run(self):
+        """Wartet auf Watcher-Ereignisse bzw. force_check oder bis zum nächsten Vollscan/geplanten Wiederholungsversuch."""
+        timeout = OCR_WATCH_RESCAN_INTERVAL if self._watcher else self.check_interval
+        
+        next_retry_at = await asyncio.to_thread(VerarbeitungsstatusRepository.get_next_retry_at)
+        if next_retry_at:
+            timeout = max(1.0, min(timeout, (next_retry_at - datetime.utcnow()).total_seconds()))
+        
+        try:
+            await asyncio.wait_for(self._wakeup.wait(), timeout=timeout)
+        except asyncio.TimeoutError:
+            self._full_scan_requested = True
+        self._wakeup.clear()
+    
+    async def _check_and_process_files(self, filenames: Optional[List[str]] = None):
+        """
+        Prüft auf neue Dateien und verarbeitet sie.
+        
+        Args:
+            filenames: Nur diese Dateien prüfen (vom Watcher gemeldet); None = Vollscan
+        """
         try:
             if not os.path.exists(PDF_INPUT_DIR):
                 return
             
-            files_to_process = []
+            if filenames is None:
+                # ALLE PDF-Dateien prüfen (nicht nur unverarbeitete)
+                filenames = [f for f in os.listdir(PDF_INPUT_DIR) if f.lower().endswith('.pdf')]
             
-            # ALLE PDF-Dateien prüfen (nicht nur unverarbeitete)
-            for filename in os.listdir(PDF_INPUT_DIR):
-                if filename.lower().endswith('.pdf'):
-                    file_path = os.path.join(PDF_INPUT_DIR, filename)
-                    
-                    # Prüfen ob in DB vorhanden (mit neuem Repository)
-                    in_database = self._is_file_in_database(filename)
-                    
-                    # OCR-Status prüfen
-                    ocr_marker = file_path + '.ocr_processed'
-                    ocr_done = os.path.exists(ocr_marker)
-                    
-                    # Document Processing Status prüfen
-                    doc_processing_marker = file_path + '.doc_processed'
-                    doc_processing_done = os.path.exists(doc_processing_marker)
-                    
-                    # Verarbeitung nötig wenn:
-                    # - Noch nicht in processed_files UND
-                    # - (OCR fehlt ODER nicht in DB ODER Document Processing fehlt)
-                    if (filename not in self.processed_files and 
-                        (not ocr_done or not in_database or not doc_processing_done)):
-                        files_to_process.append(filename)
+            candidates = [
+                filename for filename in filenames
+                if filename not in self.processed_files and not self.pipeline.is_in_flight(filename)
+            ]
+            
+            # Dateien im Backoff bzw. Dead-Letter-Status überspringen
+            blocked = await asyncio.to_thread(VerarbeitungsstatusRepository.get_blocked_filenames, candidates)
+            candidates = [filename for filename in candidates if filename not in blocked]
+            
+            # Status und DB-Einträge aller Kandidaten mit je einer Abfrage laden
+            status_map = await asyncio.to_thread(VerarbeitungsstatusRepository.get_status_map, candidates)
+            await asyncio.to_thread(self._discard_outdated_status, status_map)
+            known_filenames = await asyncio.to_thread(DokumentRepository.get_existing_filenames, candidates)
+            
+            files_to_process = []
+            for filename in candidates:
+                if self._needs_processing(filename, status_map.get(filename, {}), filename in known_filenames):
+                    files_to_process.append(filename)
+                elif os.path.exists(os.path.join(PDF_INPUT_DIR, filename)):
+                    # Vollständig verarbeitet (z.B. nach Watcher-Ereignis ohne neuen Inhalt)
+                    self.processed_files.add(filename)
             
             if not files_to_process:
                 return  # Nichts zu tun
             
             logger.info(f"Dateien für Verarbeitung: {files_to_process}")
             
-            # Dateien verarbeiten
+            # In die Pipeline einreihen; blockiert bei voller OCR-Queue (Backpressure)
             for filename in files_to_process:
-                await self._process_single_file_complete(filename)
+                await self.pipeline.submit(
+                    filename,
+                    status=status_map.get(filename, {}),
+                    in_database=filename in known_filenames
+                )
         
         except Exception as e:
             logger.error(f"Fehler beim Prüfen der Dateien: {e}")
     
-    def _is_file_in_database(self, filename: str) -> bool:
-        """Prüft ob Datei bereits in Datenbank ist (mit neuem Repository)."""
-        try:
-            dokument = DokumentRepository.get_by_filename(filename)
-            return dokument is not None
-        except Exception as e:
-            logger.error(f"Fehler beim DB-Check: {e}")
+    def _needs_processing(self, filename: str, status: Dict[str, str], in_database: bool) -> bool:
+        """
+        Verarbeitung nötig wenn:
+        - Datei liegt im Input-Verzeichnis UND
+        - Noch nicht in processed_files UND
+        - (OCR fehlt ODER nicht in DB ODER Document Processing fehlt)
+        """
+        if filename in self.processed_files:
             return False
+        
+        if not os.path.exists(os.path.join(PDF_INPUT_DIR, filename)):
+            return False
+        
+        return not self._ocr_done(status) or not in_database or not self._doc_processing_done(status)
     
-    async def _process_single_file_complete(self, filename: str):
+    @staticmethod
+    def _timed(schritt: str, handler, erledigt: Optional[Callable[[PipelineJob], bool]] = None):
         """
-        Vollständige Verarbeitung - kann mehrfach aufgerufen werden.
-        Überspringt bereits erledigte Schritte.
-        ROBUSTER: Prüft aktuellen Dateipfad dynamisch.
+        Erfasst eine Pipeline-Stufe in der Zeitleiste des Dokuments (verarbeitungsschritte).
+        
+        Stufen, die laut erledigt(job) schon beim Einreihen abgeschlossen waren, werden ohne
+        Eintrag durchlaufen - sonst verfälschen die übersprungenen Läufe p50/p95 der Statistik.
         """
-        try:
-            # DYNAMISCHE Pfad-Ermittlung statt statischer Pfad
-            current_file_path = self._find_current_file_path(filename)
-            if not current_file_path:
-                logger.warning(f"Datei nicht gefunden: {filename}")
-                return
+        async def run(job: PipelineJob) -> bool:
+            if erledigt and erledigt(job):
+                return await handler(job)
             
-            logger.info(f"🔄 Verarbeite: {filename} (Pfad: {current_file_path})")
+            with processing_timeline.step(job.filename, schritt) as step:
+                forward = await handler(job)
+                if not forward:
+                    step.fail("Verarbeitung in dieser Stufe beendet")
+                return forward
+        return run
+    
+    # Pipeline-Stufen: True = weiter zur nächsten Stufe, False = Verarbeitung der Datei beenden
+    # Der Status ist an den ORIGINAL-Dateinamen im Input gebunden (bleibt konstant),
+    # der aktuelle Pfad wird in jeder Stufe neu ermittelt (Datei kann verschoben worden sein).
+    
+    async def _stage_ocr(self, job: PipelineJob) -> bool:
+        """Stufe 1: OCR falls nötig (Parallelität begrenzt durch den OCR-Worker-Pool)."""
+        filename = job.filename
+        current_file_path = await asyncio.to_thread(self._find_current_file_path, filename)
+        if not current_file_path:
+            logger.warning(f"Datei nicht gefunden: {filename}")
+            return False
+        
+        logger.info(f"🔄 Verarbeite: {filename} (Pfad: {current_file_path})")
+        
+        if self._ocr_done(job.context["status"]):
+            logger.debug(f"⏭️  OCR bereits vorhanden: {filename}")
+            return True
+        
+        logger.info(f"📝 Starte OCR: {filename}")
+        result = await self.ocr_pool.submit(current_file_path)
+        
+        if not result["success"]:
+            logger.warning(f"❌ OCR fehlgeschlagen: {filename}")
+            meldung = "OCR-Timeout" if result.get("timed_out") else "OCR fehlgeschlagen"
+            await self._record_failure(filename, STUFE_OCR, meldung)
+            return False
+        
+        await self._mark_stage(filename, STUFE_OCR, STATUS_ERLEDIGT)
+        logger.info(f"✅ OCR abgeschlossen: {filename} ({result['pages']} Seiten, {result['duration']:.1f}s)")
+        return True
+    
+    async def _stage_cleanup(self, job: PipelineJob) -> bool:
+        """Stufe 2: Leerseiten-Entfernung (optional) - nur wenn Datei noch existiert."""
+        current_file_path = await asyncio.to_thread(self._find_current_file_path, job.filename)
+        if current_file_path:
+            try:
+                await asyncio.to_thread(self._remove_blank_pages, current_file_path)
+            except Exception as e:
+                logger.warning(f"⚠️  Leerseiten-Entfernung fehlgeschlagen: {e}")
+        return True
+    
+    async def _stage_database(self, job: PipelineJob) -> bool:
+        """
+        Stufe 3: DB-Eintrag und Seitentext für die Volltextsuche falls nötig;
+        ab hier ist die Zeitleiste dem Dokument zugeordnet.
+        """
+        filename = job.filename
+        dokument = await asyncio.to_thread(DokumentRepository.get_by_filename, filename)
+        if dokument:
+            logger.debug(f"⏭️  Bereits in DB: {filename}")
+            dokument_id = dokument.id
+        else:
+            dokument_id = None
+            current_file_path = await asyncio.to_thread(self._find_current_file_path, filename)
+            if current_file_path:
+                logger.info(f"📋 Füge zur DB hinzu: {filename}")
+                dokument_id = await self._add_to_database(filename, current_file_path)
+        
+        if dokument_id:
+            processing_timeline.link_dokument(filename, dokument_id)
+            await asyncio.to_thread(self._index_fulltext, dokument_id, filename)
+        return True
+    
+    def _index_fulltext(self, dokument_id: int, filename: str):
+        """Speichert den Seitentext, falls das Dokument noch nicht indexiert ist (auch Upload/SMB-Dokumente)."""
+        if DokumentSeiteRepository.has_pages(dokument_id):
+            return
+        
+        current_file_path = self._find_current_file_path(filename)
+        if not current_file_path:
+            logger.warning(f"Datei für Volltext-Indexierung nicht gefunden: {filename}")
+            return
+        
+        seiten = OCRService.extract_page_texts(current_file_path)
+        if seiten:
+            gespeichert = DokumentSeiteRepository.replace_for_dokument(dokument_id, seiten)
+            logger.debug(f"🔎 Volltext indexiert: {filename} ({gespeichert} Seiten)")
+    
+    async def _stage_classify(self, job: PipelineJob) -> bool:
+        """Stufe 4: Document Processing falls nötig, danach gilt die Datei als vollständig verarbeitet."""
+        filename = job.filename
+        
+        if self._doc_processing_done(job.context["status"]):
+            logger.debug(f"⏭️  Document Processing bereits erledigt: {filename}")
+        else:
+            # WICHTIG: Aktuellen Pfad vor Document Processing ermitteln
+            current_file_path = await asyncio.to_thread(self._find_current_file_path, filename)
+            if not current_file_path:
+                logger.warning(f"Datei für Document Processing nicht gefunden: {filename}")
+                await self._record_failure(filename, STUFE_DOCUMENT_PROCESSING, "Datei nicht gefunden")
+                return False
             
-            # Marker-Pfade basierend auf ORIGINAL Input-Pfad (bleiben konstant)
-            original_input_path = os.path.join(PDF_INPUT_DIR, filename)
-            ocr_marker = original_input_path + '.ocr_processed'
-            doc_processing_marker = original_input_path + '.doc_processed'
+            logger.info(f"📄 Starte Document Processing: {filename}")
             
-            # 1. OCR falls nötig
-            if not os.path.exists(ocr_marker):
-                logger.info(f"📝 Starte OCR: {filename}")
-                success = await asyncio.to_thread(self._run_ocr_sync, current_file_path)
+            try:
+                # Hash der fertig vorverarbeiteten Datei, bevor ein Processor sie verschiebt
+                # (erkennt später wiederverwendete Dateinamen, siehe _discard_outdated_status)
+                dokument_hash = await asyncio.to_thread(OCRResultCache.compute_hash, current_file_path)
                 
-                if success:
-                    # OCR-Marker erstellen
-                    with open(ocr_marker, 'w') as marker:
-                        marker.write(f"OCR: {os.path.getmtime(current_file_path)}")
-                    logger.info(f"✅ OCR abgeschlossen: {filename}")
+                if self._document_processor_manager:
+                    doc_processed = await self._document_processor_manager.process_document(
+                        current_file_path, filename
+                    )
+                    
+                    # Kein Processor zuständig ist ein Ergebnis; ein fehlgeschlagener Processor
+                    # wirft DocumentProcessingError und landet unten im Backoff
+                    await self._mark_stage(
+                        filename, STUFE_DOCUMENT_PROCESSING, STATUS_ERLEDIGT,
+                        meldung=None if doc_processed else "Kein Processor zuständig",
+                        dokument_hash=dokument_hash
+                    )
+                    
+                    if doc_processed:
+                        logger.info(f"✅ Document Processing erfolgreich: {filename}")
+                    else:
+                        logger.debug(f"ℹ️  Kein Processor gefunden: {filename}")
                 else:
-                    logger.warning(f"❌ OCR fehlgeschlagen: {filename}")
-                    return
-            else:
-                logger.debug(f"⏭️  OCR bereits vorhanden: {filename}")
-            
-            # 2. Leerseiten-Entfernung (optional) - nur wenn Datei noch existiert
-            current_file_path = self._find_current_file_path(filename)
-            if current_file_path:
-                try:
-                    await asyncio.to_thread(self._remove_blank_pages_pillow, current_file_path)
-                except Exception as e:
-                    logger.warning(f"⚠️  Leerseiten-Entfernung fehlgeschlagen: {e}")
-            
-            # 3. DB-Eintrag falls nötig
-            if not self._is_file_in_database(filename):
-                current_file_path = self._find_current_file_path(filename)
-                if current_file_path:
-                    logger.info(f"📋 Füge zur DB hinzu: {filename}")
-                    await self._add_to_database(filename, current_file_path)
-            else:
-                logger.debug(f"⏭️  Bereits in DB: {filename}")
-            
-            # 4. Document Processing falls nötig
-            if not os.path.exists(doc_processing_marker):
-                # WICHTIG: Aktuellen Pfad vor Document Processing ermitteln
-                current_file_path = self._find_current_file_path(filename)
-                if not current_file_path:
-                    logger.warning(f"Datei für Document Processing nicht gefunden: {filename}")
-                    # Trotzdem Marker erstellen um endlose Wiederholung zu vermeiden
-                    with open(doc_processing_marker, 'w') as marker:
-                        marker.write(f"Doc Processing failed - file not found: {filename}")
-                    self.processed_files.add(filename)
-                    return
-                
-                logger.info(f"📄 Starte Document Processing: {filename}")
-                
-                try:
-                    if self._document_processor_manager:
-                        doc_processed = await self._document_processor_manager.process_document(
-                            current_file_path, filename
-                        )
-                        
-                        # Document Processing Marker erstellen (egal ob erfolgreich oder nicht)
-                        with open(doc_processing_marker, 'w') as marker:
-                            marker.write(f"Doc Processing: {os.path.getmtime(current_file_path) if os.path.exists(current_file_path) else 'completed'}")
+                    logger.debug("Document Processing System nicht verfügbar")
+                    # Trotzdem Status setzen
+                    await self._mark_stage(
+                        filename, STUFE_DOCUMENT_PROCESSING, STATUS_ERLEDIGT,
+                        meldung="Document Processing nicht verfügbar",
+                        dokument_hash=dokument_hash
+                    )
                         
-                        if doc_processed:
-                            logger.info(f"✅ Document Processing erfolgreich: {filename}")
-                        else:
-                            logger.debug(f"ℹ️  Kein Processor gefunden: {filename}")
-                    else:
-                        logger.debug("Document Processing System nicht verfügbar")
-                        # Trotzdem Marker erstellen
-                        with open(doc_processing_marker, 'w') as marker:
-                            marker.write(f"Doc Processing unavailable: {filename}")
-                            
-                except Exception as e:
-                    logger.error(f"Document Processing Fehler für {filename}: {e}")
-                    # Marker trotzdem erstellen um endlose Wiederholung zu vermeiden
-                    with open(doc_processing_marker, 'w') as marker:
-                        marker.write(f"Doc Processing failed: {str(e)}")
-            else:
-                logger.debug(f"⏭️  Document Processing bereits erledigt: {filename}")
-            
-            # 5. Als vollständig verarbeitet markieren
-            self.processed_files.add(filename)
-            
-            logger.info(f"✨ Vollständig verarbeitet: {filename}")
-            
-        except Exception as e:
-            logger.error(f"Fehler bei Vollverarbeitung von {filename}: {e}")
-            # Bei schweren Fehlern trotzdem als verarbeitet markieren
+            except Exception as e:
+                logger.error(f"Document Processing Fehler für {filename}: {e}")
+                await self._record_failure(filename, STUFE_DOCUMENT_PROCESSING, str(e))
+                return False
+        
+        # Als vollständig verarbeitet markieren (verschobene Dateien nicht - ihr Name kann neu vergeben werden)
+        if os.path.exists(os.path.join(PDF_INPUT_DIR, filename)):
             self.processed_files.add(filename)
+        DOCUMENTS_PROCESSED.inc(result="erledigt")
+        
+        logger.info(f"✨ Vollständig verarbeitet: {filename}")
+        return True
+    
+    async def _on_job_failed(self, job: PipelineJob, error: Exception):
+        """Unerwarteter Fehler in einer Stufe (bereits geloggt): als Fehlschlag mit Backoff verbuchen."""
+        stufe = STUFE_OCR if job.stage == "ocr" else STUFE_DOCUMENT_PROCESSING
+        await self._record_failure(job.filename, stufe, f"{job.stage}: {error}")
+    
+    async def enqueue_files(self, filenames: List[str]) -> Tuple[int, int]:
+        """
+        Übergibt im Input gefundene Dateien an den Scheduler (z.B. aus GET /dokumente).
+        Blockiert nicht; Verarbeitung erfolgt im Background-Loop.
+        
+        Dateien im Backoff bzw. Dead-Letter-Status werden nicht eingereiht (der Scheduler
+        plant sie selbst bzw. erst nach manuellem Requeue neu ein) und getrennt gezählt.
+        
+        Returns:
+            (Anzahl noch nicht vollständig verarbeiteter Dateien, Anzahl zurückgestellter Dateien)
+        """
+        unprocessed = [filename for filename in filenames if filename not in self.processed_files]
+        blocked = await asyncio.to_thread(VerarbeitungsstatusRepository.get_blocked_filenames, unprocessed)
+        pending = [filename for filename in unprocessed if filename not in blocked]
+        
+        new_files = [
+            filename for filename in pending
+            if filename not in self._pending_files and not self.pipeline.is_in_flight(filename)
+        ]
+        if new_files and self.running:
+            self._pending_files.update(new_files)
+            self._wakeup.set()
+        
+        return len(pending), len(blocked)
+    
+    def requeue(self, filename: str):
+        """Plant eine Datei nach manuellem Zurücksetzen des Status sofort neu ein."""
+        self.processed_files.discard(filename)
+        if self.running:
+            self._on_file_ready(filename)
 
-    def _find_current_file_path(self, filename: str) -> str:
+    def _find_current_file_path(self, filename: str) -> Optional[str]:
         """
         Findet den aktuellen Pfad einer Datei (könnte verschoben worden sein).
         
@@ -283,165 +976,70 @@ class OCRScheduler:
             Aktueller Pfad oder None wenn nicht gefunden
         """
         try:
-            # 1. Zuerst im Input-Verzeichnis schauen
-            input_path = os.path.join(PDF_INPUT_DIR, filename)
-            if os.path.exists(input_path):
-                return input_path
-            
-            # 2. In der Datenbank nach aktuellem Pfad suchen
-            try:
-                all_dokumente = DokumentRepository.get_all()
-                for dok_dict in all_dokumente:
-                    if dok_dict["dateiname"] == filename and os.path.exists(dok_dict["pfad"]):
-                        return dok_dict["pfad"]
-            except Exception as e:
-                logger.debug(f"DB-Suche fehlgeschlagen: {e}")
-            
-            # 3. In processed-Verzeichnissen suchen (als Fallback)
-            from ..config.settings import PDF_PROCESSED_DIR
-            
-            for root, dirs, files in os.walk(PDF_PROCESSED_DIR):
-                for file in files:
-                    if file == filename or file.startswith(f"lief_ext_") and file.endswith(f"_{filename}"):
-                        full_path = os.path.join(root, file)
-                        if os.path.exists(full_path):
-                            return full_path
-            
-            logger.debug(f"Datei {filename} nicht gefunden")
-            return None
-            
+            return document_path_resolver.resolve(filename)
         except Exception as e:
             logger.error(f"Fehler beim Suchen der Datei {filename}: {e}")
             return None
-            
-    def _run_ocr_sync(self, file_path: str) -> bool:
-        """Synchrone OCR-Ausführung für asyncio.to_thread."""
-        try:
-            # Temporäre Datei für OCR-Output
-            with tempfile.NamedTemporaryFile(suffix='.pdf', delete=False) as temp_file:
-                temp_path = temp_file.name
-            
-            try:
-                # OCR-Verarbeitung
-                success = OCRService.create_searchable_pdf(file_path, temp_path)
-                
-                if success:
-                    # Original durch OCR-Version ersetzen
-                    shutil.move(temp_path, file_path)
-                    return True
-                else:
-                    return False
-                    
-            finally:
-                # Temporäre Datei aufräumen
-                if os.path.exists(temp_path):
-                    os.remove(temp_path)
-                    
-        except Exception as e:
-            logger.error(f"Fehler beim synchronen OCR: {e}")
-            return False
     
-
-    def _remove_blank_pages_pillow(self, pdf_path: str) -> bool:
-
+    def _remove_blank_pages(self, pdf_path: str) -> bool:
+        """
+        Entfernt leere Seiten aus einer PDF (Schwellenwerte: BLANK_PAGE_DETECTION).
+        
+        Returns:
+            True wenn Seiten entfernt wurden
+        """
+        if not blank_page_detector.enabled:
+            return False
+        
         try:
-            import io
-            import shutil
-
             import fitz
-            from PIL import Image
             
-            doc = fitz.open(pdf_path)
-            pages_to_remove = []
-            original_page_count = len(doc)
+            # Erkennung über die gemeinsame Analyse (Text + Render-Statistik)
+            analysis = get_pdf_analysis(pdf_path)
+            original_page_count = analysis.page_count
             
             logger.info(f"Prüfe {original_page_count} Seiten auf Leerheit: {os.path.basename(pdf_path)}")
             
+            pages_to_remove = blank_page_detector.find_blank_pages_in_analysis(analysis)
+            
+            if not pages_to_remove:
+                logger.info(f"✅ Keine leeren Seiten in {os.path.basename(pdf_path)}")
+                return False
+            
+            # Alle Seiten leer: Dokument nicht leeren
+            if len(pages_to_remove) == original_page_count:
+                logger.warning(f"Alle Seiten als leer erkannt, behalte Dokument: {os.path.basename(pdf_path)}")
+                return False
+            
+            # Nur zum Löschen der Seiten öffnen
+            doc = fitz.open(pdf_path)
             doc_closed = False
             
             try:
-                for page_num in range(len(doc)):
-                    page = doc[page_num]
-                    
-                    # 1. Pixelbasierte Analyse (wie bisher)
-                    pix = page.get_pixmap(matrix=fitz.Matrix(0.5, 0.5))
-                    img_data = pix.tobytes("png")
-                    img = Image.open(io.BytesIO(img_data))
-                    img_gray = img.convert('L')
-                    
-                    # Histogramm erstellen
-                    histogram = img_gray.histogram()
-                    total_pixels = img_gray.size[0] * img_gray.size[1]
-                    
-                    # VERSCHÄRFTE Einstellungen für weiße Pixel
-                    white_pixels = sum(histogram[250:])  # Nur 250-255 statt 240-255
-                    white_ratio = white_pixels / total_pixels
-                    
-                    # VERSCHÄRFTER Schwellenwert für Leerseiten
-                    pixel_based_blank = white_ratio > 0.98  
-                    
-                    # 2. Textbasierte Zusatzprüfung für Grenzfälle
-                    text_based_blank = True
-                    if pixel_based_blank:
-                        # Bei pixelbasierten Grenzfällen auch Text prüfen
-                        page_text = page.get_text().strip()
-                        
-                        # Seite ist NICHT leer wenn:
-                        # - Mehr als 10 Zeichen Text
-                        # - Enthält alphanumerische Zeichen
-                        # - Enthält typische Dokumentwörter
-                        meaningful_text = len(page_text) > 10 and any(c.isalnum() for c in page_text)
-                        
-                        # Spezielle Prüfung für Wareneingänge
-                        wareneingang_keywords = ['wareneingang', 'lieferschein', 'bestellung', 'artikel']
-                        contains_keywords = any(keyword in page_text.lower() for keyword in wareneingang_keywords)
-                        
-                        if meaningful_text or contains_keywords:
-                            text_based_blank = False
-                            logger.debug(f"Seite {page_num + 1} durch Text-Prüfung gerettet: '{page_text[:50]}...'")
-                    
-                    # Seite ist nur leer wenn BEIDE Kriterien zutreffen
-                    is_blank = pixel_based_blank and text_based_blank
-                    
-                    if is_blank:
-                        pages_to_remove.append(page_num)
-                        logger.debug(f"Seite {page_num + 1} ist leer (weiß: {white_ratio:.1%})")
-                    elif pixel_based_blank:
-                        logger.debug(f"Seite {page_num + 1} fast leer, aber Text gefunden (weiß: {white_ratio:.1%})")
-                    
-                    # Speicher freigeben
-                    img.close()
-                    img_gray.close()
-                
                 # Leere Seiten entfernen (von hinten nach vorne)
-                removed_count = 0
                 for page_num in reversed(pages_to_remove):
                     doc.delete_page(page_num)
-                    removed_count += 1
                 
-                if removed_count > 0:
-                    # In temporäre Datei speichern
-                    with tempfile.NamedTemporaryFile(suffix='.pdf', delete=False) as temp_output:
-                        temp_output_path = temp_output.name
+                # In temporäre Datei speichern
+                with tempfile.NamedTemporaryFile(suffix='.pdf', delete=False) as temp_output:
+                    temp_output_path = temp_output.name
+                
+                try:
+                    doc.save(temp_output_path, deflate=True)
+                    doc.close()
+                    doc_closed = True
                     
-                    try:
-                        doc.save(temp_output_path, deflate=True)
-                        doc.close()
-                        doc_closed = True
-                        
-                        # Original durch bereinigte Version ersetzen
-                        shutil.move(temp_output_path, pdf_path)
-                        
-                        logger.info(f"🗑️  Leerseiten entfernt: {removed_count} von {original_page_count} aus {os.path.basename(pdf_path)}")
-                        return True
-                        
-                    except Exception as save_error:
-                        logger.error(f"Fehler beim Speichern der bereinigten PDF: {save_error}")
-                        if os.path.exists(temp_output_path):
-                            os.remove(temp_output_path)
-                        return False
-                else:
-                    logger.info(f"✅ Keine leeren Seiten in {os.path.basename(pdf_path)}")
+                    # Original durch bereinigte Version ersetzen
+                    shutil.move(temp_output_path, pdf_path)
+                    BLANK_PAGES_REMOVED.inc(len(pages_to_remove))
+                    
+                    logger.info(f"🗑️  Leerseiten entfernt: {len(pages_to_remove)} von {original_page_count} aus {os.path.basename(pdf_path)}")
+                    return True
+                    
+                except Exception as save_error:
+                    logger.error(f"Fehler beim Speichern der bereinigten PDF: {save_error}")
+                    if os.path.exists(temp_output_path):
+                        os.remove(temp_output_path)
                     return False
                     
             finally:
@@ -452,52 +1050,50 @@ class OCRScheduler:
                         pass
             
         except Exception as e:
-            logger.error(f"Fehler bei verbesserter Leerseiten-Entfernung: {e}")
+            logger.error(f"Fehler bei Leerseiten-Entfernung: {e}")
             return False
 
-
-    # ALTERNATIVE: Konfigurierbare Einstellungen in settings.py
-    """
-    # Zu settings.py hinzufügen:
-    BLANK_PAGE_DETECTION = {
-        "enabled": True,
-        "white_pixel_threshold": 250,  # 250-255 statt 240-255
-        "blank_page_threshold": 0.995,  # 99.5% statt 98%
-        "min_text_length": 10,  # Mindest-Textlänge für Nicht-Leer-Erkennung
-        "preserve_keywords": ["wareneingang", "lieferschein", "bestellung", "artikel"]
-    }
-    """    
-    async def _add_to_database(self, filename: str, file_path: str):
-        """Fügt neue Datei zur Datenbank hinzu falls noch nicht vorhanden (mit neuem Repository)."""
+    async def _add_to_database(self, filename: str, file_path: str) -> Optional[int]:
+        """
+        Fügt neue Datei zur Datenbank hinzu falls noch nicht vorhanden (mit neuem Repository).
+        
+        Returns:
+            ID des (neuen oder vorhandenen) Dokuments, None bei Fehler
+        """
         try:
             # Prüfen ob bereits in DB
-            existing_dokument = DokumentRepository.get_by_filename(filename)
+            existing_dokument = await asyncio.to_thread(DokumentRepository.get_by_filename, filename)
             
-            if not existing_dokument:
-                # Vorschau-Text extrahieren
-                preview_text = await asyncio.to_thread(
-                    OCRService.extract_preview_text, file_path, 300
-                )
-                
-                # In DB speichern (mit neuem Repository)
-                DokumentRepository.create(
-                    dateiname=filename,
-                    pfad=file_path,
-                    inhalt_vorschau=preview_text
-                )
-                
-                logger.info(f"📋 Datei zur Datenbank hinzugefügt: {filename}")
+            if existing_dokument:
+                return existing_dokument.id
+            
+            # Vorschau-Text extrahieren
+            preview_text = await asyncio.to_thread(
+                OCRService.extract_preview_text, file_path, 300
+            )
+            
+            # In DB speichern (mit neuem Repository)
+            dokument_dict = await asyncio.to_thread(
+                DokumentRepository.create,
+                dateiname=filename,
+                pfad=file_path,
+                inhalt_vorschau=preview_text
+            )
+            
+            logger.info(f"📋 Datei zur Datenbank hinzugefügt: {filename}")
+            return dokument_dict["id"] if dokument_dict else None
         
         except Exception as e:
             logger.error(f"Fehler beim Hinzufügen zur DB: {e}")
+            return None
     
     def force_check(self):
         """Löst eine sofortige Prüfung aus (für manuellen Trigger)."""
         if self.running:
-            # Erstelle Task für sofortige Prüfung
-            asyncio.create_task(self._check_and_process_files())
+            # Background-Loop für sofortigen Vollscan aufwecken
+            self._request_full_scan()
             logger.info("Manuelle OCR-Prüfung mit Document Processing ausgelöst")
 
 
 # Globale Scheduler-Instanz
-ocr_scheduler = OCRScheduler(check_interval=30)  # Alle 30 Sekunden prüfen
\ No newline at end of file
+ocr_scheduler = OCRScheduler(check_interval=30)  # Polling-Fallback: alle 30 Sekunden prüfen
\ No newline at end of file
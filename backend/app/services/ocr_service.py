@@ -5,12 +5,22 @@ Saubere Version ohne problematische Parameter.
 
 import logging
 import os
+import shutil
 import tempfile
 from pathlib import Path
+from typing import List
 
 import ocrmypdf
 
-from ..config.settings import OCR_LANGUAGE
+from ..config.settings import (
+    OCR_CACHE_ENABLED,
+    OCR_JOB_TIMEOUT,
+    OCR_JOBS_PER_WORKER,
+    OCR_LANGUAGE,
+    OCR_TEXT_LAYER_MIN_CHARS,
+)
+from .ocr_cache import ocr_result_cache
+from .pdf_analysis import get_pdf_analysis
 
 # Logger einrichten
 logger = logging.getLogger(__name__)
@@ -18,6 +28,14 @@ logger = logging.getLogger(__name__)
 class OCRService:
     """Service für die OCR-Verarbeitung von PDF-Dokumenten mit OCRmyPDF."""
     
+    # Zähler für die Text-Layer-Vorprüfung (prozesslokal)
+    stats = {
+        "text_layer_skipped_documents": 0,  # Alle Seiten hatten Text -> keine OCR
+        "text_layer_partial_documents": 0,  # Nur Bildseiten mit OCR
+        "text_layer_skipped_pages": 0,      # Seiten, die Tesseract nicht gesehen hat
+        "ocr_pages": 0                      # Seiten, die an Tesseract gingen
+    }
+    
     @staticmethod
     def create_searchable_pdf(input_pdf_path: str, output_pdf_path: str) -> bool:
         """
@@ -30,44 +48,89 @@ class OCRService:
         Returns:
             bool: True bei Erfolg, False bei Fehler
         """
+        content_hash = None
+        
         try:
             # Überprüfe, ob die Eingabedatei existiert
             if not os.path.isfile(input_pdf_path):
                 logger.error(f"PDF-Datei nicht gefunden: {input_pdf_path}")
                 return False
             
-            logger.info(f"Starte OCR-Verarbeitung für: {input_pdf_path}")
-            
             # Stelle sicher, dass das Ausgabeverzeichnis existiert
             output_dir = Path(output_pdf_path).parent
             os.makedirs(output_dir, exist_ok=True)
             
+            # Cache-Lookup: identische Eingabe wurde bereits verarbeitet
+            if OCR_CACHE_ENABLED:
+                content_hash = ocr_result_cache.compute_hash(input_pdf_path)
+                if ocr_result_cache.fetch(content_hash, output_pdf_path):
+                    logger.info(f"⚡ OCR-Cache-Treffer, überspringe OCR: {input_pdf_path}")
+                    return True
+            
+            # Text-Layer-Vorprüfung: Seiten mit vorhandenem Text brauchen keine OCR
+            pages_with_text = OCRService._check_text_layer(input_pdf_path)
+            image_pages = [index + 1 for index, has_text in enumerate(pages_with_text) if not has_text]
+            
+            if pages_with_text and not image_pages:
+                OCRService.stats["text_layer_skipped_documents"] += 1
+                OCRService.stats["text_layer_skipped_pages"] += len(pages_with_text)
+                logger.info(
+                    f"⏭️  Textebene auf allen {len(pages_with_text)} Seiten vorhanden, "
+                    f"überspringe OCR: {input_pdf_path}"
+                )
+                shutil.copy2(input_pdf_path, output_pdf_path)
+                return True
+            
+            # Nur Seiten ohne Textebene an OCRmyPDF geben
+            ocr_page_selection = None
+            if pages_with_text and len(image_pages) < len(pages_with_text):
+                ocr_page_selection = ",".join(str(page) for page in image_pages)
+                skipped_pages = len(pages_with_text) - len(image_pages)
+                OCRService.stats["text_layer_partial_documents"] += 1
+                OCRService.stats["text_layer_skipped_pages"] += skipped_pages
+                logger.info(
+                    f"🔀 Teil-OCR: {len(image_pages)} von {len(pages_with_text)} Seiten ohne Textebene "
+                    f"({skipped_pages} übersprungen): {input_pdf_path}"
+                )
+            OCRService.stats["ocr_pages"] += len(image_pages)
+            
+            logger.info(f"Starte OCR-Verarbeitung für: {input_pdf_path}")
+            
+            # Seiten unter OCR_TEXT_LAYER_MIN_CHARS können trotzdem etwas Text haben (Stempel,
+            # Scanner-Kopfzeile). Ohne redo_ocr bricht OCRmyPDF dort mit PriorOcrFoundError ab
+            # und die gescannten Seiten bekämen nie eine Textebene.
+            redo_ocr = bool(pages_with_text)
+            
             # Saubere OCRmyPDF Konfiguration - nur bewährte Parameter
             ocrmypdf.ocr(
                 input_pdf_path,
                 output_pdf_path,
+                pages=ocr_page_selection,  # None = alle Seiten
                 language='deu',          # Deutsche Sprache
                 deskew=False,           # Deaktiviert - benötigt zusätzliche Tools
                 remove_vectors=False,    # Vektorgrafiken beibehalten
                 force_ocr=False,        # Nur OCR wenn noch nicht vorhanden
                 skip_text=False,        # Bestehenden Text nicht überspringen
+                redo_ocr=redo_ocr,      # Vorhandenen Text behalten, Bildbereiche trotzdem erkennen
                 clean=False,            # Deaktiviert - benötigt 'unpaper'
                 optimize=0,             # Keine Optimierung
                 color_conversion_strategy='LeaveColorUnchanged',  # Keine Farbkonvertierung
                 progress_bar=False,     # Kein Progress Bar im Log
                 use_threads=True,       # Multi-Threading aktivieren
+                jobs=OCR_JOBS_PER_WORKER,  # Kerne auf die OCR-Worker aufteilen statt Worker x Kerne
                 rotate_pages=False,     # Deaktiviert
-                tesseract_timeout=300,  # 5 Minuten Timeout
+                tesseract_timeout=min(300, OCR_JOB_TIMEOUT),  # Max. 5 Minuten pro Seite, nie länger als der Job
                 tesseract_pagesegmode=1,  # Automatische Seitensegmentierung
             )
             
             logger.info(f"OCR-Verarbeitung erfolgreich abgeschlossen: {output_pdf_path}")
+            OCRService._store_in_cache(content_hash, output_pdf_path)
             return True
             
         except ocrmypdf.exceptions.PriorOcrFoundError:
+            # Nur noch ohne Text-Layer-Vorprüfung möglich (redo_ocr=False)
             logger.info(f"PDF bereits durchsuchbar, kopiere Original: {input_pdf_path}")
             # Falls PDF bereits OCR-Text hat, einfach kopieren
-            import shutil
             shutil.copy2(input_pdf_path, output_pdf_path)
             return True
             
@@ -92,8 +155,10 @@ class OCRService:
                     force_ocr=False,
                     skip_text=False,
                     progress_bar=False,
+                    jobs=OCR_JOBS_PER_WORKER,
                 )
                 logger.info(f"Fallback-OCR erfolgreich: {output_pdf_path}")
+                OCRService._store_in_cache(content_hash, output_pdf_path)
                 return True
             except Exception as fallback_error:
                 logger.error(f"Auch Fallback-OCR fehlgeschlagen: {str(fallback_error)}")
@@ -105,7 +170,6 @@ class OCRService:
             # Letzter Fallback: Datei kopieren ohne OCR
             logger.info("Letzte Option: Kopiere PDF ohne OCR-Verarbeitung")
             try:
-                import shutil
                 shutil.copy2(input_pdf_path, output_pdf_path)
                 logger.warning(f"PDF ohne OCR kopiert: {output_pdf_path}")
                 return True
@@ -113,6 +177,39 @@ class OCRService:
                 logger.error(f"Auch Kopieren fehlgeschlagen: {str(copy_error)}")
                 return False
     
+    @staticmethod
+    def _check_text_layer(pdf_path: str) -> list[bool]:
+        """
+        Prüft mit PyMuPDF, welche Seiten bereits eine Textebene haben.
+        
+        Returns:
+            Liste mit einem Eintrag pro Seite (True = Text vorhanden), leer bei Fehler
+        """
+        try:
+            analysis = get_pdf_analysis(pdf_path)
+            return [
+                len(text.strip()) >= OCR_TEXT_LAYER_MIN_CHARS
+                for text in analysis.page_texts
+            ]
+        except Exception as e:
+            logger.warning(f"Text-Layer-Prüfung fehlgeschlagen, führe volle OCR durch: {e}")
+            return []
+    
+    @staticmethod
+    def get_counters() -> dict:
+        """Gibt die prozesslokalen Zähler (Text-Layer + Cache) zurück."""
+        return {
+            **OCRService.stats,
+            "cache_hits": ocr_result_cache.hits,
+            "cache_misses": ocr_result_cache.misses
+        }
+    
+    @staticmethod
+    def _store_in_cache(content_hash: str, output_pdf_path: str):
+        """Legt ein erfolgreiches OCR-Ergebnis im Cache ab (falls aktiviert)."""
+        if content_hash:
+            ocr_result_cache.store(content_hash, output_pdf_path)
+    
     @staticmethod
     def remove_blank_pages_advanced(pdf_path: str) -> bool:
         """
@@ -127,35 +224,30 @@ class OCRService:
         try:
             import fitz
             
-            doc = fitz.open(pdf_path)
+            analysis = get_pdf_analysis(pdf_path)
             pages_to_remove = []
             
-            # Jede Seite prüfen
-            for page_num in range(len(doc)):
-                page = doc[page_num]
-                
-                # Text prüfen
-                text = page.get_text().strip()
+            # Jede Seite prüfen (Text/Bilder/Zeichnungen aus der gemeinsamen Analyse)
+            for page_num in range(analysis.page_count):
+                text = analysis.page_texts[page_num].strip()
                 has_meaningful_text = len(text) > 5 and not text.isspace()
                 
-                # Bilder prüfen
-                images = page.get_images()
-                has_images = len(images) > 0
-                
-                # Zeichnungen prüfen
-                has_drawings = False
-                try:
-                    drawings = page.get_drawings()
-                    has_drawings = len(drawings) > 0
-                except:
-                    pass
-                
                 # Seite ist leer wenn sie keinen relevanten Inhalt hat
-                is_blank = not (has_meaningful_text or has_images or has_drawings)
+                is_blank = not (
+                    has_meaningful_text or
+                    analysis.has_images(page_num) or
+                    analysis.has_drawings(page_num)
+                )
                 
                 if is_blank:
                     pages_to_remove.append(page_num)
             
+            if not pages_to_remove:
+                logger.debug(f"Keine leeren Seiten gefunden in {pdf_path}")
+                return False
+            
+            doc = fitz.open(pdf_path)
+            
             # Seiten von hinten nach vorne löschen (Index bleibt stabil)
             removed_count = 0
             for page_num in reversed(pages_to_remove):
@@ -189,15 +281,12 @@ class OCRService:
             str: Textvorschau oder leerer String bei Fehler
         """
         try:
-            import fitz  # PyMuPDF für Textextraktion
-
-            # PDF öffnen
-            doc = fitz.open(pdf_path)
+            # Gemeinsame (gecachte) Analyse statt erneutem fitz.open
+            analysis = get_pdf_analysis(pdf_path)
             
             # Text von der ersten Seite extrahieren
-            if len(doc) > 0:
-                page = doc[0]
-                text = page.get_text()
+            if analysis.page_count > 0:
+                text = analysis.page_texts[0]
                 
                 # Bereinigen und kürzen
                 cleaned_text = " ".join(text.split())
@@ -212,16 +301,34 @@ class OCRService:
                         preview = preview[:last_space]
                     preview += "..."
                 
-                doc.close()
                 return preview
             
-            doc.close()
             return ""
             
         except Exception as e:
             logger.error(f"Fehler beim Extrahieren der Textvorschau: {str(e)}")
             return ""
     
+    @staticmethod
+    def extract_page_texts(pdf_path: str) -> List[str]:
+        """
+        Extrahiert den vollständigen Text jeder Seite (für die Volltextsuche).
+        
+        Args:
+            pdf_path: Pfad zur PDF-Datei (nach OCR und Leerseiten-Entfernung)
+            
+        Returns:
+            List[str]: Bereinigter Text pro Seite (Whitespace normalisiert), leere Liste bei Fehler
+        """
+        try:
+            analysis = get_pdf_analysis(pdf_path)
+            # NUL-Zeichen sind in PostgreSQL-Text nicht erlaubt
+            return [" ".join(text.replace("\x00", " ").split()) for text in analysis.page_texts]
+            
+        except Exception as e:
+            logger.error(f"Fehler beim Extrahieren des Seitentexts: {str(e)}")
+            return []
+    
     @staticmethod
     def process_pdf_with_ocr(input_path: str, output_path: str) -> tuple[bool, str]:
         """
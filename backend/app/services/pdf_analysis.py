@@ -0,0 +1,113 @@
+"""
+Einmalige PDF-Analyse, die von allen Pipeline-Stufen gemeinsam genutzt wird.
+Ein Dokument wird pro Dateiversion (Pfad + mtime + Größe) nur einmal mit PyMuPDF geöffnet.
+"""
+
+import logging
+import os
+import threading
+from functools import lru_cache
+from typing import List, Optional, Tuple
+
+from ..config.settings import PDF_ANALYSIS_CACHE_SIZE
+
+logger = logging.getLogger(__name__)
+
+
+class PdfAnalysis:
+    """
+    Analyse-Ergebnis einer PDF-Dateiversion.
+
+    Enthält Seitenzahl und Text pro Seite. Bild-/Zeichnungs-Vorkommen und Render-Statistiken
+    (Weiß-Anteil, Tinten-Dichte) werden erst bei Bedarf über das offen gehaltene Dokument
+    berechnet - die Datei wird pro Version nur einmal geöffnet.
+    """
+
+    def __init__(self, path: str, mtime_ns: int, size: int):
+        """
+        Args:
+            path: Absoluter Pfad zur PDF-Datei
+            mtime_ns: Änderungszeitpunkt der analysierten Version
+            size: Dateigröße der analysierten Version
+        """
+        import fitz  # PyMuPDF
+
+        self.path = path
+        self.mtime_ns = mtime_ns
+        self.size = size
+
+        # Das Handle zeigt auch nach einem Ersetzen der Datei (OCR, Leerseiten) auf diese Version;
+        # PyMuPDF-Dokumente sind nicht threadsicher, Zugriffe laufen daher über den Lock.
+        # Geschlossen wird es mit dem Objekt, sobald es aus dem Cache fällt.
+        self._lock = threading.Lock()
+        self._doc = fitz.open(path)
+
+        with self._lock:
+            self.page_texts: List[str] = [page.get_text() for page in self._doc]
+
+        self.page_count = len(self.page_texts)
+        self._page_has_images: List[Optional[bool]] = [None] * self.page_count
+        self._page_has_drawings: List[Optional[bool]] = [None] * self.page_count
+        self._render_stats: Optional[List[Tuple[float, float]]] = None
+
+    def has_images(self, page_index: int) -> bool:
+        """Prüft, ob die Seite Bilder enthält (beim ersten Zugriff je Seite ermittelt)."""
+        if self._page_has_images[page_index] is None:
+            with self._lock:
+                self._page_has_images[page_index] = len(self._doc[page_index].get_images()) > 0
+        return self._page_has_images[page_index]
+
+    def has_drawings(self, page_index: int) -> bool:
+        """Prüft, ob die Seite Vektorzeichnungen enthält (teuer, daher nur bei Bedarf je Seite)."""
+        if self._page_has_drawings[page_index] is None:
+            with self._lock:
+                try:
+                    self._page_has_drawings[page_index] = len(self._doc[page_index].get_drawings()) > 0
+                except Exception:
+                    self._page_has_drawings[page_index] = False
+        return self._page_has_drawings[page_index]
+
+    def get_lines(self, page_index: int = 0, max_lines: Optional[int] = None) -> List[str]:
+        """Gibt die nicht-leeren, bereinigten Textzeilen einer Seite zurück."""
+        if page_index >= self.page_count:
+            return []
+
+        lines = [line.strip() for line in self.page_texts[page_index].split('\n') if line.strip()]
+        return lines[:max_lines] if max_lines is not None else lines
+
+    @property
+    def render_stats(self) -> List[Tuple[float, float]]:
+        """(white_ratio, ink_density) pro Seite; wird beim ersten Zugriff gerendert."""
+        if self._render_stats is None:
+            from .blank_page_detector import blank_page_detector
+
+            with self._lock:
+                self._render_stats = [blank_page_detector.analyze_page(page) for page in self._doc]
+
+        return self._render_stats
+
+    def __repr__(self):
+        return f"<PdfAnalysis(path='{os.path.basename(self.path)}', pages={self.page_count})>"
+
+
+@lru_cache(maxsize=PDF_ANALYSIS_CACHE_SIZE)
+def _load_analysis(path: str, mtime_ns: int, size: int) -> PdfAnalysis:
+    logger.debug(f"Analysiere PDF: {os.path.basename(path)}")
+    return PdfAnalysis(path, mtime_ns, size)
+
+
+def get_pdf_analysis(pdf_path: str) -> PdfAnalysis:
+    """
+    Liefert die (gecachte) Analyse der aktuellen Version einer PDF-Datei.
+
+    Ändert sich die Datei (z.B. durch OCR oder Leerseiten-Entfernung), entsteht
+    über mtime/Größe ein neuer Cache-Schlüssel und die Datei wird neu analysiert.
+    """
+    path = os.path.abspath(str(pdf_path))
+    stat = os.stat(path)
+    return _load_analysis(path, stat.st_mtime_ns, stat.st_size)
+
+
+def clear_pdf_analysis_cache():
+    """Leert den Analyse-Cache (für Tests oder manuelle Aktualisierung)."""
+    _load_analysis.cache_clear()
@@ -0,0 +1,270 @@
+"""
+Gestufte asyncio-Pipeline für die Dateiverarbeitung.
+Jede Stufe hat eine eigene begrenzte Queue und eine eigene Anzahl paralleler Worker, so dass
+z.B. die Klassifizierung von Datei N parallel zur OCR von Datei N+1 läuft. Ist eine Queue voll,
+blockiert die vorherige Stufe (bzw. das Einreihen in die erste Stufe) - Backpressure.
+"""
+
+import asyncio
+import inspect
+import logging
+import time
+from collections import deque
+from typing import Awaitable, Callable, Deque, Dict, List, Optional, Union
+
+logger = logging.getLogger(__name__)
+
+# Anzahl der letzten Jobs pro Stufe für Latenz-Statistiken
+LATENCY_WINDOW = 200
+
+
+class PipelineJob:
+    """Eine Datei auf dem Weg durch die Pipeline."""
+
+    def __init__(self, filename: str, **context):
+        """
+        Args:
+            filename: Ursprünglicher Dateiname im Input (Schlüssel für Status und Pfad)
+            context: Zusätzliche Daten, die Stufen untereinander weitergeben
+        """
+        self.filename = filename
+        self.context = context
+        self.stage: Optional[str] = None  # Name der aktuellen Stufe
+        self.created = time.perf_counter()
+        self.enqueued = self.created
+
+
+# Handler einer Stufe: True = an die nächste Stufe weitergeben, False = Job beenden
+StageHandler = Callable[[PipelineJob], Awaitable[bool]]
+
+# Fehler-Callback (synchron oder async), z.B. zum Verbuchen des Fehlschlags
+JobFailedCallback = Callable[[PipelineJob, Exception], Union[None, Awaitable[None]]]
+
+
+class PipelineStage:
+    """Eine Pipeline-Stufe mit begrenzter Queue, Worker-Tasks und Latenz-Statistiken."""
+
+    def __init__(self, name: str, handler: StageHandler, concurrency: int = 1, queue_size: int = 10):
+        """
+        Args:
+            name: Name der Stufe (für Logs und Statistiken)
+            handler: Async-Funktion, die einen Job verarbeitet
+            concurrency: Anzahl paralleler Worker dieser Stufe
+            queue_size: Maximale Anzahl wartender Jobs vor dieser Stufe
+        """
+        self.name = name
+        self.handler = handler
+        self.concurrency = max(1, concurrency)
+        self.queue_size = max(1, queue_size)
+
+        self.next_stage: Optional["PipelineStage"] = None
+        self.on_job_done: Optional[Callable[[PipelineJob], None]] = None
+        self.on_job_failed: Optional[JobFailedCallback] = None
+
+        self._queue: Optional[asyncio.Queue] = None
+        self._workers: List[asyncio.Task] = []
+        self._active = 0
+
+        self._wait_times: Deque[float] = deque(maxlen=LATENCY_WINDOW)
+        self._processing_times: Deque[float] = deque(maxlen=LATENCY_WINDOW)
+        self.stats = {
+            "processed": 0,
+            "stopped": 0,
+            "failed": 0
+        }
+
+    def start(self):
+        """Legt Queue und Worker-Tasks im laufenden Event-Loop an."""
+        self._queue = asyncio.Queue(maxsize=self.queue_size)
+        self._workers = [
+            asyncio.create_task(self._worker(), name=f"pipeline-{self.name}-{index}")
+            for index in range(self.concurrency)
+        ]
+
+    async def stop(self):
+        """Bricht die Worker ab; wartende Jobs werden verworfen."""
+        for worker in self._workers:
+            worker.cancel()
+        await asyncio.gather(*self._workers, return_exceptions=True)
+        self._workers = []
+        self._queue = None
+
+    async def put(self, job: PipelineJob):
+        """Reiht einen Job ein; wartet (asynchron), solange die Queue voll ist."""
+        job.enqueued = time.perf_counter()
+        await self._queue.put(job)
+
+    @property
+    def queue_depth(self) -> int:
+        return self._queue.qsize() if self._queue else 0
+
+    async def _worker(self):
+        while True:
+            job = await self._queue.get()
+            started = time.perf_counter()
+            self._wait_times.append(started - job.enqueued)
+            self._active += 1
+            job.stage = self.name
+
+            try:
+                forward = await self.handler(job)
+            except asyncio.CancelledError:
+                self._active -= 1
+                self._queue.task_done()
+                raise
+            except Exception as e:
+                logger.error(f"Fehler in Pipeline-Stufe {self.name} für {job.filename}: {e}")
+                self.stats["failed"] += 1
+                forward = False
+                if self.on_job_failed:
+                    # Ein Fehler im Callback (z.B. DB nicht erreichbar) darf den Worker nicht beenden
+                    try:
+                        result = self.on_job_failed(job, e)
+                        if inspect.isawaitable(result):
+                            await result
+                    except Exception as callback_error:
+                        logger.error(f"Fehler bei der Fehlerbehandlung für {job.filename}: {callback_error}")
+            else:
+                self.stats["processed" if forward else "stopped"] += 1
+
+            self._processing_times.append(time.perf_counter() - started)
+            self._active -= 1
+            self._queue.task_done()
+
+            if forward and self.next_stage:
+                # Backpressure: blockiert diesen Worker, bis die nächste Stufe Platz hat
+                await self.next_stage.put(job)
+            elif self.on_job_done:
+                self.on_job_done(job)
+
+    def get_stats(self) -> dict:
+        """Queue-Tiefe, Auslastung und Latenzen (Wartezeit in der Queue, Bearbeitungszeit)."""
+        return {
+            "concurrency": self.concurrency,
+            "queue_size": self.queue_size,
+            "queue_depth": self.queue_depth,
+            "active": self._active,
+            **self.stats,
+            "wait_seconds": _latency_summary(self._wait_times),
+            "processing_seconds": _latency_summary(self._processing_times)
+        }
+
+
+def _latency_summary(samples: Deque[float]) -> dict:
+    """Mittelwert, p50, p95 und Maximum der letzten Messwerte (Sekunden)."""
+    if not samples:
+        return {"count": 0, "avg": 0.0, "p50": 0.0, "p95": 0.0, "max": 0.0}
+
+    ordered = sorted(samples)
+    count = len(ordered)
+    return {
+        "count": count,
+        "avg": round(sum(ordered) / count, 3),
+        "p50": round(ordered[int(0.5 * (count - 1))], 3),
+        "p95": round(ordered[int(0.95 * (count - 1))], 3),
+        "max": round(ordered[-1], 3)
+    }
+
+
+class ProcessingPipeline:
+    """
+    Verkettet mehrere PipelineStages.
+
+    Ein Dateiname ist höchstens einmal gleichzeitig in der Pipeline; erneutes Einreihen
+    (z.B. durch einen Vollscan während die Datei noch klassifiziert wird) wird ignoriert.
+    """
+
+    def __init__(
+        self,
+        stages: List[PipelineStage],
+        on_job_failed: Optional[JobFailedCallback] = None,
+        on_job_done: Optional[Callable[[PipelineJob], None]] = None
+    ):
+        """
+        Args:
+            stages: Stufen in Verarbeitungsreihenfolge
+            on_job_failed: Wird bei einer Exception in einer Stufe aufgerufen (Job endet danach);
+                Fehler im Callback werden geloggt und beenden den Job trotzdem
+            on_job_done: Wird aufgerufen, sobald ein Job die Pipeline verlässt (auch nach Abbruch/Fehler)
+        """
+        if not stages:
+            raise ValueError("Pipeline benötigt mindestens eine Stufe")
+
+        self.stages = stages
+        self.running = False
+        self._on_job_done = on_job_done
+        self._in_flight: Dict[str, PipelineJob] = {}
+        self._completed = 0
+        self._total_seconds: Deque[float] = deque(maxlen=LATENCY_WINDOW)
+
+        for stage, next_stage in zip(stages, stages[1:]):
+            stage.next_stage = next_stage
+        for stage in stages:
+            stage.on_job_done = self._job_done
+            stage.on_job_failed = on_job_failed
+
+    def start(self):
+        """Startet alle Stufen."""
+        if self.running:
+            return
+
+        for stage in self.stages:
+            stage.start()
+        self.running = True
+
+        logger.info("Verarbeitungs-Pipeline gestartet - " + ", ".join(
+            f"{stage.name}: {stage.concurrency} Worker/Queue {stage.queue_size}" for stage in self.stages
+        ))
+
+    async def stop(self):
+        """Stoppt alle Stufen; Dateien in Bearbeitung werden beim nächsten Scan erneut eingeplant."""
+        if not self.running:
+            return
+
+        self.running = False
+        for stage in self.stages:
+            await stage.stop()
+        self._in_flight.clear()
+
+    def is_in_flight(self, filename: str) -> bool:
+        return filename in self._in_flight
+
+    async def submit(self, filename: str, **context) -> bool:
+        """
+        Reiht eine Datei in die erste Stufe ein.
+
+        Wartet, solange die erste Queue voll ist (Backpressure zum Scanner).
+
+        Returns:
+            False wenn die Datei bereits in der Pipeline ist
+        """
+        if not self.running:
+            raise RuntimeError("Verarbeitungs-Pipeline läuft nicht")
+
+        if filename in self._in_flight:
+            return False
+
+        job = PipelineJob(filename, **context)
+        self._in_flight[filename] = job
+        await self.stages[0].put(job)
+        return True
+
+    def _job_done(self, job: PipelineJob):
+        self._in_flight.pop(job.filename, None)
+        self._completed += 1
+        self._total_seconds.append(time.perf_counter() - job.created)
+        if self._on_job_done:
+            try:
+                self._on_job_done(job)
+            except Exception as e:
+                logger.error(f"Fehler nach Abschluss von {job.filename}: {e}")
+
+    def get_stats(self) -> dict:
+        """Statistiken je Stufe sowie Durchlaufzeit pro Datei."""
+        return {
+            "running": self.running,
+            "in_flight": len(self._in_flight),
+            "completed": self._completed,
+            "total_seconds": _latency_summary(self._total_seconds),
+            "stages": {stage.name: stage.get_stats() for stage in self.stages}
+        }
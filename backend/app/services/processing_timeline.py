@@ -0,0 +1,154 @@
+"""
+Erfasst Start/Ende jedes Verarbeitungsschritts pro Dokument (Tabelle verarbeitungsschritte).
+Schlüssel ist der ursprüngliche Dateiname im Input; die Dokument-ID wird zugeordnet, sobald sie bekannt ist.
+
+Geschrieben wird gepuffert von einem eigenen Thread, damit Schritte im Event-Loop nicht auf die DB warten.
+"""
+
+import logging
+import queue
+import threading
+import time
+from contextlib import contextmanager
+from datetime import datetime
+from typing import Dict, Iterator, List, Optional, Tuple
+
+from ..repositories.verarbeitungsschritt_repository import VerarbeitungsschrittRepository
+from .metrics import STEP_DURATION
+
+logger = logging.getLogger(__name__)
+
+# Maximale Anzahl Einträge, die der Schreib-Thread in einem Durchgang speichert
+TIMELINE_BATCH_SIZE = 100
+
+
+class TimelineStep:
+    """Laufender Schritt; Handler können ihn ohne Exception als fehlgeschlagen markieren."""
+
+    def __init__(self):
+        self.erfolgreich = True
+        self.meldung: Optional[str] = None
+
+    def fail(self, meldung: str):
+        self.erfolgreich = False
+        self.meldung = meldung
+
+
+class ProcessingTimeline:
+    """Puffert Verarbeitungsschritte und merkt sich Durchlauf-Start und Dokument-ID je Dateiname."""
+
+    def __init__(self):
+        self._dokument_ids: Dict[str, int] = {}
+        self._durchlauf_start: Dict[str, datetime] = {}
+        self._lock = threading.Lock()
+        self._pending: "queue.Queue[Tuple[str, tuple]]" = queue.Queue()
+        self._writer: Optional[threading.Thread] = None
+
+    @contextmanager
+    def step(self, dateiname: str, schritt: str) -> Iterator[TimelineStep]:
+        """
+        Misst einen Schritt und reiht ihn beim Verlassen des with-Blocks zum Speichern ein.
+
+        Eine Exception markiert den Schritt als fehlgeschlagen und wird weitergereicht.
+
+        Usage:
+            with processing_timeline.step(filename, "ocr") as step:
+                if not ok:
+                    step.fail("OCR fehlgeschlagen")
+        """
+        current = TimelineStep()
+        gestartet_am = datetime.utcnow()
+        started = time.perf_counter()
+        with self._lock:
+            self._durchlauf_start.setdefault(dateiname, gestartet_am)
+
+        try:
+            yield current
+        except Exception as e:
+            current.fail(str(e))
+            raise
+        finally:
+            duration = time.perf_counter() - started
+            STEP_DURATION.observe(duration, step=schritt)
+            with self._lock:
+                dokument_id = self._dokument_ids.get(dateiname)
+            self._enqueue("schritt", (
+                dateiname,
+                schritt,
+                gestartet_am,
+                datetime.utcnow(),
+                current.erfolgreich,
+                current.meldung,
+                dokument_id
+            ))
+
+    def link_dokument(self, dateiname: str, dokument_id: int):
+        """
+        Ordnet die Schritte des aktuellen Durchlaufs und künftige Schritte dieser Datei dem Dokument zu.
+
+        Schritte aus früheren Durchläufen bleiben unverändert - der Dateiname kann inzwischen
+        für eine andere Datei wiederverwendet worden sein.
+        """
+        with self._lock:
+            if self._dokument_ids.get(dateiname) == dokument_id:
+                return
+            self._dokument_ids[dateiname] = dokument_id
+            seit = self._durchlauf_start.setdefault(dateiname, datetime.utcnow())
+        self._enqueue("zuordnung", (dateiname, dokument_id, seit))
+
+    def finish(self, dateiname: str):
+        """Beendet den Durchlauf und vergisst die Zuordnung, wenn eine Datei die Pipeline verlassen hat."""
+        with self._lock:
+            self._dokument_ids.pop(dateiname, None)
+            self._durchlauf_start.pop(dateiname, None)
+
+    def flush(self):
+        """Wartet, bis alle gepufferten Einträge gespeichert sind (z.B. beim Herunterfahren)."""
+        self._pending.join()
+
+    def _enqueue(self, art: str, daten: tuple):
+        with self._lock:
+            if self._writer is None or not self._writer.is_alive():
+                self._writer = threading.Thread(
+                    target=self._write_loop, name="processing-timeline", daemon=True
+                )
+                self._writer.start()
+        self._pending.put((art, daten))
+
+    def _write_loop(self):
+        while True:
+            batch = [self._pending.get()]
+            while len(batch) < TIMELINE_BATCH_SIZE:
+                try:
+                    batch.append(self._pending.get_nowait())
+                except queue.Empty:
+                    break
+
+            try:
+                self._write(batch)
+            except Exception as e:
+                logger.error(f"❌ Fehler beim Speichern der Zeitleiste: {e}")
+            finally:
+                for _ in batch:
+                    self._pending.task_done()
+
+    @staticmethod
+    def _write(batch: List[Tuple[str, tuple]]):
+        """Speichert Schritte gesammelt; Zuordnungen in Reihenfolge, damit sie davor erfasste Schritte erfassen."""
+        schritte = []
+        for art, daten in batch:
+            if art == "schritt":
+                schritte.append(daten)
+                continue
+
+            if schritte:
+                VerarbeitungsschrittRepository.create_many(schritte)
+                schritte = []
+            VerarbeitungsschrittRepository.link_dokument(*daten)
+
+        if schritte:
+            VerarbeitungsschrittRepository.create_many(schritte)
+
+
+# Globale Instanz
+processing_timeline = ProcessingTimeline()
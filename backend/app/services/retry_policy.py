@@ -0,0 +1,50 @@
+"""
+Wiederholungsstrategie für fehlgeschlagene Verarbeitungsstufen.
+Exponentielles Backoff mit Jitter, nach RETRY_MAX_ATTEMPTS Versuchen Dead-Letter.
+"""
+
+import random
+from datetime import datetime, timedelta
+from typing import Optional
+
+from ..config.settings import RETRY_BASE_DELAY, RETRY_MAX_ATTEMPTS, RETRY_MAX_DELAY
+
+
+class RetryPolicy:
+    """
+    Berechnet Wartezeiten zwischen Versuchen.
+
+    Wartezeit nach Versuch n: base * 2^(n-1), begrenzt auf max_delay. Davon ist die Hälfte fest,
+    die andere Hälfte zufällig ("equal jitter"), damit gleichzeitig fehlgeschlagene Dateien
+    (z.B. bei DB-Ausfall) nicht alle im selben Moment erneut anlaufen.
+    """
+
+    def __init__(self, max_attempts: int = 5, base_delay: float = 60.0, max_delay: float = 6 * 3600.0):
+        """
+        Args:
+            max_attempts: Anzahl Versuche bis zum Dead-Letter-Status
+            base_delay: Wartezeit nach dem ersten Fehlschlag in Sekunden
+            max_delay: Obergrenze der Wartezeit in Sekunden
+        """
+        self.max_attempts = max(1, max_attempts)
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+
+    def is_exhausted(self, attempts: int) -> bool:
+        """True wenn nach dieser Anzahl Versuche kein weiterer folgt."""
+        return attempts >= self.max_attempts
+
+    def delay_seconds(self, attempts: int) -> float:
+        """Wartezeit nach dem attempts-ten Fehlschlag (mit Jitter)."""
+        delay = min(self.max_delay, self.base_delay * 2 ** max(0, attempts - 1))
+        return delay / 2 + random.uniform(0, delay / 2)
+
+    def next_attempt_at(self, attempts: int, now: Optional[datetime] = None) -> Optional[datetime]:
+        """Zeitpunkt des nächsten Versuchs oder None wenn die Versuche erschöpft sind."""
+        if self.is_exhausted(attempts):
+            return None
+        return (now or datetime.utcnow()) + timedelta(seconds=self.delay_seconds(attempts))
+
+
+# Globale Strategie aus den Settings
+retry_policy = RetryPolicy(RETRY_MAX_ATTEMPTS, RETRY_BASE_DELAY, RETRY_MAX_DELAY)
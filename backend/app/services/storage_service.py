@@ -11,6 +11,8 @@ from pathlib import Path
 from typing import Dict, List, Optional, Tuple
 
 from ..config.settings import PDF_CATEGORIES, PDF_INPUT_DIR
+from ..repositories.verarbeitungsstatus_repository import VerarbeitungsstatusRepository
+from .document_path_resolver import document_path_resolver
 from .ocr_service import OCRService
 
 # Logger einrichten
@@ -22,7 +24,8 @@ class StorageService:
     @staticmethod
     def get_input_files() -> List[Dict[str, str]]:
         """
-        Ruft alle PDF-Dateien im Eingangsverzeichnis ab und führt OCR durch.
+        Listet alle PDF-Dateien im Eingangsverzeichnis auf (ohne OCR).
+        OCR und DB-Eintrag übernimmt der OCR-Scheduler.
         
         Returns:
             Liste von Dictionaries mit Dateinamen und Pfaden
@@ -30,29 +33,13 @@ class StorageService:
         files = []
         
         try:
-            for filename in os.listdir(PDF_INPUT_DIR):
-                if filename.lower().endswith('.pdf'):
-                    file_path = os.path.join(PDF_INPUT_DIR, filename)
-                    
-                    # Prüfen ob bereits OCR-verarbeitet (Marker-Datei oder Zeitstempel)
-                    ocr_marker_path = file_path + '.ocr_processed'
-                    
-                    if not os.path.exists(ocr_marker_path):
-                        logger.info(f"Führe OCR für neue Datei durch: {filename}")
-                        success = StorageService._process_pdf_with_ocr_inplace(file_path)
-                        
-                        if success:
-                            # Marker-Datei erstellen
-                            with open(ocr_marker_path, 'w') as marker:
-                                marker.write(f"OCR processed at: {os.path.getmtime(file_path)}")
-                            logger.info(f"OCR erfolgreich für: {filename}")
-                        else:
-                            logger.warning(f"OCR fehlgeschlagen für: {filename}")
-                    
-                    files.append({
-                        "dateiname": filename,
-                        "pfad": str(file_path)
-                    })
+            with os.scandir(PDF_INPUT_DIR) as entries:
+                for entry in entries:
+                    if entry.is_file() and entry.name.lower().endswith('.pdf'):
+                        files.append({
+                            "dateiname": entry.name,
+                            "pfad": entry.path
+                        })
         except Exception as e:
             logger.error(f"Fehler beim Lesen des Eingangsverzeichnisses: {str(e)}")
         
@@ -125,12 +112,11 @@ class StorageService:
             
             # Datei verschieben
             shutil.move(str(source_path), str(target_path))
+            document_path_resolver.record_move(source_path, target_path)
             logger.info(f"Datei verschoben: {source_path} -> {target_path}")
             
-            # OCR-Marker-Datei auch verschieben/löschen
-            ocr_marker = str(source_path) + '.ocr_processed'
-            if os.path.exists(ocr_marker):
-                os.remove(ocr_marker)
+            # Verarbeitungsstatus der Input-Datei entfernen
+            VerarbeitungsstatusRepository.delete_for_file(filename)
             
             return True, str(target_path)
             
@@ -140,7 +126,7 @@ class StorageService:
     
     @staticmethod
     def delete_file(file_path: str) -> bool:
-        """Löscht eine Datei und ihre OCR-Marker-Datei.
+        """Löscht eine Datei und ihren Verarbeitungsstatus.
         
         Args:
             file_path: Pfad zur zu löschenden Datei
@@ -153,10 +139,8 @@ class StorageService:
                 os.remove(file_path)
                 logger.info(f"Datei gelöscht: {file_path}")
                 
-                # OCR-Marker-Datei auch löschen
-                ocr_marker = file_path + '.ocr_processed'
-                if os.path.exists(ocr_marker):
-                    os.remove(ocr_marker)
+                # Verarbeitungsstatus auch löschen
+                VerarbeitungsstatusRepository.delete_for_file(os.path.basename(file_path))
                     
                 return True
             else:
@@ -13,6 +13,8 @@ from sqlalchemy.orm import joinedload
 from ..config.settings import PDF_PROCESSED_DIR
 from ..database.postgres_connection import get_db_session
 from ..models.database import Kategorie, Unterkategorie
+from ..repositories.verarbeitungsstatus_repository import VerarbeitungsstatusRepository
+from .document_path_resolver import document_path_resolver
 
 logger = logging.getLogger(__name__)
 
@@ -117,16 +119,10 @@ class DBBasedStorageService:
             
             # Datei verschieben
             shutil.move(source_path, str(target_path))
+            document_path_resolver.record_move(source_path, target_path)
             
-            # OCR-Marker auch verschieben/entfernen
-            ocr_marker = source_path + '.ocr_processed'
-            if os.path.exists(ocr_marker):
-                os.remove(ocr_marker)
-            
-            # Document Processing Marker auch verschieben/entfernen
-            doc_marker = source_path + '.doc_processed'
-            if os.path.exists(doc_marker):
-                os.remove(doc_marker)
+            # Verarbeitungsstatus (OCR, Document Processing) der Quelldatei entfernen
+            VerarbeitungsstatusRepository.delete_for_file(os.path.basename(source_path))
             
             logger.info(f"Datei verschoben: {source_path} -> {target_path}")
             return True, str(target_path)
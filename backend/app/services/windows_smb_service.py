@@ -13,6 +13,8 @@ from datetime import datetime
 from pathlib import Path
 from typing import Dict, List, Optional, Tuple
 
+from .metrics import SMB_BYTES_DOWNLOADED
+
 logger = logging.getLogger(__name__)
 
 class WindowsSMBService:
@@ -428,6 +430,7 @@ class WindowsSMBService:
                 result = subprocess.run(cmd, capture_output=True, text=True, timeout=60)
                 
                 if result.returncode == 0 and os.path.exists(local_path):
+                    SMB_BYTES_DOWNLOADED.inc(os.path.getsize(local_path))
                     logger.info(f"✅ Datei heruntergeladen: {original_name} -> {local_filename}")
                     return True, local_path, "Download erfolgreich"
                 else:
@@ -0,0 +1,99 @@
+#!/usr/bin/env python3
+"""
+Micro-Benchmark: Leerseiten-Erkennung alt (PNG + PIL-Histogramm) vs. neu (NumPy auf Pixmap-Samples).
+
+Erzeugt ein synthetisches PDF mit Text-, Grafik- und Leerseiten und misst beide Verfahren.
+
+Usage:
+    python benchmarks/benchmark_blank_pages.py [--pages 200] [--rounds 3]
+"""
+
+import argparse
+import io
+import os
+import sys
+import time
+
+# Path für Imports hinzufügen
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import fitz
+from PIL import Image
+
+from app.services.blank_page_detector import BlankPageDetector
+
+
+def build_test_pdf(page_count: int) -> fitz.Document:
+    """Erstellt ein PDF im Speicher: jede dritte Seite leer, sonst Text bzw. Grafik."""
+    doc = fitz.open()
+    for index in range(page_count):
+        page = doc.new_page(width=595, height=842)  # A4
+        if index % 3 == 1:
+            for line in range(40):
+                page.insert_text((50, 60 + line * 18), f"Wareneingang Zeile {line} Artikel {index}")
+        elif index % 3 == 2:
+            page.draw_rect(fitz.Rect(80, 80, 500, 700), color=(0, 0, 0), fill=(0.3, 0.3, 0.3))
+    return doc
+
+
+def legacy_find_blank_pages(doc: fitz.Document) -> list:
+    """Bisheriges Verfahren aus OCRScheduler._remove_blank_pages_pillow (nur Erkennung)."""
+    blank_pages = []
+    for page_num in range(len(doc)):
+        page = doc[page_num]
+        pix = page.get_pixmap(matrix=fitz.Matrix(0.5, 0.5))
+        img = Image.open(io.BytesIO(pix.tobytes("png")))
+        img_gray = img.convert('L')
+
+        histogram = img_gray.histogram()
+        total_pixels = img_gray.size[0] * img_gray.size[1]
+        white_ratio = sum(histogram[250:]) / total_pixels
+
+        if white_ratio > 0.98:
+            page_text = page.get_text().strip()
+            meaningful_text = len(page_text) > 10 and any(c.isalnum() for c in page_text)
+            if not meaningful_text:
+                blank_pages.append(page_num)
+
+        img.close()
+        img_gray.close()
+    return blank_pages
+
+
+def measure(label: str, func, doc: fitz.Document, rounds: int) -> list:
+    """Führt func mehrfach aus und gibt die beste Laufzeit aus."""
+    best = float("inf")
+    result = []
+    for _ in range(rounds):
+        started = time.perf_counter()
+        result = func(doc)
+        best = min(best, time.perf_counter() - started)
+
+    per_page_ms = best / len(doc) * 1000
+    print(f"{label:<28} {best:8.3f}s  {per_page_ms:7.2f} ms/Seite  {len(result)} Leerseiten")
+    return result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--pages", type=int, default=200)
+    parser.add_argument("--rounds", type=int, default=3)
+    args = parser.parse_args()
+
+    doc = build_test_pdf(args.pages)
+    detector = BlankPageDetector({"enabled": True})
+
+    print(f"📄 Testdokument: {args.pages} Seiten, {args.rounds} Durchläufe (bester Wert)")
+    legacy = measure("Alt (PNG + PIL-Histogramm)", legacy_find_blank_pages, doc, args.rounds)
+    vectorized = measure("Neu (NumPy, Zero-Copy)", detector.find_blank_pages, doc, args.rounds)
+
+    if legacy != vectorized:
+        print(f"⚠️  Ergebnisse weichen ab: alt={legacy[:10]}... neu={vectorized[:10]}...")
+    else:
+        print("✅ Beide Verfahren erkennen dieselben Leerseiten")
+
+    doc.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,113 @@
+#!/usr/bin/env python3
+"""
+Benchmark: CSV-Matching für Wareneingänge, linearer Scan vs. Lieferscheinnummer-Index.
+
+Erzeugt synthetische CSV-Datensätze (Standard: 1 Mio.) und misst für eine Reihe von
+Lieferscheinnummern (Treffer und Nicht-Treffer) die exakte Suche inkl. Ähnlichkeits-Diagnose.
+
+Usage:
+    python benchmarks/benchmark_csv_index.py [--rows 1000000] [--queries 200]
+"""
+
+import argparse
+import os
+import random
+import sys
+import time
+
+# Path für Imports hinzufügen
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.services.document_processing.csv_index import CsvLieferscheinIndex
+
+
+def build_rows(row_count: int) -> list:
+    """Erzeugt CSV-Datensätze mit durchschnittlich 5 Positionen pro Lieferschein."""
+    rnd = random.Random(42)
+    rows = []
+    for index in range(row_count):
+        nummer = f"LS{index // 5:07d}/{rnd.randint(10, 99)}" if index % 5 == 0 else rows[-1]['LIEFERSCHEINNR']
+        rows.append({
+            'LIEFERSCHEINNR': nummer,
+            'ARTIKEL': f"ART{rnd.randint(1000, 9999)}",
+            'SNNR': f"CH{index:08d}"
+        })
+    return rows
+
+
+def linear_lookup(rows: list, lieferscheinnummer: str) -> tuple:
+    """Bisheriges Verfahren aus WareneingangProcessor._import_csv_data (ohne DB-Import)."""
+    matches = []
+    found_similar = []
+    for csv_row in rows:
+        csv_lieferscheinnr = str(csv_row.get('LIEFERSCHEINNR', '')).strip()
+        if csv_lieferscheinnr == lieferscheinnummer:
+            matches.append(csv_row)
+        elif (csv_lieferscheinnr and
+              len(csv_lieferscheinnr) >= 3 and
+              (lieferscheinnummer in csv_lieferscheinnr or csv_lieferscheinnr in lieferscheinnummer)):
+            found_similar.append(csv_lieferscheinnr)
+    return matches, list(set(found_similar[:5]))
+
+
+def indexed_lookup(index: CsvLieferscheinIndex, lieferscheinnummer: str) -> tuple:
+    matches = index.find_exact(lieferscheinnummer)
+    similar = [] if matches else index.find_similar(lieferscheinnummer, limit=5)
+    return matches, similar
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, default=1_000_000)
+    parser.add_argument("--queries", type=int, default=200)
+    parser.add_argument("--linear-queries", type=int, default=5,
+                        help="Anzahl Abfragen für den (langsamen) linearen Scan")
+    args = parser.parse_args()
+
+    print(f"📄 Erzeuge {args.rows:,} CSV-Datensätze ...")
+    rows = build_rows(args.rows)
+
+    rnd = random.Random(7)
+    sample = rnd.sample(rows, args.queries // 2)
+    queries = [row['LIEFERSCHEINNR'] for row in sample]
+    # Nicht vorhandene Nummern, die als Teilstring vorkommen (Ähnlichkeits-Diagnose)
+    queries += [row['LIEFERSCHEINNR'][:-3] + "X" for row in sample]
+
+    started = time.perf_counter()
+    index = CsvLieferscheinIndex(rows)
+    build_seconds = time.perf_counter() - started
+    print(f"🏗️  Index-Aufbau: {build_seconds:.2f}s ({index.key_count:,} Lieferscheinnummern)")
+
+    started = time.perf_counter()
+    for query in queries:
+        indexed_lookup(index, query)
+    indexed_ms = (time.perf_counter() - started) / len(queries) * 1000
+
+    linear_queries = queries[:args.linear_queries // 2 + 1] + queries[-(args.linear_queries // 2):]
+    started = time.perf_counter()
+    for query in linear_queries:
+        linear_lookup(rows, query)
+    linear_ms = (time.perf_counter() - started) / len(linear_queries) * 1000
+
+    # Exakte Treffer müssen identisch sein
+    def project(matches):
+        return [(row.get('LIEFERSCHEINNR'), row.get('SNNR')) for row in matches]
+
+    mismatches = sum(
+        1 for query in linear_queries
+        if project(linear_lookup(rows, query)[0]) != project(indexed_lookup(index, query)[0])
+    )
+
+    print(f"{'Linearer Scan':<20} {linear_ms:10.3f} ms/Abfrage  ({len(linear_queries)} Abfragen)")
+    print(f"{'Index':<20} {indexed_ms:10.3f} ms/Abfrage  ({len(queries)} Abfragen)")
+    print(f"⚡ Faktor: {linear_ms / indexed_ms:,.0f}x, Index amortisiert nach "
+          f"{build_seconds * 1000 / max(linear_ms - indexed_ms, 1e-9):.1f} Abfragen")
+
+    if mismatches:
+        print(f"⚠️  {mismatches} Abfragen mit abweichenden exakten Treffern")
+    else:
+        print("✅ Exakte Treffer identisch")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,84 @@
+#!/usr/bin/env python3
+"""
+Speichervergleich für geladene ERP-CSV-Datensätze:
+Liste von Dicts (bisheriger Cache) vs. Liste von Tupeln vs. spaltenorientierter Speicher.
+
+Gemessen wird der belegte Speicher nach dem Laden (tracemalloc, aktuelle Belegung).
+
+Usage:
+    python benchmarks/benchmark_csv_memory.py [--rows 200000]
+"""
+
+import argparse
+import gc
+import os
+import sys
+import tempfile
+import tracemalloc
+
+# Path für Imports hinzufügen
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from benchmark_csv_reader import COLUMNS, legacy_load_single_csv, write_test_csv
+
+from app.services.document_processing.csv_column_store import ChargenEinkaufColumnStore
+from app.services.document_processing.csv_reader import read_csv_records
+
+
+def load_tuples(csv_path: str) -> list:
+    _, records = read_csv_records(csv_path)
+    return list(records)
+
+
+def load_column_store(csv_path: str) -> ChargenEinkaufColumnStore:
+    _, records = read_csv_records(csv_path)
+    return ChargenEinkaufColumnStore.from_rows(records)
+
+
+def measure(label: str, loader, csv_path: str, row_count: int):
+    """Lädt die Datei und gibt die danach belegte Speichermenge aus."""
+    gc.collect()
+    tracemalloc.start()
+    data = loader(csv_path)
+    gc.collect()
+    current, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    print(f"{label:<30} {current / 1024 ** 2:9.1f} MB  {current / row_count:8.0f} B/Zeile  "
+          f"(Peak beim Laden {peak / 1024 ** 2:.1f} MB)")
+    return data
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, default=200_000)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as temp_dir:
+        csv_path = os.path.join(temp_dir, "export.csv")
+        write_test_csv(csv_path, args.rows, ';')
+        print(f"📄 Testdatei: {args.rows:,} Zeilen, {len(COLUMNS)} Spalten, "
+              f"{os.path.getsize(csv_path) / 1024 ** 2:.1f} MB")
+
+        dicts = measure("Liste von Dicts (alt)", legacy_load_single_csv, csv_path, args.rows)
+        expected = [dict(row) for row in dicts[:1000]]
+        del dicts
+
+        tuples = measure("Liste von Tupeln (CsvRecord)", load_tuples, csv_path, args.rows)
+        del tuples
+
+        store = measure("Spaltenspeicher", load_column_store, csv_path, args.rows)
+        actual = [dict(store.row(row_id)) for row_id in range(min(1000, len(store)))]
+
+        if actual != expected:
+            print("⚠️  Zeilen-Ansichten weichen von den Dicts ab")
+        else:
+            print("✅ Zeilen-Ansichten liefern dieselben Werte wie die Dicts")
+
+        distinct = store.distinct_counts()
+        print("📊 Unterschiedliche Werte (Auszug): " +
+              ", ".join(f"{field}={distinct[field]:,}" for field in ('LINAME', 'LIEFERSCHEINNR', 'SNNR', 'LIEFERDATUM')))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,125 @@
+#!/usr/bin/env python3
+"""
+Benchmark: CSV-Einlesen alt (Delimiter-Probieren + Dict pro Zeile) vs. neu (Sniffing + ein Durchlauf, Tupel).
+
+Erzeugt einen synthetischen ERP-Export mit den Spalten der Chargen-Tabelle und misst
+Parse-Rate (Zeilen/s) und Spitzen-Speicher (tracemalloc) beider Verfahren.
+
+Usage:
+    python benchmarks/benchmark_csv_reader.py [--rows 200000] [--delimiter ';']
+"""
+
+import argparse
+import csv
+import gc
+import os
+import random
+import sys
+import tempfile
+import time
+import tracemalloc
+
+# Path für Imports hinzufügen
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.services.document_processing.csv_reader import read_csv_records
+
+COLUMNS = [
+    'LINR', 'LINAME', 'NAME1', 'BELFD', 'TLNR', 'AUART', 'AFTNR', 'APS', 'ABSN', 'ATNR',
+    'ARTIKEL', 'MATERIALNR', 'URLND', 'WARTARNR', 'MENGE', 'ERFMENGE', 'GEBINDEME', 'SNNR',
+    'SNNRALT', 'EINZELEK', 'LIEFERSCHEINNR', 'LIEFERDATUM', 'RENREX', 'REDAT', 'BIDSER', 'BID'
+]
+
+
+def write_test_csv(path: str, row_count: int, delimiter: str):
+    """Schreibt einen ERP-ähnlichen Export (UTF-8 mit BOM, wenige Lieferanten, viele Chargen)."""
+    rnd = random.Random(42)
+    lieferanten = [f"Lieferant {i} GmbH" for i in range(50)]
+    with open(path, 'w', encoding='utf-8-sig', newline='') as f:
+        writer = csv.writer(f, delimiter=delimiter)
+        writer.writerow(COLUMNS)
+        for index in range(row_count):
+            lieferant = rnd.randrange(len(lieferanten))
+            writer.writerow([
+                f"{lieferant:05d}", lieferanten[lieferant], " Müller Stahl ", str(index % 10), "1", "WE",
+                f"A{index // 20:07d}", str(index % 20), "0", f"T{rnd.randint(1, 500)}",
+                f"Artikel {rnd.randint(1, 2000)}", f"M{rnd.randint(1, 2000):06d}", "DE", "7318",
+                f"{rnd.randint(1, 500)},00", f"{rnd.randint(1, 500)},00", "ST",
+                f"CH{index:09d}", "", f"{rnd.randint(1, 9999)},{rnd.randint(0, 99):02d}",
+                f"LS{index // 5:07d}", "01.02.2024", f"R{index // 50:06d}", "15.02.2024", "", str(index)
+            ])
+
+
+def legacy_load_single_csv(csv_path: str) -> list:
+    """Bisheriges Verfahren aus WareneingangProcessor._load_single_csv."""
+    csv_data = []
+    with open(csv_path, 'rb') as f:
+        raw_data = f.read(1024)
+    encoding = 'utf-8-sig' if raw_data.startswith(b'\xef\xbb\xbf') else 'utf-8'
+
+    for delimiter in [';', ',', '\t', '|']:
+        try:
+            with open(csv_path, 'r', encoding=encoding, errors='ignore') as csvfile:
+                reader = csv.DictReader(csvfile, delimiter=delimiter)
+                first_row = next(reader, None)
+                if first_row and len(first_row) > 10:
+                    csvfile.seek(0)
+                    reader = csv.DictReader(csvfile, delimiter=delimiter)
+                    for row in reader:
+                        csv_data.append({key.strip(): value.strip() for key, value in row.items()})
+                    break
+        except Exception:
+            continue
+    return csv_data
+
+
+def streaming_load(csv_path: str) -> list:
+    _, records = read_csv_records(csv_path)
+    return list(records)
+
+
+def measure(label: str, func, csv_path: str) -> list:
+    """Misst die Laufzeit ohne und den Spitzen-Speicher mit tracemalloc (zwei Durchläufe)."""
+    gc.collect()
+    started = time.perf_counter()
+    rows = func(csv_path)
+    duration = time.perf_counter() - started
+    del rows
+
+    gc.collect()
+    tracemalloc.start()
+    rows = func(csv_path)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    print(f"{label:<32} {duration:7.2f}s  {len(rows) / duration:12,.0f} Zeilen/s  Peak {peak / 1024 ** 2:8.1f} MB")
+    return rows
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, default=200_000)
+    parser.add_argument("--delimiter", default=';')
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as temp_dir:
+        csv_path = os.path.join(temp_dir, "export.csv")
+        write_test_csv(csv_path, args.rows, args.delimiter)
+        size_mb = os.path.getsize(csv_path) / 1024 ** 2
+        print(f"📄 Testdatei: {args.rows:,} Zeilen, {len(COLUMNS)} Spalten, {size_mb:.1f} MB, Delimiter {args.delimiter!r}")
+
+        legacy = measure("Alt (DictReader, Dict pro Zeile)", legacy_load_single_csv, csv_path)
+        legacy_sample = [(row['LIEFERSCHEINNR'], row['SNNR'], row['NAME1']) for row in legacy[:1000]]
+        del legacy
+
+        streaming = measure("Neu (Sniffing, Tupel)", streaming_load, csv_path)
+        streaming_sample = [(row.get('LIEFERSCHEINNR'), row.get('SNNR'), row.get('NAME1')) for row in streaming[:1000]]
+
+        if legacy_sample != streaming_sample:
+            print("⚠️  Inhalte weichen ab")
+        else:
+            print("✅ Beide Verfahren liefern dieselben Werte")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,126 @@
+#!/usr/bin/env python3
+"""
+Benchmark: Volltextsuche über dokument_seiten (deutscher tsvector, GIN-Index).
+
+Legt synthetische Dokumente mit Seitentext an (Standard: 100.000 Dokumente à 2 Seiten),
+misst die Latenz von /dokumente/suche (AsyncDokumentSeiteRepository.search) für
+seltene, mittlere und häufige Begriffe inkl. Folgeseite und räumt danach wieder auf.
+
+Nur gegen eine Test-Datenbank ausführen (DATABASE_URL), die Migrationen müssen angewendet sein.
+
+Usage:
+    python benchmarks/benchmark_volltextsuche.py [--documents 100000] [--pages 2] [--runs 20]
+"""
+
+import argparse
+import asyncio
+import os
+import random
+import statistics
+import sys
+import time
+
+# Path für Imports hinzufügen
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.database.postgres_connection import dispose_async_engine, engine, get_db_session
+from app.models.database import Dokument, DokumentSeite
+from app.repositories.dokument_seite_repository import AsyncDokumentSeiteRepository
+from sqlalchemy import delete, insert, select, text
+
+PREFIX = "bench_volltext_"
+BATCH_SIZE = 5000
+
+WOERTER = (
+    "Lieferschein Rechnung Bestellung Artikel Menge Lieferung Ware Eingang Prüfung Charge "
+    "Seriennummer Material Kunde Lieferant Position Betrag Steuer Zahlung Auftrag Versand "
+    "Palette Karton Gewicht Datum Nummer Anschrift Lager Rücksendung Reklamation Gutschrift"
+).split()
+
+# (Beschreibung, Suchbegriff) - Trefferhäufigkeit von selten bis sehr häufig
+ABFRAGEN = [
+    ("selten (Seriennummer)", "SN00047111"),
+    ("mittel (Phrase)", '"Reklamation Gutschrift"'),
+    ("häufig (ein Wort)", "Lieferschein"),
+    ("häufig (UND)", "Lieferung Palette"),
+]
+
+
+def build_page(rnd: random.Random, dokument_index: int, seite: int) -> str:
+    words = [rnd.choice(WOERTER) for _ in range(150)]
+    words.insert(rnd.randint(0, len(words)), f"SN{dokument_index:07d}{seite}")
+    return " ".join(words)
+
+
+def populate(document_count: int, page_count: int):
+    rnd = random.Random(42)
+    started = time.perf_counter()
+
+    for offset in range(0, document_count, BATCH_SIZE):
+        batch = range(offset, min(offset + BATCH_SIZE, document_count))
+        with get_db_session() as session:
+            ids = session.execute(
+                insert(Dokument).returning(Dokument.id),
+                [{"dateiname": f"{PREFIX}{index}.pdf", "pfad": f"/bench/{PREFIX}{index}.pdf"} for index in batch]
+            ).scalars().all()
+            session.execute(insert(DokumentSeite), [
+                {"dokument_id": dokument_id, "seite": seite, "text": build_page(rnd, index, seite)}
+                for dokument_id, index in zip(ids, batch)
+                for seite in range(1, page_count + 1)
+            ])
+
+    with engine.connect() as connection:
+        connection.execute(text("ANALYZE dokument_seiten"))
+        connection.commit()
+
+    print(f"{document_count} Dokumente mit je {page_count} Seiten angelegt in {time.perf_counter() - started:.1f}s")
+
+
+def cleanup():
+    with get_db_session() as session:
+        ids = select(Dokument.id).where(Dokument.dateiname.like(f"{PREFIX}%")).scalar_subquery()
+        session.execute(delete(DokumentSeite).where(DokumentSeite.dokument_id.in_(ids)))
+        session.execute(delete(Dokument).where(Dokument.dateiname.like(f"{PREFIX}%")))
+
+
+async def measure(runs: int):
+    print(f"{'Abfrage':<24} {'Treffer':>8} {'p50 ms':>8} {'p95 ms':>8} {'Folgeseite p50':>15}")
+
+    for beschreibung, suchbegriff in ABFRAGEN:
+        first_page, next_page = [], []
+        treffer = 0
+        for _ in range(runs):
+            started = time.perf_counter()
+            ergebnis = await AsyncDokumentSeiteRepository.search(suchbegriff, limit=20)
+            first_page.append((time.perf_counter() - started) * 1000)
+            treffer = len(ergebnis["treffer"])
+
+            if ergebnis["next_cursor"]:
+                started = time.perf_counter()
+                await AsyncDokumentSeiteRepository.search(suchbegriff, limit=20, cursor=ergebnis["next_cursor"])
+                next_page.append((time.perf_counter() - started) * 1000)
+
+        p95 = statistics.quantiles(first_page, n=20)[-1] if len(first_page) > 1 else first_page[0]
+        folgeseite = f"{statistics.median(next_page):.1f}" if next_page else "-"
+        print(f"{beschreibung:<24} {treffer:>8} {statistics.median(first_page):>8.1f} {p95:>8.1f} {folgeseite:>15}")
+
+    await dispose_async_engine()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--documents", type=int, default=100000, help="Anzahl synthetischer Dokumente")
+    parser.add_argument("--pages", type=int, default=2, help="Seiten pro Dokument")
+    parser.add_argument("--runs", type=int, default=20, help="Messungen pro Abfrage")
+    args = parser.parse_args()
+
+    cleanup()
+    populate(args.documents, args.pages)
+    try:
+        asyncio.run(measure(args.runs))
+    finally:
+        cleanup()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,67 @@
+"""
+Alembic-Umgebung: nutzt Engine und Metadaten der Anwendung.
+
+Aufruf aus backend/:
+    alembic upgrade head
+    alembic revision --autogenerate -m "..."
+"""
+
+from logging.config import fileConfig
+
+from alembic import context
+from app.database.postgres_connection import DATABASE_URL, engine
+from app.models.database import Base
+
+config = context.config
+
+# Beim Aufruf aus der Anwendung (run_migrations) bleibt deren Logging-Konfiguration unangetastet
+if config.config_file_name is not None and config.attributes.get("configure_logger", True):
+    fileConfig(config.config_file_name)
+
+target_metadata = Base.metadata
+
+
+def run_migrations_offline() -> None:
+    """Erzeugt nur das SQL (alembic upgrade head --sql), ohne Datenbankverbindung."""
+    context.configure(
+        url=DATABASE_URL,
+        target_metadata=target_metadata,
+        literal_binds=True,
+        dialect_opts={"paramstyle": "named"},
+        compare_type=True
+    )
+
+    with context.begin_transaction():
+        context.run_migrations()
+
+
+def run_migrations_online() -> None:
+    """Führt die Migrationen über die Engine der Anwendung aus."""
+    with engine.connect() as connection:
+        postgres = connection.dialect.name == "postgresql"
+        if postgres:
+            # Index-Aufbau auf großen Tabellen darf länger dauern als DB_STATEMENT_TIMEOUT_MS
+            connection.exec_driver_sql("SET statement_timeout = 0")
+            connection.commit()
+
+        context.configure(
+            connection=connection,
+            target_metadata=target_metadata,
+            compare_type=True
+        )
+
+        try:
+            with context.begin_transaction():
+                context.run_migrations()
+        finally:
+            if postgres:
+                # Verbindung geht zurück in den Pool: wieder den Wert aus connect_args verwenden
+                connection.rollback()
+                connection.exec_driver_sql("RESET statement_timeout")
+                connection.commit()
+
+
+if context.is_offline_mode():
+    run_migrations_offline()
+else:
+    run_migrations_online()
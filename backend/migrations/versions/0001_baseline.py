@@ -0,0 +1,179 @@
+"""Baseline: Schema wie bisher von Base.metadata.create_all() angelegt
+
+Bestehende Datenbanken werden beim Start auf diese Revision gestempelt
+(siehe run_migrations in app/database/postgres_connection.py).
+
+Revision ID: 0001
+Revises:
+Create Date: 2026-10-16
+"""
+
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = '0001'
+down_revision = None
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        'kategorien',
+        sa.Column('id', sa.Integer(), primary_key=True),
+        sa.Column('name', sa.String(100), nullable=False, unique=True),
+        sa.Column('beschreibung', sa.String(255)),
+        sa.Column('erstellt_am', sa.DateTime())
+    )
+
+    op.create_table(
+        'unterkategorien',
+        sa.Column('id', sa.Integer(), primary_key=True),
+        sa.Column('kategorie_id', sa.Integer(), sa.ForeignKey('kategorien.id'), nullable=False),
+        sa.Column('name', sa.String(100), nullable=False),
+        sa.Column('beschreibung', sa.String(255)),
+        sa.Column('erstellt_am', sa.DateTime())
+    )
+
+    op.create_table(
+        'dokumente',
+        sa.Column('id', sa.Integer(), primary_key=True),
+        sa.Column('dateiname', sa.String(255), nullable=False),
+        sa.Column('kategorie_id', sa.Integer(), sa.ForeignKey('kategorien.id')),
+        sa.Column('unterkategorie_id', sa.Integer(), sa.ForeignKey('unterkategorien.id')),
+        sa.Column('pfad', sa.String(500), nullable=False),
+        sa.Column('inhalt_vorschau', sa.Text()),
+        sa.Column('erstellt_am', sa.DateTime()),
+        sa.Column('metadaten', sa.JSON())
+    )
+
+    op.create_table(
+        'metadaten_felder',
+        sa.Column('id', sa.Integer(), primary_key=True),
+        sa.Column('feldname', sa.String(100), nullable=False, unique=True),
+        sa.Column('beschreibung', sa.String(255)),
+        sa.Column('erstellt_am', sa.DateTime())
+    )
+
+    for table_name in ('lieferscheine_extern', 'lieferscheine_intern'):
+        op.create_table(
+            table_name,
+            sa.Column('id', sa.Integer(), primary_key=True),
+            sa.Column('lieferscheinnummer', sa.String(100), nullable=False, unique=True),
+            sa.Column('dokument_id', sa.Integer(), sa.ForeignKey('dokumente.id'), nullable=False),
+            sa.Column('csv_importiert', sa.Boolean()),
+            sa.Column('erstellt_am', sa.DateTime())
+        )
+
+    op.create_table(
+        'chargen_einkauf',
+        sa.Column('id', sa.Integer(), primary_key=True),
+        sa.Column('lieferschein_extern_id', sa.Integer(), sa.ForeignKey('lieferscheine_extern.id'), nullable=False),
+        sa.Column('linr', sa.String(50)),
+        sa.Column('liname', sa.String(100)),
+        sa.Column('name1', sa.String(100)),
+        sa.Column('belfd', sa.String(50)),
+        sa.Column('tlnr', sa.String(50)),
+        sa.Column('auart', sa.String(50)),
+        sa.Column('aftnr', sa.String(100)),
+        sa.Column('aps', sa.String(50)),
+        sa.Column('absn', sa.String(50)),
+        sa.Column('atnr', sa.String(100)),
+        sa.Column('artikel', sa.String(255)),
+        sa.Column('materialnr', sa.String(100)),
+        sa.Column('urlnd', sa.String(10)),
+        sa.Column('wartarnr', sa.String(20)),
+        sa.Column('menge', sa.String(50)),
+        sa.Column('erfmenge', sa.String(50)),
+        sa.Column('gebindeme', sa.String(50)),
+        sa.Column('snnr', sa.String(100)),
+        sa.Column('snnralt', sa.String(100)),
+        sa.Column('einzelek', sa.String(50)),
+        sa.Column('lieferscheinnr', sa.String(100)),
+        sa.Column('lieferdatum', sa.String(20)),
+        sa.Column('renrex', sa.String(100)),
+        sa.Column('redat', sa.String(20)),
+        sa.Column('bidser', sa.String(100)),
+        sa.Column('bid', sa.String(100)),
+        sa.Column('erstellt_am', sa.DateTime())
+    )
+
+    op.create_table(
+        'chargen_verkauf',
+        sa.Column('id', sa.Integer(), primary_key=True),
+        sa.Column('lieferschein_intern_id', sa.Integer(), sa.ForeignKey('lieferscheine_intern.id'), nullable=False),
+        sa.Column('kdnr', sa.String(50)),
+        sa.Column('kdname', sa.String(100)),
+        sa.Column('vaart', sa.String(50)),
+        sa.Column('vtlfd', sa.String(50)),
+        sa.Column('aftnrkunde', sa.String(100)),
+        sa.Column('tlnr', sa.String(50)),
+        sa.Column('aps', sa.String(50)),
+        sa.Column('absn', sa.String(50)),
+        sa.Column('vtlfdra', sa.String(50)),
+        sa.Column('aftnrra', sa.String(100)),
+        sa.Column('artikel', sa.String(255)),
+        sa.Column('atnr', sa.String(100)),
+        sa.Column('materialnr', sa.String(100)),
+        sa.Column('urlnd', sa.String(10)),
+        sa.Column('wartarnr', sa.String(20)),
+        sa.Column('kdartnr', sa.String(100)),
+        sa.Column('menge', sa.String(50)),
+        sa.Column('megebinde', sa.String(50)),
+        sa.Column('charge', sa.String(100)),
+        sa.Column('einzelvk', sa.String(50)),
+        sa.Column('poswert', sa.String(50)),
+        sa.Column('lieferscheinnr', sa.String(100)),
+        sa.Column('lieferdatum', sa.String(20)),
+        sa.Column('renr', sa.String(100)),
+        sa.Column('redat', sa.String(20)),
+        sa.Column('bidsre', sa.String(100)),
+        sa.Column('bid', sa.String(100)),
+        sa.Column('bidsfo', sa.String(100)),
+        sa.Column('erstellt_am', sa.DateTime())
+    )
+
+    op.create_table(
+        'verarbeitungsstatus',
+        sa.Column('id', sa.Integer(), primary_key=True),
+        sa.Column('dateiname', sa.String(255), nullable=False),
+        sa.Column('dokument_hash', sa.String(64)),
+        sa.Column('stufe', sa.String(50), nullable=False),
+        sa.Column('status', sa.String(20), nullable=False),
+        sa.Column('versuche', sa.Integer(), nullable=False),
+        sa.Column('naechster_versuch', sa.DateTime()),
+        sa.Column('meldung', sa.Text()),
+        sa.Column('erstellt_am', sa.DateTime()),
+        sa.Column('aktualisiert_am', sa.DateTime()),
+        sa.UniqueConstraint('dateiname', 'stufe', name='uq_verarbeitungsstatus_dateiname_stufe')
+    )
+
+    op.create_table(
+        'verarbeitungsschritte',
+        sa.Column('id', sa.Integer(), primary_key=True),
+        sa.Column('dateiname', sa.String(255), nullable=False),
+        sa.Column('dokument_id', sa.Integer(), sa.ForeignKey('dokumente.id', ondelete='CASCADE')),
+        sa.Column('schritt', sa.String(100), nullable=False),
+        sa.Column('gestartet_am', sa.DateTime(), nullable=False),
+        sa.Column('beendet_am', sa.DateTime(), nullable=False),
+        sa.Column('dauer_ms', sa.Integer(), nullable=False),
+        sa.Column('erfolgreich', sa.Boolean(), nullable=False),
+        sa.Column('meldung', sa.Text())
+    )
+    op.create_index('ix_verarbeitungsschritte_dateiname', 'verarbeitungsschritte', ['dateiname'])
+    op.create_index('ix_verarbeitungsschritte_dokument_id', 'verarbeitungsschritte', ['dokument_id'])
+    op.create_index('ix_verarbeitungsschritte_schritt', 'verarbeitungsschritte', ['schritt'])
+
+
+def downgrade() -> None:
+    op.drop_table('verarbeitungsschritte')
+    op.drop_table('verarbeitungsstatus')
+    op.drop_table('chargen_verkauf')
+    op.drop_table('chargen_einkauf')
+    op.drop_table('lieferscheine_intern')
+    op.drop_table('lieferscheine_extern')
+    op.drop_table('metadaten_felder')
+    op.drop_table('dokumente')
+    op.drop_table('unterkategorien')
+    op.drop_table('kategorien')
@@ -0,0 +1,41 @@
+"""Indizes für die häufig gefilterten Spalten (Scheduler, Dokumentliste, CSV-Import)
+
+IF NOT EXISTS, weil ältere Installationen einen Teil davon bereits über
+ensure_indexes() beim Start angelegt haben.
+
+Revision ID: 0002
+Revises: 0001
+Create Date: 2026-10-16
+"""
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = '0002'
+down_revision = '0001'
+branch_labels = None
+depends_on = None
+
+# (Indexname, Tabelle, Spalten) - Namen wie von index=True im Model erzeugt
+INDEXES = [
+    ('ix_dokumente_dateiname', 'dokumente', ['dateiname']),
+    ('ix_dokumente_pfad', 'dokumente', ['pfad']),
+    ('ix_dokumente_erstellt_am_id', 'dokumente', ['erstellt_am', 'id']),
+    ('ix_dokumente_unterkategorie_id', 'dokumente', ['unterkategorie_id']),
+    ('ix_lieferscheine_extern_dokument_id', 'lieferscheine_extern', ['dokument_id']),
+    ('ix_lieferscheine_intern_dokument_id', 'lieferscheine_intern', ['dokument_id']),
+    ('ix_chargen_einkauf_lieferschein_extern_id', 'chargen_einkauf', ['lieferschein_extern_id']),
+    ('ix_chargen_einkauf_lieferscheinnr', 'chargen_einkauf', ['lieferscheinnr']),
+    ('ix_chargen_verkauf_lieferschein_intern_id', 'chargen_verkauf', ['lieferschein_intern_id']),
+    ('ix_chargen_verkauf_lieferscheinnr', 'chargen_verkauf', ['lieferscheinnr']),
+]
+
+
+def upgrade() -> None:
+    for name, table, columns in INDEXES:
+        op.create_index(name, table, columns, if_not_exists=True)
+
+
+def downgrade() -> None:
+    for name, table, _ in reversed(INDEXES):
+        op.drop_index(name, table_name=table, if_exists=True)
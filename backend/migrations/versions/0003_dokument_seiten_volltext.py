@@ -0,0 +1,43 @@
+"""Volltext je Dokumentseite mit deutschem tsvector und GIN-Index
+
+Revision ID: 0003
+Revises: 0002
+Create Date: 2026-10-16
+"""
+
+import sqlalchemy as sa
+from alembic import op
+from sqlalchemy.dialects import postgresql
+
+# revision identifiers, used by Alembic.
+revision = '0003'
+down_revision = '0002'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        'dokument_seiten',
+        sa.Column('id', sa.Integer(), primary_key=True),
+        sa.Column('dokument_id', sa.Integer(), sa.ForeignKey('dokumente.id', ondelete='CASCADE'), nullable=False),
+        sa.Column('seite', sa.Integer(), nullable=False),
+        sa.Column('text', sa.Text(), nullable=False),
+        sa.Column(
+            'suchvektor',
+            postgresql.TSVECTOR(),
+            sa.Computed("to_tsvector('german', text)", persisted=True)
+        ),
+        sa.UniqueConstraint('dokument_id', 'seite', name='uq_dokument_seiten_dokument_seite')
+    )
+    op.create_index(
+        'ix_dokument_seiten_suchvektor',
+        'dokument_seiten',
+        ['suchvektor'],
+        postgresql_using='gin'
+    )
+
+
+def downgrade() -> None:
+    op.drop_index('ix_dokument_seiten_suchvektor', table_name='dokument_seiten')
+    op.drop_table('dokument_seiten')
@@ -0,0 +1,47 @@
+"""Trigramm-Indizes (pg_trgm) für die Chargen-Suche nach Seriennummer, Material und Artikel
+
+Revision ID: 0004
+Revises: 0003
+Create Date: 2026-10-16
+"""
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = '0004'
+down_revision = '0003'
+branch_labels = None
+depends_on = None
+
+# (Indexname, Tabelle, Spalte) - GIN mit gin_trgm_ops für ILIKE '%…%'
+TRGM_INDEXES = [
+    ('ix_chargen_einkauf_snnr_trgm', 'chargen_einkauf', 'snnr'),
+    ('ix_chargen_einkauf_materialnr_trgm', 'chargen_einkauf', 'materialnr'),
+    ('ix_chargen_einkauf_artikel_trgm', 'chargen_einkauf', 'artikel'),
+    ('ix_chargen_einkauf_atnr_trgm', 'chargen_einkauf', 'atnr'),
+    ('ix_chargen_verkauf_charge_trgm', 'chargen_verkauf', 'charge'),
+    ('ix_chargen_verkauf_materialnr_trgm', 'chargen_verkauf', 'materialnr'),
+    ('ix_chargen_verkauf_artikel_trgm', 'chargen_verkauf', 'artikel'),
+    ('ix_chargen_verkauf_atnr_trgm', 'chargen_verkauf', 'atnr'),
+]
+
+
+def upgrade() -> None:
+    # pg_trgm ist ab PostgreSQL 13 "trusted": der Datenbank-Owner darf die Extension anlegen
+    op.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+
+    for name, table, column in TRGM_INDEXES:
+        op.create_index(
+            name,
+            table,
+            [column],
+            postgresql_using='gin',
+            postgresql_ops={column: 'gin_trgm_ops'},
+            if_not_exists=True
+        )
+
+
+def downgrade() -> None:
+    # Die Extension bleibt bestehen - andere Objekte können sie inzwischen nutzen
+    for name, table, _column in reversed(TRGM_INDEXES):
+        op.drop_index(name, table_name=table, if_exists=True)
@@ -0,0 +1,41 @@
+"""Ursprünglicher Dateiname je Dokument für die Pfad-Auflösung verschobener Dateien
+
+Revision ID: 0005
+Revises: 0004
+Create Date: 2026-10-17
+"""
+
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = '0005'
+down_revision = '0004'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # Bestandsdatenbanken ohne Alembic-Version erhalten die Spalte bereits über ensure_columns()
+    columns = {column['name'] for column in sa.inspect(op.get_bind()).get_columns('dokumente')}
+    if 'original_dateiname' not in columns:
+        op.add_column('dokumente', sa.Column('original_dateiname', sa.String(255)))
+
+    op.create_index('ix_dokumente_original_dateiname', 'dokumente', ['original_dateiname'], if_not_exists=True)
+
+    # Umbenannte Dokumente (lief_ext_*) über die Zeitleiste auf den Input-Dateinamen zurückführen
+    op.execute(
+        """
+        UPDATE dokumente
+        SET original_dateiname = COALESCE(
+            (SELECT MIN(s.dateiname) FROM verarbeitungsschritte s WHERE s.dokument_id = dokumente.id),
+            dateiname
+        )
+        WHERE original_dateiname IS NULL
+        """
+    )
+
+
+def downgrade() -> None:
+    op.drop_index('ix_dokumente_original_dateiname', table_name='dokumente', if_exists=True)
+    op.drop_column('dokumente', 'original_dateiname')
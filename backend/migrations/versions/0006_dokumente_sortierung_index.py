@@ -0,0 +1,32 @@
+"""Ausdrucksindex für die Sortierung der Dokumentliste (fehlendes erstellt_am am Ende)
+
+Die Keyset-Pagination sortiert nach coalesce(erstellt_am, TIMESTAMP '0001-01-01'),
+damit Dokumente ohne erstellt_am nicht als NULL zuerst kommen und über den Cursor
+erreichbar bleiben. Der Ausdruck muss exakt zu DokumentRepository.SORTIERUNG passen.
+
+Revision ID: 0006
+Revises: 0005
+Create Date: 2026-10-17
+"""
+
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = '0006'
+down_revision = '0005'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_index(
+        'ix_dokumente_sortierung_id',
+        'dokumente',
+        [sa.text("coalesce(erstellt_am, TIMESTAMP '0001-01-01 00:00:00')"), 'id'],
+        if_not_exists=True
+    )
+
+
+def downgrade() -> None:
+    op.drop_index('ix_dokumente_sortierung_id', table_name='dokumente', if_exists=True)
@@ -0,0 +1,59 @@
+#!/usr/bin/env python3
+"""
+Nachträgliche Volltext-Indexierung für Dokumente ohne gespeicherten Seitentext
+(z.B. Dokumente, die vor Einführung der Tabelle dokument_seiten verarbeitet wurden).
+
+Aufruf aus backend/:
+    python reindex_volltext.py
+"""
+
+import os
+import sys
+
+# Path für Imports hinzufügen
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+import logging
+
+from app.repositories.dokument_seite_repository import DokumentSeiteRepository
+from app.services.ocr_service import OCRService
+
+# Logging konfigurieren
+logging.basicConfig(level=logging.INFO, format='%(levelname)s: %(message)s')
+logger = logging.getLogger(__name__)
+
+BATCH_SIZE = 500
+
+def reindex_volltext():
+    logger.info("🔎 Starte Volltext-Indexierung für Dokumente ohne Seitentext...")
+    
+    indexiert = 0
+    uebersprungen = set()
+    
+    while True:
+        dokumente = [
+            dokument for dokument in DokumentSeiteRepository.get_dokumente_ohne_seiten(BATCH_SIZE + len(uebersprungen))
+            if dokument["id"] not in uebersprungen
+        ]
+        if not dokumente:
+            break
+        
+        for dokument in dokumente:
+            if not dokument["pfad"] or not os.path.isfile(dokument["pfad"]):
+                logger.warning(f"⚠️  Datei nicht gefunden: {dokument['dateiname']} ({dokument['pfad']})")
+                uebersprungen.add(dokument["id"])
+                continue
+            
+            seiten = OCRService.extract_page_texts(dokument["pfad"])
+            if not seiten or not DokumentSeiteRepository.replace_for_dokument(dokument["id"], seiten):
+                uebersprungen.add(dokument["id"])
+                continue
+            
+            indexiert += 1
+            logger.info(f"✅ {dokument['dateiname']}: {len(seiten)} Seiten")
+    
+    logger.info(f"🎉 Fertig: {indexiert} Dokumente indexiert, {len(uebersprungen)} übersprungen")
+    return indexiert
+
+if __name__ == "__main__":
+    reindex_volltext()
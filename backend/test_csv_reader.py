@@ -0,0 +1,187 @@
+#!/usr/bin/env python3
+"""
+Test-Script für den CSV-Einleser der ERP-Exporte (Encoding, Trennzeichen, Spaltenzahl)
+und den Lieferscheinnummer-Index (CsvLieferscheinIndex).
+
+Schreibt Beispieldateien in ein temporäres Verzeichnis und prüft Header und Datensätze.
+Benötigt keine Datenbank.
+"""
+
+import os
+import sys
+
+# Path für Imports hinzufügen
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+import logging
+import tempfile
+
+from app.services.document_processing.csv_column_store import ChargenEinkaufColumnStore
+from app.services.document_processing.csv_index import CsvLieferscheinIndex
+from app.services.document_processing.csv_reader import read_csv_records
+
+# Logging konfigurieren
+logging.basicConfig(level=logging.INFO, format='%(levelname)s: %(message)s')
+logger = logging.getLogger(__name__)
+
+HEADER = [
+    "LINR", "LINAME", "BELFD", "TLNR", "AUART", "AFTNR", "ATNR", "ARTIKEL",
+    "MATERIALNR", "MENGE", "SNNR", "LIEFERSCHEINNR", "LIEFERDATUM", "RENREX", "BID"
+]
+
+
+def build_rows(artikel_zeile_1: str, count: int = 5) -> list:
+    rows = []
+    for index in range(count):
+        artikel = artikel_zeile_1 if index == 1 else f"Mutter M{index}"
+        rows.append([
+            "4711", "Lieferant GmbH", str(index), "1", "EK", "A-1", "AT1", artikel,
+            f"MAT{index}", "1,5", f"SN{index}", "LS-100", "01.02.2025", "RE-1", "B1"
+        ])
+    return rows
+
+
+def write_csv(directory: str, name: str, delimiter: str, rows: list, encoding: str = "utf-8") -> str:
+    path = os.path.join(directory, name)
+    lines = [delimiter.join(HEADER)] + [delimiter.join(row) for row in rows]
+    with open(path, "w", encoding=encoding, newline="") as f:
+        f.write("\r\n".join(lines) + "\r\n")
+    return path
+
+
+def check(beschreibung: str, path: str, expected_records: int, expected_values: dict) -> bool:
+    header, records = read_csv_records(path)
+    records = list(records)
+
+    if header != HEADER or len(records) != expected_records:
+        logger.error(f"❌ {beschreibung}: {len(header)} Spalten, {len(records)} Datensätze")
+        return False
+
+    for (index, column), value in expected_values.items():
+        if records[index].get(column) != value:
+            logger.error(f"❌ {beschreibung}: Zeile {index} {column}={records[index].get(column)!r}, erwartet {value!r}")
+            return False
+
+    logger.info(f"✅ {beschreibung}")
+    return True
+
+
+def check_index() -> list:
+    """Exakte und ähnliche Suche sowie Ersetzen/Entfernen einzelner Quelldateien."""
+    index = CsvLieferscheinIndex()
+    index.add_file("a.csv", ChargenEinkaufColumnStore.from_rows([
+        {"LIEFERSCHEINNR": "LS 4711", "SNNR": "SN1"},
+        {"LIEFERSCHEINNR": "ls4711", "SNNR": "SN2"},
+        {"LIEFERSCHEINNR": "LS4711-2", "SNNR": "SN3"},
+        {"LIEFERSCHEINNR": "", "SNNR": "SN4"},
+    ]))
+    index.add_file("b.csv", ChargenEinkaufColumnStore.from_rows([
+        {"LIEFERSCHEINNR": "LS4711", "SNNR": "SN5"},
+        {"LIEFERSCHEINNR": "4711", "SNNR": "SN6"},
+    ]))
+
+    results = []
+
+    def check_value(beschreibung, actual, expected):
+        ok = actual == expected
+        if ok:
+            logger.info(f"✅ Index: {beschreibung}")
+        else:
+            logger.error(f"❌ Index: {beschreibung}: {actual!r}, erwartet {expected!r}")
+        results.append(ok)
+
+    check_value(
+        "Exakte Suche normalisiert Leerzeichen und Schreibweise über alle Dateien",
+        sorted(row["SNNR"] for row in index.find_exact(" ls 4711 ")),
+        ["SN1", "SN2", "SN5"]
+    )
+    check_value("Unbekannte Nummer", index.find_exact("LS9999"), [])
+    check_value("Anzahl Datensätze und Nummern", (index.row_count, index.key_count), (6, 3))
+    check_value("Ähnlich: enthaltene und enthaltende Nummern", index.find_similar("LS4711"), ["4711", "LS4711-2"])
+    check_value("Ähnlich: Suche kürzer als ein Trigramm", index.find_similar("LS"), [])
+
+    # Neuer Stand einer Datei ersetzt den alten, Entfernen trägt verwaiste Nummern aus
+    index.add_file("a.csv", ChargenEinkaufColumnStore.from_rows([{"LIEFERSCHEINNR": "LS0815", "SNNR": "SN7"}]))
+    check_value(
+        "Ersetzte Datei: nur noch Datensätze der anderen Datei",
+        [row["SNNR"] for row in index.find_exact("LS4711")],
+        ["SN5"]
+    )
+    check_value("Ersetzte Datei: entfallene Nummer nicht mehr ähnlich", index.find_similar("LS4711"), ["4711"])
+
+    index.remove_file("b.csv")
+    check_value(
+        "Entfernte Datei",
+        (index.find_exact("LS4711"), index.sources, index.key_count),
+        ([], ["a.csv"], 1)
+    )
+
+    # Datensätze direkt im Konstruktor, auch als Generator
+    generator_index = CsvLieferscheinIndex(row for row in [{"LIEFERSCHEINNR": "LS4711", "SNNR": "SN8"}])
+    check_value(
+        "Konstruktor mit Generator",
+        [row["SNNR"] for row in generator_index.find_exact("LS4711")],
+        ["SN8"]
+    )
+    empty_index = CsvLieferscheinIndex(row for row in [])
+    check_value("Konstruktor mit leerem Generator legt keine Quelle an", empty_index._stores, {})
+    return results
+
+
+def main():
+    logger.info("🧪 Teste CSV-Einleser...")
+
+    with tempfile.TemporaryDirectory() as directory:
+        results = [
+            check(
+                "Semikolon-Export (UTF-8)",
+                write_csv(directory, "semikolon.csv", ";", build_rows("Schraube M8")),
+                5,
+                {(0, "MATERIALNR"): "MAT0", (4, "MENGE"): "1,5"}
+            ),
+            check(
+                "Komma-Export mit BOM",
+                write_csv(directory, "komma.csv", ",", build_rows("Schraube M8", count=1), encoding="utf-8-sig"),
+                1,
+                {(0, "LINR"): "4711"}
+            ),
+            check(
+                "Windows-1252 mit Umlauten",
+                write_csv(directory, "cp1252.csv", ";", build_rows("Dübel Ø 8mm"), encoding="cp1252"),
+                5,
+                {(1, "ARTIKEL"): "Dübel Ø 8mm"}
+            ),
+            # Regression: ungequotetes ';' (und Komma/Anführungszeichen) im Artikeltext einer
+            # Stichprobenzeile - csv.Sniffer wählt ',' und der Header hätte weniger als 11 Spalten
+            check(
+                "Semikolon-Export mit Trennzeichen im Artikeltext",
+                write_csv(directory, "sniffer.csv", ";", build_rows('Stecker,"Schuko",16A; grau')),
+                5,
+                {(0, "MATERIALNR"): "MAT0", (1, "LINR"): "4711", (4, "SNNR"): "SN4"}
+            ),
+        ]
+
+        # Zu wenige Spalten: kein gültiger Export
+        path = os.path.join(directory, "kurz.csv")
+        with open(path, "w") as f:
+            f.write("A;B;C\n1;2;3\n")
+        header, records = read_csv_records(path)
+        if header or list(records):
+            logger.error("❌ Datei mit 3 Spalten wurde als Export erkannt")
+            results.append(False)
+        else:
+            logger.info("✅ Datei mit zu wenigen Spalten verworfen")
+
+    logger.info("🧪 Teste Lieferscheinnummer-Index...")
+    results.extend(check_index())
+
+    if not all(results):
+        logger.error(f"❌ {results.count(False)} Prüfungen fehlgeschlagen")
+        return False
+
+    logger.info("🎉 Alle CSV-Prüfungen erfolgreich!")
+    return True
+
+if __name__ == "__main__":
+    success = main()
+    sys.exit(0 if success else 1)
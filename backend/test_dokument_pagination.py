@@ -0,0 +1,110 @@
+#!/usr/bin/env python3
+"""
+Test-Script für die Keyset-Pagination der Dokumentliste (DokumentRepository.get_page).
+
+Legt Dokumente mit und ohne erstellt_am an und blättert mit kleiner Seitengröße durch
+die ganze Liste: Jedes Dokument muss genau einmal vorkommen, Dokumente ohne erstellt_am
+am Ende, und eine Seite, die auf einem solchen Dokument endet, muss einen Cursor liefern.
+"""
+
+import os
+import sys
+
+# Path für Imports hinzufügen
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+import logging
+import uuid
+from datetime import datetime, timedelta
+
+from app.database.postgres_connection import get_db_session, run_migrations, test_connection
+from app.models.database import Dokument
+from app.repositories.dokument_repository import DokumentRepository
+
+# Logging konfigurieren
+logging.basicConfig(level=logging.INFO, format='%(levelname)s: %(message)s')
+logger = logging.getLogger(__name__)
+
+
+def create_documents(prefix: str) -> list:
+    """Drei Dokumente mit erstellt_am, drei ohne; gibt die IDs zurück."""
+    now = datetime.utcnow()
+    with get_db_session() as session:
+        dokumente = [
+            Dokument(dateiname=f"{prefix}_{index}.pdf", pfad=f"/tmp/{prefix}_{index}.pdf", erstellt_am=erstellt_am)
+            for index, erstellt_am in enumerate([now, now - timedelta(days=1), now, None, None, None])
+        ]
+        session.add_all(dokumente)
+        session.flush()
+
+        # default=datetime.utcnow greift nur, wenn kein Wert gesetzt ist - NULL explizit setzen
+        for dokument in dokumente[3:]:
+            dokument.erstellt_am = None
+        return [dokument.id for dokument in dokumente]
+
+
+def page_through(limit: int) -> list:
+    """Alle Seiten der Dokumentliste; gibt (id, erstellt_am) in Reihenfolge zurück."""
+    dokumente = []
+    cursor = None
+    for _ in range(100000):
+        page = DokumentRepository.get_page(limit=limit, cursor=cursor, fields=["id", "erstellt_am"])
+        dokumente.extend((dokument["id"], dokument["erstellt_am"]) for dokument in page["dokumente"])
+        cursor = page["next_cursor"]
+        if not cursor:
+            return dokumente
+    raise RuntimeError("Pagination endet nicht")
+
+
+def main():
+    logger.info("🧪 Teste Pagination der Dokumentliste...")
+
+    ids = []
+    try:
+        # 1. Verbindung testen
+        logger.info("1️⃣  Teste Datenbankverbindung...")
+        if not test_connection():
+            logger.error("❌ Verbindung fehlgeschlagen!")
+            return False
+
+        run_migrations()
+
+        # 2. Testdokumente anlegen
+        logger.info("2️⃣  Lege Dokumente mit und ohne erstellt_am an...")
+        ids = create_documents(f"test_pagination_{uuid.uuid4().hex[:8]}")
+
+        # 3. Durchblättern (Seitengrößen, bei denen Seiten auf NULL-Zeilen enden)
+        logger.info("3️⃣  Blättere durch die Liste...")
+        failures = 0
+        for limit in (1, 2, 4):
+            dokumente = page_through(limit)
+            gefunden = [dokument_id for dokument_id, _ in dokumente if dokument_id in ids]
+            ohne_datum = [dokument_id for dokument_id, erstellt_am in dokumente if erstellt_am is None]
+
+            if sorted(gefunden) != sorted(ids):
+                failures += 1
+                logger.error(f"❌ Seitengröße {limit}: {sorted(gefunden)} statt {sorted(ids)}")
+            elif dokumente[-len(ohne_datum):] != [(dokument_id, None) for dokument_id in ohne_datum]:
+                failures += 1
+                logger.error(f"❌ Seitengröße {limit}: Dokumente ohne erstellt_am nicht am Ende")
+            else:
+                logger.info(f"✅ Seitengröße {limit}: alle {len(ids)} Testdokumente genau einmal")
+
+        if failures:
+            return False
+
+        logger.info("🎉 Pagination funktioniert auch ohne erstellt_am!")
+        return True
+
+    except Exception as e:
+        logger.error(f"❌ Fehler: {e}")
+        return False
+
+    finally:
+        if ids:
+            with get_db_session() as session:
+                session.query(Dokument).filter(Dokument.id.in_(ids)).delete(synchronize_session=False)
+
+if __name__ == "__main__":
+    success = main()
+    sys.exit(0 if success else 1)
@@ -0,0 +1,206 @@
+#!/usr/bin/env python3
+"""
+Test-Script für die Indizes der häufigsten Abfragen (Scheduler, Repositories).
+
+Führt EXPLAIN (FORMAT JSON) gegen die PostgreSQL-Datenbank aus und prüft,
+dass die Tabellen über einen Index gelesen werden statt per Seq Scan.
+Sequenzielle Scans werden dafür abgeschaltet (SET LOCAL enable_seqscan = off):
+Existiert ein passender Index, muss der Planer ihn dann auch bei leeren
+Tabellen wählen - fehlt er, bleibt nur der Seq Scan übrig.
+"""
+
+import os
+import sys
+
+# Path für Imports hinzufügen
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+import json
+import logging
+from datetime import datetime
+
+from app.database.postgres_connection import engine, run_migrations, test_connection
+from app.models.database import (
+    ChargenEinkauf,
+    ChargenVerkauf,
+    Dokument,
+    LieferscheinExtern,
+    Verarbeitungsschritt,
+    Verarbeitungsstatus,
+)
+from app.repositories.dokument_repository import SORTIERUNG
+from sqlalchemy import func, or_, select, text, tuple_
+
+# Logging konfigurieren
+logging.basicConfig(level=logging.INFO, format='%(levelname)s: %(message)s')
+logger = logging.getLogger(__name__)
+
+# (Beschreibung, Abfrage, Tabelle, die per Index gelesen werden muss)
+QUERIES = [
+    (
+        "Scheduler: Dokument per Dateiname (Pfad-Auflösung)",
+        select(Dokument.id, Dokument.pfad).where(Dokument.dateiname == "beispiel.pdf"),
+        "dokumente"
+    ),
+    (
+        "Scheduler: bereits erfasste Dateien (IN-Liste)",
+        select(Dokument.dateiname).where(Dokument.dateiname.in_(["a.pdf", "b.pdf", "c.pdf"])),
+        "dokumente"
+    ),
+    (
+        "Wareneingang: Dokument per Pfad oder Dateiname",
+        select(Dokument.id).where(or_(Dokument.pfad == "/app/pdfs/a.pdf", Dokument.dateiname == "a.pdf")),
+        "dokumente"
+    ),
+    (
+        "Dokumentliste: erste Seite (Keyset)",
+        select(Dokument.id, SORTIERUNG)
+            .order_by(SORTIERUNG.desc(), Dokument.id.desc())
+            .limit(51),
+        "dokumente"
+    ),
+    (
+        "Dokumentliste: Folgeseite (Keyset-Cursor)",
+        select(Dokument.id, SORTIERUNG)
+            .where(tuple_(SORTIERUNG, Dokument.id) < tuple_(datetime(2025, 1, 1), 1000))
+            .order_by(SORTIERUNG.desc(), Dokument.id.desc())
+            .limit(51),
+        "dokumente"
+    ),
+    (
+        "Dokumentliste: Zeitraumfilter",
+        select(Dokument.id).where(Dokument.erstellt_am >= datetime(2025, 1, 1), Dokument.erstellt_am < datetime(2025, 2, 1)),
+        "dokumente"
+    ),
+    (
+        "Pfad-Auflösung: Dokument per ursprünglichem Dateinamen",
+        select(Dokument.id, Dokument.pfad).where(Dokument.original_dateiname == "beispiel.pdf"),
+        "dokumente"
+    ),
+    (
+        "Dokumentliste: Filter nach Unterkategorie",
+        select(Dokument.id).where(Dokument.unterkategorie_id == 1),
+        "dokumente"
+    ),
+    (
+        "Lieferschein extern zum Dokument",
+        select(LieferscheinExtern.id).where(LieferscheinExtern.dokument_id == 1),
+        "lieferscheine_extern"
+    ),
+    (
+        "Chargen zum Lieferschein extern",
+        select(ChargenEinkauf.id).where(ChargenEinkauf.lieferschein_extern_id == 1),
+        "chargen_einkauf"
+    ),
+    (
+        "Chargen per Lieferscheinnummer (CSV-Abgleich)",
+        select(ChargenEinkauf.id).where(ChargenEinkauf.lieferscheinnr == "LS-4711"),
+        "chargen_einkauf"
+    ),
+    (
+        "Chargen-Suche: Seriennummer (Trigramm, ILIKE)",
+        select(ChargenEinkauf.id).where(ChargenEinkauf.snnr.ilike("%SN4711%")),
+        "chargen_einkauf"
+    ),
+    (
+        "Chargen-Suche: Material oder Artikel (Trigramm, ILIKE)",
+        select(ChargenVerkauf.id).where(or_(
+            ChargenVerkauf.materialnr.ilike("%4711%"),
+            ChargenVerkauf.artikel.ilike("%4711%")
+        )),
+        "chargen_verkauf"
+    ),
+    (
+        "Verarbeitungsstatus einer Datei und Stufe",
+        select(Verarbeitungsstatus.status).where(
+            Verarbeitungsstatus.dateiname == "beispiel.pdf",
+            Verarbeitungsstatus.stufe == "ocr"
+        ),
+        "verarbeitungsstatus"
+    ),
+    (
+        "Verarbeitungsstatus der Kandidaten (IN-Liste)",
+        select(Verarbeitungsstatus.dateiname, Verarbeitungsstatus.stufe, Verarbeitungsstatus.status)
+            .where(Verarbeitungsstatus.dateiname.in_(["a.pdf", "b.pdf"])),
+        "verarbeitungsstatus"
+    ),
+    (
+        "Zeitleiste eines Dokuments",
+        select(Verarbeitungsschritt.id).where(Verarbeitungsschritt.dokument_id == 1),
+        "verarbeitungsschritte"
+    ),
+    (
+        "Zeitleiste: Zuordnung per Dateiname",
+        select(func.count(Verarbeitungsschritt.id)).where(Verarbeitungsschritt.dateiname == "beispiel.pdf"),
+        "verarbeitungsschritte"
+    ),
+]
+
+
+def collect_scans(plan: dict, scans: list):
+    """Sammelt (Knotentyp, Relation, Index) aller Scan-Knoten im Plan-Baum."""
+    if "Relation Name" in plan:
+        scans.append((plan["Node Type"], plan["Relation Name"], plan.get("Index Name")))
+    elif plan["Node Type"] == "Bitmap Index Scan":
+        scans.append((plan["Node Type"], None, plan.get("Index Name")))
+    for child in plan.get("Plans", []):
+        collect_scans(child, scans)
+
+
+def explain(connection, query) -> list:
+    compiled = query.compile(dialect=engine.dialect, compile_kwargs={"literal_binds": True})
+    result = connection.execute(text(f"EXPLAIN (FORMAT JSON) {compiled}")).scalar()
+    plan = result if isinstance(result, list) else json.loads(result)
+    scans = []
+    collect_scans(plan[0]["Plan"], scans)
+    return scans
+
+
+def main():
+    logger.info("🧪 Prüfe Index-Nutzung der häufigsten Abfragen...")
+
+    try:
+        # 1. Verbindung testen
+        logger.info("1️⃣  Teste Datenbankverbindung...")
+        if not test_connection():
+            logger.error("❌ Verbindung fehlgeschlagen!")
+            return False
+
+        # 2. Schema auf den neuesten Stand bringen
+        logger.info("2️⃣  Wende Migrationen an...")
+        run_migrations()
+
+        # 3. Pläne prüfen
+        logger.info("3️⃣  Prüfe Ausführungspläne...")
+        failures = 0
+
+        with engine.connect() as connection:
+            connection.execute(text("SET LOCAL enable_seqscan = off"))
+
+            for beschreibung, query, tabelle in QUERIES:
+                scans = explain(connection, query)
+                seq_scans = [scan for scan in scans if scan[0] == "Seq Scan" and scan[1] == tabelle]
+                indexes = sorted({scan[2] for scan in scans if scan[2]})
+
+                if seq_scans or not indexes:
+                    failures += 1
+                    logger.error(f"❌ {beschreibung}: Seq Scan auf {tabelle} ({scans})")
+                else:
+                    logger.info(f"✅ {beschreibung}: {', '.join(indexes)}")
+
+            connection.rollback()
+
+        if failures:
+            logger.error(f"❌ {failures} von {len(QUERIES)} Abfragen ohne Index-Scan")
+            return False
+
+        logger.info(f"🎉 Alle {len(QUERIES)} Abfragen nutzen einen Index!")
+        return True
+
+    except Exception as e:
+        logger.error(f"❌ Fehler: {e}")
+        return False
+
+if __name__ == "__main__":
+    success = main()
+    sys.exit(0 if success else 1)
@@ -0,0 +1,142 @@
+#!/usr/bin/env python3
+"""
+Test-Script für die Metriken im Prometheus-Textformat (GET /metrics).
+
+Prüft die Ausgabe von Counter, Gauge und Histogram an einer eigenen Registry
+sowie die Validierung von Labels und Namen. Benötigt keine Datenbank.
+"""
+
+import os
+import sys
+
+# Path für Imports hinzufügen
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+import logging
+
+from app.services.metrics import MetricsRegistry, registry
+
+# Logging konfigurieren
+logging.basicConfig(level=logging.INFO, format='%(levelname)s: %(message)s')
+logger = logging.getLogger(__name__)
+
+
+def check(beschreibung: str, ok: bool, details: str = "") -> bool:
+    if ok:
+        logger.info(f"✅ {beschreibung}")
+    else:
+        logger.error(f"❌ {beschreibung} {details}".rstrip())
+    return ok
+
+
+def raises(function, exception=ValueError) -> bool:
+    try:
+        function()
+    except exception:
+        return True
+    return False
+
+
+def test_rendering() -> list:
+    test_registry = MetricsRegistry()
+    counter = test_registry.counter("test_dokumente_total", "Verarbeitete Dokumente", ["result"])
+    gauge = test_registry.gauge("test_queue_depth", "Queue-Tiefe", ["stage"])
+    histogram = test_registry.histogram("test_dauer_seconds", "Dauer", ["step"], buckets=(0.1, 1.0))
+    einfach = test_registry.counter("test_ohne_labels_total", "Ohne Labels")
+
+    counter.inc(result="erledigt")
+    counter.inc(2, result="erledigt")
+    counter.inc(result='mit "Anführungszeichen"\n')
+    gauge.set_function(lambda: {("ocr",): 3, ("classify",): 0.5})
+    for value in (0.05, 0.5, 0.7, 5.0):
+        histogram.observe(value, step="ocr")
+
+    lines = test_registry.render().splitlines()
+    results = []
+
+    results.append(check(
+        "HELP/TYPE-Zeilen je Metrik",
+        "# HELP test_dokumente_total Verarbeitete Dokumente" in lines
+        and "# TYPE test_dokumente_total counter" in lines
+        and "# TYPE test_queue_depth gauge" in lines
+        and "# TYPE test_dauer_seconds histogram" in lines,
+        f"({lines})"
+    ))
+    results.append(check(
+        "Counter mit Labels summiert, Sonderzeichen escaped",
+        'test_dokumente_total{result="erledigt"} 3' in lines
+        and 'test_dokumente_total{result="mit \\"Anführungszeichen\\"\\n"} 1' in lines,
+        f"({lines})"
+    ))
+    results.append(check("Counter ohne Labels startet bei 0", "test_ohne_labels_total 0" in lines, f"({lines})"))
+    results.append(check(
+        "Gauge liefert Werte der registrierten Funktion",
+        'test_queue_depth{stage="ocr"} 3' in lines and 'test_queue_depth{stage="classify"} 0.5' in lines,
+        f"({lines})"
+    ))
+    results.append(check(
+        "Histogram: kumulative Buckets, Summe und Anzahl",
+        'test_dauer_seconds_bucket{step="ocr",le="0.1"} 1' in lines
+        and 'test_dauer_seconds_bucket{step="ocr",le="1"} 3' in lines
+        and 'test_dauer_seconds_bucket{step="ocr",le="+Inf"} 4' in lines
+        and 'test_dauer_seconds_sum{step="ocr"} 6.25' in lines
+        and 'test_dauer_seconds_count{step="ocr"} 4' in lines,
+        f"({lines})"
+    ))
+
+    results.append(check("Falsche Labels werden abgelehnt", raises(lambda: counter.inc(stufe="ocr"))))
+    results.append(check("Counter kann nicht sinken", raises(lambda: einfach.inc(-1))))
+    results.append(check(
+        "Doppelter Metrikname wird abgelehnt",
+        raises(lambda: test_registry.counter("test_dokumente_total", "Doppelt"))
+    ))
+
+    # Fehler in der Gauge-Funktion dürfen den Abruf nicht abbrechen
+    gauge.set_function(lambda: 1 / 0)
+    results.append(check(
+        "Fehlerhafte Gauge-Funktion liefert keine Samples",
+        not any(line.startswith("test_queue_depth{") for line in test_registry.render().splitlines())
+    ))
+    return results
+
+
+def test_global_registry() -> list:
+    text = registry.render()
+    return [
+        check("Globale Registry endet mit Zeilenumbruch", text.endswith("\n")),
+        check(
+            "Globale Registry enthält die Schritt-Dauer der Zeitleiste",
+            "# TYPE docs_processing_step_duration_seconds histogram" in text
+        ),
+        check(
+            "Stufen-Fehlschläge getrennt von Dokument-Endergebnissen",
+            "# TYPE docs_processing_stage_failures_total counter" in text
+            and "# TYPE docs_documents_processed_total counter" in text
+        ),
+    ]
+
+
+def main():
+    logger.info("🧪 Teste Metriken...")
+
+    try:
+        logger.info("1️⃣  Teste Textformat...")
+        results = test_rendering()
+
+        logger.info("2️⃣  Teste globale Registry...")
+        results.extend(test_global_registry())
+
+        if not all(results):
+            logger.error(f"❌ {results.count(False)} von {len(results)} Prüfungen fehlgeschlagen")
+            return False
+
+        logger.info(f"🎉 Alle {len(results)} Metrik-Prüfungen erfolgreich!")
+        return True
+
+    except Exception as e:
+        logger.error(f"❌ Fehler: {e}")
+        return False
+
+if __name__ == "__main__":
+    success = main()
+    sys.exit(0 if success else 1)
@@ -0,0 +1,230 @@
+#!/usr/bin/env python3
+"""
+Test-Script für die gestufte Verarbeitungs-Pipeline (ProcessingPipeline).
+
+Prüft Reihenfolge der Stufen, Abbruch (Handler gibt False zurück), Fehlerbehandlung
+(auch bei fehlschlagendem Fehler-Callback), doppeltes Einreihen, Backpressure bei voller
+Queue und die Statistiken.
+Benötigt keine Datenbank.
+"""
+
+import os
+import sys
+
+# Path für Imports hinzufügen
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+import asyncio
+import logging
+
+from app.services.processing_pipeline import PipelineJob, PipelineStage, ProcessingPipeline
+
+# Logging konfigurieren
+logging.basicConfig(level=logging.INFO, format='%(levelname)s: %(message)s')
+logger = logging.getLogger(__name__)
+
+
+def check(beschreibung: str, ok: bool, details: str = "") -> bool:
+    if ok:
+        logger.info(f"✅ {beschreibung}")
+    else:
+        logger.error(f"❌ {beschreibung} {details}".rstrip())
+    return ok
+
+
+async def wait_until(condition, timeout: float = 2.0) -> bool:
+    deadline = asyncio.get_running_loop().time() + timeout
+    while not condition():
+        if asyncio.get_running_loop().time() > deadline:
+            return False
+        await asyncio.sleep(0.01)
+    return True
+
+
+async def test_flow() -> list:
+    results = []
+    visited = []
+    done = []
+    failed = []
+
+    def stage(name):
+        async def handler(job: PipelineJob) -> bool:
+            visited.append((job.filename, name))
+            if job.context.get("fehler") == name:
+                raise RuntimeError(f"Fehler in {name}")
+            return job.context.get("stopp") != name
+        return handler
+
+    async def on_job_failed(job: PipelineJob, error: Exception):
+        failed.append((job.filename, job.stage, str(error)))
+
+    pipeline = ProcessingPipeline(
+        [PipelineStage(name, stage(name)) for name in ("ocr", "database", "classify")],
+        on_job_failed=on_job_failed,
+        on_job_done=lambda job: done.append(job.filename)
+    )
+    pipeline.start()
+
+    try:
+        await pipeline.submit("a.pdf")
+        await pipeline.submit("b.pdf", stopp="database")
+        await pipeline.submit("c.pdf", fehler="ocr")
+        await wait_until(lambda: len(done) == 3)
+
+        results.append(check(
+            "Job durchläuft alle Stufen in Reihenfolge",
+            [name for filename, name in visited if filename == "a.pdf"] == ["ocr", "database", "classify"],
+            f"({visited})"
+        ))
+        results.append(check(
+            "False beendet den Job nach der Stufe",
+            [name for filename, name in visited if filename == "b.pdf"] == ["ocr", "database"],
+            f"({visited})"
+        ))
+        results.append(check(
+            "Exception ruft (async) on_job_failed mit Stufe auf",
+            failed == [("c.pdf", "ocr", "Fehler in ocr")],
+            f"({failed})"
+        ))
+        results.append(check(
+            "on_job_done für jeden Job genau einmal",
+            sorted(done) == ["a.pdf", "b.pdf", "c.pdf"] and not pipeline.is_in_flight("a.pdf"),
+            f"({done})"
+        ))
+
+        stats = pipeline.get_stats()
+        results.append(check(
+            "Statistiken je Stufe",
+            stats["completed"] == 3
+            and stats["stages"]["ocr"]["processed"] == 2 and stats["stages"]["ocr"]["failed"] == 1
+            and stats["stages"]["database"]["stopped"] == 1
+            and stats["stages"]["classify"]["processing_seconds"]["count"] == 1,
+            f"({stats})"
+        ))
+
+    finally:
+        await pipeline.stop()
+
+    return results
+
+
+async def test_backpressure() -> list:
+    results = []
+    release = asyncio.Event()
+    started = []
+
+    async def blocking(job: PipelineJob) -> bool:
+        started.append(job.filename)
+        await release.wait()
+        return True
+
+    pipeline = ProcessingPipeline([PipelineStage("ocr", blocking, concurrency=1, queue_size=1)])
+    pipeline.start()
+
+    try:
+        # 1. Job läuft, 2. Job wartet in der Queue - der 3. muss blockieren
+        await pipeline.submit("1.pdf")
+        await wait_until(lambda: started == ["1.pdf"])
+        await pipeline.submit("2.pdf")
+
+        results.append(check(
+            "Datei bereits in der Pipeline wird nicht erneut eingereiht",
+            await pipeline.submit("1.pdf") is False
+        ))
+
+        third = asyncio.create_task(pipeline.submit("3.pdf"))
+        await asyncio.sleep(0.1)
+        results.append(check("Volle Queue blockiert das Einreihen (Backpressure)", not third.done()))
+
+        release.set()
+        await asyncio.wait_for(third, timeout=2.0)
+        results.append(check(
+            "Einreihen läuft weiter, sobald Platz frei ist",
+            await wait_until(lambda: started == ["1.pdf", "2.pdf", "3.pdf"]),
+            f"({started})"
+        ))
+
+    finally:
+        await pipeline.stop()
+
+    try:
+        await pipeline.submit("4.pdf")
+        results.append(check("Gestoppte Pipeline lehnt Jobs ab", False))
+    except RuntimeError:
+        results.append(check("Gestoppte Pipeline lehnt Jobs ab", True))
+
+    return results
+
+
+async def test_failing_callback() -> list:
+    results = []
+    done = []
+    attempts = []
+
+    async def handler(job: PipelineJob) -> bool:
+        attempts.append(job.filename)
+        if len(attempts) == 1:
+            raise RuntimeError("Stufe fehlgeschlagen")
+        return True
+
+    def on_job_failed(job: PipelineJob, error: Exception):
+        raise ConnectionError("Datenbank nicht erreichbar")
+
+    pipeline = ProcessingPipeline(
+        [PipelineStage("ocr", handler, concurrency=1)],
+        on_job_failed=on_job_failed,
+        on_job_done=lambda job: done.append(job.filename)
+    )
+    pipeline.start()
+
+    try:
+        await pipeline.submit("a.pdf")
+        results.append(check(
+            "Fehlschlagender Fehler-Callback beendet den Job trotzdem",
+            await wait_until(lambda: done == ["a.pdf"]) and not pipeline.is_in_flight("a.pdf"),
+            f"({done})"
+        ))
+
+        # Worker lebt noch: dieselbe Datei kann erneut eingereiht und verarbeitet werden
+        results.append(check("Datei kann danach erneut eingereiht werden", await pipeline.submit("a.pdf")))
+        finished = await wait_until(lambda: done == ["a.pdf", "a.pdf"])
+        stats = pipeline.stages[0].get_stats()
+        results.append(check(
+            "Worker verarbeitet nach dem Callback-Fehler weiter",
+            finished and stats["processed"] == 1 and stats["active"] == 0 and stats["queue_depth"] == 0,
+            f"({done}, {stats})"
+        ))
+
+    finally:
+        await pipeline.stop()
+
+    return results
+
+
+def main():
+    logger.info("🧪 Teste Verarbeitungs-Pipeline...")
+
+    try:
+        logger.info("1️⃣  Teste Stufenablauf...")
+        results = asyncio.run(test_flow())
+
+        logger.info("2️⃣  Teste Backpressure...")
+        results.extend(asyncio.run(test_backpressure()))
+
+        logger.info("3️⃣  Teste fehlschlagenden Fehler-Callback...")
+        results.extend(asyncio.run(test_failing_callback()))
+
+        if not all(results):
+            logger.error(f"❌ {results.count(False)} von {len(results)} Prüfungen fehlgeschlagen")
+            return False
+
+        logger.info(f"🎉 Alle {len(results)} Pipeline-Prüfungen erfolgreich!")
+        return True
+
+    except Exception as e:
+        logger.error(f"❌ Fehler: {e}")
+        return False
+
+if __name__ == "__main__":
+    success = main()
+    sys.exit(0 if success else 1)
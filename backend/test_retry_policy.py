@@ -0,0 +1,193 @@
+#!/usr/bin/env python3
+"""
+Test-Script für die Wiederholungsstrategie fehlgeschlagener Verarbeitungsstufen.
+
+1. RetryPolicy: Wartezeiten (exponentiell, begrenzt), Jitter-Bereich und Erschöpfung (ohne Datenbank)
+2. VerarbeitungsstatusRepository gegen PostgreSQL: record_failure bis zum Dead-Letter-Status,
+   Sperre über get_blocked_filenames, Freigabe über requeue und Versuche bei Erfolg (mark)
+"""
+
+import os
+import sys
+
+# Path für Imports hinzufügen
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+import logging
+import uuid
+from datetime import datetime, timedelta
+
+from app.database.postgres_connection import get_db_session, run_migrations, test_connection
+from app.models.database import Verarbeitungsstatus
+from app.repositories.verarbeitungsstatus_repository import (
+    STATUS_DEAD_LETTER,
+    STATUS_ERLEDIGT,
+    STATUS_FEHLGESCHLAGEN,
+    STUFE_DOCUMENT_PROCESSING,
+    STUFE_OCR,
+    VerarbeitungsstatusRepository,
+)
+from app.services.retry_policy import RetryPolicy
+
+# Logging konfigurieren
+logging.basicConfig(level=logging.INFO, format='%(levelname)s: %(message)s')
+logger = logging.getLogger(__name__)
+
+
+def check(beschreibung: str, ok: bool, details: str = "") -> bool:
+    if ok:
+        logger.info(f"✅ {beschreibung}")
+    else:
+        logger.error(f"❌ {beschreibung} {details}".rstrip())
+    return ok
+
+
+def test_policy() -> list:
+    policy = RetryPolicy(max_attempts=4, base_delay=10.0, max_delay=60.0)
+    now = datetime(2025, 1, 1, 12, 0, 0)
+    results = []
+
+    # Equal Jitter: Wartezeit liegt zwischen der Hälfte und dem vollen Wert von base * 2^(n-1)
+    for attempts, full_delay in ((1, 10.0), (2, 20.0), (3, 40.0), (4, 60.0), (10, 60.0)):
+        samples = [policy.delay_seconds(attempts) for _ in range(500)]
+        results.append(check(
+            f"Wartezeit nach Versuch {attempts} in [{full_delay / 2:g}, {full_delay:g}] s",
+            all(full_delay / 2 <= sample <= full_delay for sample in samples),
+            f"(min {min(samples):.2f}, max {max(samples):.2f})"
+        ))
+
+    samples = {round(policy.delay_seconds(3), 6) for _ in range(50)}
+    results.append(check("Jitter streut die Wartezeiten", len(samples) > 1, f"({samples})"))
+
+    next_attempt = policy.next_attempt_at(1, now)
+    results.append(check(
+        "next_attempt_at liegt im Backoff-Fenster",
+        next_attempt is not None and now + timedelta(seconds=5) <= next_attempt <= now + timedelta(seconds=10),
+        f"({next_attempt})"
+    ))
+
+    results.append(check(
+        "Nach max_attempts Versuchen erschöpft",
+        not policy.is_exhausted(3) and policy.is_exhausted(4) and policy.next_attempt_at(4, now) is None
+    ))
+
+    results.append(check("max_attempts mindestens 1", RetryPolicy(max_attempts=0).max_attempts == 1))
+    return results
+
+
+def get_versuche(dateiname: str, stufe: str):
+    with get_db_session() as session:
+        eintrag = session.query(Verarbeitungsstatus)\
+            .filter(Verarbeitungsstatus.dateiname == dateiname, Verarbeitungsstatus.stufe == stufe)\
+            .first()
+        return eintrag.versuche if eintrag else None
+
+
+def test_repository() -> list:
+    policy = RetryPolicy(max_attempts=3, base_delay=60.0, max_delay=600.0)
+    dateiname = f"test_retry_{uuid.uuid4().hex[:8]}.pdf"
+    results = []
+
+    try:
+        statuses = [
+            VerarbeitungsstatusRepository.record_failure(dateiname, STUFE_OCR, f"Fehler {versuch}", policy)
+            for versuch in range(1, 4)
+        ]
+        results.append(check(
+            "record_failure: fehlgeschlagen bis zum Limit, danach dead_letter",
+            statuses == [STATUS_FEHLGESCHLAGEN, STATUS_FEHLGESCHLAGEN, STATUS_DEAD_LETTER],
+            f"({statuses})"
+        ))
+
+        eintraege = [
+            eintrag for eintrag in VerarbeitungsstatusRepository.get_failed(STATUS_DEAD_LETTER, limit=1000)
+            if eintrag["dateiname"] == dateiname
+        ]
+        results.append(check(
+            "Dead-Letter-Eintrag mit Versuchen und letzter Meldung",
+            len(eintraege) == 1 and eintraege[0]["versuche"] == 3 and eintraege[0]["meldung"] == "Fehler 3"
+            and eintraege[0]["naechster_versuch"] is None,
+            f"({eintraege})"
+        ))
+
+        results.append(check(
+            "Dead-Letter-Datei ist gesperrt",
+            dateiname in VerarbeitungsstatusRepository.get_blocked_filenames([dateiname])
+        ))
+
+        reset = VerarbeitungsstatusRepository.requeue(dateiname)
+        status = VerarbeitungsstatusRepository.get_status(dateiname, STUFE_OCR)
+        results.append(check(
+            "requeue gibt die Datei sofort frei",
+            reset == 1 and status == STATUS_FEHLGESCHLAGEN
+            and dateiname not in VerarbeitungsstatusRepository.get_blocked_filenames([dateiname]),
+            f"(zurückgesetzt: {reset}, Status: {status})"
+        ))
+
+        # Nach requeue beginnt die Zählung von vorn
+        status = VerarbeitungsstatusRepository.record_failure(dateiname, STUFE_OCR, "Fehler nach Requeue", policy)
+        results.append(check(
+            "Nach requeue: erneuter Fehlschlag plant Backoff statt Dead-Letter",
+            status == STATUS_FEHLGESCHLAGEN
+            and dateiname in VerarbeitungsstatusRepository.get_blocked_filenames([dateiname]),
+            f"({status})"
+        ))
+
+        results.append(check(
+            "requeue ohne Fehlschlag ändert nichts",
+            VerarbeitungsstatusRepository.requeue(f"unbekannt_{dateiname}") == 0
+        ))
+
+        # Erfolg zählt keinen Versuch: neu angelegt mit 0, nach Fehlschlag bleibt der Zähler stehen
+        VerarbeitungsstatusRepository.mark(dateiname, STUFE_DOCUMENT_PROCESSING, STATUS_ERLEDIGT)
+        VerarbeitungsstatusRepository.mark(dateiname, STUFE_DOCUMENT_PROCESSING, STATUS_ERLEDIGT)
+        versuche_neu = get_versuche(dateiname, STUFE_DOCUMENT_PROCESSING)
+        versuche_vorher = get_versuche(dateiname, STUFE_OCR)
+        VerarbeitungsstatusRepository.mark(dateiname, STUFE_OCR, STATUS_ERLEDIGT)
+        versuche_nachher = get_versuche(dateiname, STUFE_OCR)
+        results.append(check(
+            "mark (Erfolg) zählt keine Versuche hoch",
+            versuche_neu == 0 and versuche_nachher == versuche_vorher == 1
+            and VerarbeitungsstatusRepository.get_status(dateiname, STUFE_OCR) == STATUS_ERLEDIGT,
+            f"(neu: {versuche_neu}, vorher: {versuche_vorher}, nachher: {versuche_nachher})"
+        ))
+
+    finally:
+        VerarbeitungsstatusRepository.delete_for_file(dateiname)
+
+    return results
+
+
+def main():
+    logger.info("🧪 Teste Wiederholungsstrategie...")
+
+    try:
+        # 1. Wartezeiten ohne Datenbank
+        logger.info("1️⃣  Teste RetryPolicy...")
+        results = test_policy()
+
+        # 2. Status-Übergänge in der Datenbank
+        logger.info("2️⃣  Teste Datenbankverbindung...")
+        if not test_connection():
+            logger.error("❌ Verbindung fehlgeschlagen!")
+            return False
+
+        run_migrations()
+
+        logger.info("3️⃣  Teste Fehlschlag, Dead-Letter und Requeue...")
+        results.extend(test_repository())
+
+        if not all(results):
+            logger.error(f"❌ {results.count(False)} von {len(results)} Prüfungen fehlgeschlagen")
+            return False
+
+        logger.info(f"🎉 Alle {len(results)} Prüfungen erfolgreich!")
+        return True
+
+    except Exception as e:
+        logger.error(f"❌ Fehler: {e}")
+        return False
+
+if __name__ == "__main__":
+    success = main()
+    sys.exit(0 if success else 1)
@@ -8,6 +8,9 @@ interface DocumentListProps {
   refreshTrigger?: boolean;
 }
 
+// Dokumente pro Seite
+const PAGE_SIZE = 50;
+
 /**
  * Komponente für die Anzeige der Dokumentenliste
  */
@@ -16,18 +19,24 @@ const DocumentList: React.FC<DocumentListProps> = ({ onSelectDocument, refreshTr
   const [loading, setLoading] = useState<boolean>(true);
   const [error, setError] = useState<string | null>(null);
   const [expandedId, setExpandedId] = useState<number | null>(null);
+  const [nextCursor, setNextCursor] = useState<string | null>(null);
+  const [total, setTotal] = useState<number>(0);
+  const [pendingProcessing, setPendingProcessing] = useState<number>(0);
 
   // Dokumente beim Laden der Komponente oder bei Aktualisierung abrufen
   useEffect(() => {
     loadDocuments();
   }, [refreshTrigger]);
 
-  // Dokumente vom Backend abrufen
+  // Erste Seite der Dokumente vom Backend abrufen
   const loadDocuments = async (): Promise<void> => {
     try {
       setLoading(true);
-      const data = await dokumentService.getAllDokumente();
+      const data = await dokumentService.getAllDokumente({ limit: PAGE_SIZE });
       setDocuments(data.dokumente || []);
+      setNextCursor(data.next_cursor ?? null);
+      setTotal(data.total);
+      setPendingProcessing(data.pending_processing ?? 0);
       setError(null);
     } catch (err) {
       console.error('Fehler beim Laden der Dokumente:', err);
@@ -37,6 +46,24 @@ const DocumentList: React.FC<DocumentListProps> = ({ onSelectDocument, refreshTr
     }
   };
 
+  // Nächste Seite anhängen (Keyset-Pagination über next_cursor)
+  const loadMoreDocuments = async (): Promise<void> => {
+    if (!nextCursor) return;
+    
+    try {
+      setLoading(true);
+      const data = await dokumentService.getAllDokumente({ limit: PAGE_SIZE, cursor: nextCursor });
+      setDocuments(prev => [...prev, ...(data.dokumente || [])]);
+      setNextCursor(data.next_cursor ?? null);
+      setError(null);
+    } catch (err) {
+      console.error('Fehler beim Laden weiterer Dokumente:', err);
+      setError('Weitere Dokumente konnten nicht geladen werden.');
+    } finally {
+      setLoading(false);
+    }
+  };
+
   // Dokument hochladen
   const handleFileUpload = async (event: React.ChangeEvent<HTMLInputElement>): Promise<void> => {
     const file = event.target.files?.[0];
@@ -188,6 +215,12 @@ const DocumentList: React.FC<DocumentListProps> = ({ onSelectDocument, refreshTr
         </div>
       )}
       
+      {pendingProcessing > 0 && (
+        <div className="p-3 rounded mb-4 bg-muted text-muted-foreground text-sm">
+          {pendingProcessing} neue Datei(en) werden im Hintergrund verarbeitet.
+        </div>
+      )}
+      
       {loading && (
         <div className="flex justify-center p-6">
           <div className="animate-spin rounded-full h-10 w-10 border-t-2 border-b-2 border-primary"></div>
@@ -214,6 +247,17 @@ const DocumentList: React.FC<DocumentListProps> = ({ onSelectDocument, refreshTr
           />
         ))}
       </ul>
+      
+      {nextCursor && !loading && (
+        <div className="flex justify-center mt-4">
+          <button
+            onClick={loadMoreDocuments}
+            className="bg-secondary hover:bg-secondary/80 text-secondary-foreground px-4 py-2 rounded"
+          >
+            Weitere laden ({documents.length} von {total})
+          </button>
+        </div>
+      )}
     </div>
   );
 };
@@ -5,6 +5,7 @@
 import axios, { AxiosResponse } from 'axios';
 import { 
   Dokument, 
+  DokumentListParams,
   DokumentListResponse, 
   MetadatenFeld,
   MetadatenFeldListResponse,
@@ -26,12 +27,13 @@ const apiClient = axios.create({
 // Dokument-Service
 export const dokumentService = {
   /**
-   * Alle Dokumente abrufen
-   * @returns Promise mit Dokumentenliste
+   * Eine Seite der Dokumente abrufen (neueste zuerst)
+   * @param params Pagination (limit, cursor), Filter und Feld-Projektion
+   * @returns Promise mit Dokumentenliste und next_cursor
    */
-  getAllDokumente: async (): Promise<DokumentListResponse> => {
+  getAllDokumente: async (params: DokumentListParams = {}): Promise<DokumentListResponse> => {
     try {
-      const response: AxiosResponse<DokumentListResponse> = await apiClient.get('/dokumente');
+      const response: AxiosResponse<DokumentListResponse> = await apiClient.get('/dokumente', { params });
       return response.data;
     } catch (error) {
       console.error('Fehler beim Abrufen der Dokumente:', error);
@@ -26,6 +26,21 @@ export interface MetadatenFeld {
 export interface DokumentListResponse {
   dokumente: Dokument[];
   total: number;
+  total_geschaetzt?: boolean; // total ist eine Schätzung (große Ergebnismengen)
+  next_cursor?: string | null; // Cursor für die nächste Seite
+  pending_processing?: number; // Dateien im Input, die noch verarbeitet werden
+  blocked_processing?: number; // Dateien im Backoff bzw. Dead-Letter (nicht in pending_processing)
+}
+
+// Parameter für die seitenweise Dokumentliste
+export interface DokumentListParams {
+  limit?: number;
+  cursor?: string;
+  kategorie?: string;
+  unterkategorie?: string;
+  von?: string;
+  bis?: string;
+  fields?: string;
 }
 
 // API-Antwort für Metadatenfelder